@@ -0,0 +1,24 @@
+import json
+from typing import Any, List
+
+from zerolog.encoder_json import decode_if_binary_to_string
+
+
+# Writer keeps each event written to it, decoded. io.BytesIO can't be used to
+# collect several events since loggers rewind it after each write.
+class Writer:
+    def __init__(self):
+        self.out: List[str] = []
+
+    def write(self, p: bytes):
+        self.out.append(decode_if_binary_to_string(p))
+
+    # events returns the events written, parsed.
+    def events(self) -> List[Any]:
+        return [json.loads(o) for o in self.out]
+
+
+# FailingWriter fails to write any event.
+class FailingWriter:
+    def write(self, p: bytes):
+        raise Exception("failed")
@@ -0,0 +1,77 @@
+import os
+import unittest
+
+import zerolog
+from zerolog.bench import Discard
+from zerolog.bench import soak
+from zerolog.bench.alloc import measure
+from zerolog.sampler import BurstSampler
+
+# Soak tests log millions of events, set ZEROLOG_SOAK=1 to run them.
+SOAK = os.environ.get("ZEROLOG_SOAK", "") != ""
+
+# Memory kept per event after logging many of them. It should be zero, a
+# little is allowed for caches growing during the measure.
+RETAINED_BYTES = 8
+RETAINED_BLOCKS = 0.05
+
+
+def fields10(l: zerolog.Logger):
+    (
+        l.info()
+        .str("user", "bob")
+        .str("request_id", "7b3c2f6a")
+        .int("status", 200)
+        .float("latency", 12.345)
+        .bool("cached", False)
+        .str("path", "/api/v1/users")
+        .str("method", "GET")
+        .int("bytes", 5120)
+        .int("retries", 0)
+        .str("region", "us-east-1")
+        .msg("hello world")
+    )
+
+
+class TestAlloc(unittest.TestCase):
+    def assertBudget(self, op, peak_bytes: int):
+        got = measure(op, 2000)
+        self.assertLessEqual(got["peak_bytes"], peak_bytes, got)
+        self.assertLessEqual(got["retained_bytes"], RETAINED_BYTES, got)
+        self.assertLessEqual(got["retained_blocks"], RETAINED_BLOCKS, got)
+
+    def test_msg(self):
+        l = zerolog.new(Discard())
+        self.assertBudget(lambda: l.info().msg("hello world"), 1024)
+
+    def test_10_fields(self):
+        l = zerolog.new(Discard())
+        self.assertBudget(lambda: fields10(l), 1536)
+
+    def test_context(self):
+        c = zerolog.new(Discard()).ctx()
+        for i in range(10):
+            c = c.str(f"field_{i}", f"value_{i}")
+        l = c.logger()
+        self.assertBudget(lambda: l.info().msg("hello world"), 1536)
+
+    def test_disabled(self):
+        l = zerolog.new(Discard()).level(zerolog.InfoLevel)
+        self.assertBudget(lambda: l.debug(), 256)
+
+    def test_sampled_out(self):
+        l = zerolog.new(Discard()).sample(BurstSampler(1, 3600))
+        l.info().msg("")
+        self.assertBudget(lambda: l.info(), 256)
+
+
+class TestSoak(unittest.TestCase):
+    def test_soak_smoke(self):
+        got = soak.run(1000, "^discard/burst$", chunks=2)
+        self.assertEqual(["discard/burst"], list(got))
+        self.assertGreater(got["discard/burst"]["end_rss"], 0)
+
+    @unittest.skipUnless(SOAK, "set ZEROLOG_SOAK=1 to run soak tests")
+    def test_soak(self):
+        for name, r in soak.run(1_000_000).items():
+            self.assertLess(r["growth"], 5 * 1024 * 1024, name)
@@ -0,0 +1,88 @@
+import unittest
+
+import zerolog
+from zerolog.encoder_json import decode_if_binary_to_string
+from zerolog.sampler import BasicSampler
+from tests import FailingWriter, Writer
+
+
+class TestBatch(unittest.TestCase):
+    def test_batch(self):
+        w = Writer()
+        l = zerolog.new(w).level(zerolog.InfoLevel)
+        with l.batch() as bl:
+            for i in range(3):
+                bl.info().int("i", i).msg("")
+            bl.debug()
+            self.assertEqual([], w.out)
+        self.assertEqual(
+            [
+                '{"level":"info","i":0}\n{"level":"info","i":1}\n{"level":"info","i":2}\n'
+            ],
+            w.out,
+        )
+
+        l.info().msg("after")
+        self.assertEqual('{"level":"info","message":"after"}\n', w.out[1])
+
+    def test_batch_empty(self):
+        w = Writer()
+        with zerolog.new(w).batch():
+            pass
+        self.assertEqual([], w.out)
+
+    def test_batch_hooks_sampler(self):
+        w = Writer()
+        hook = zerolog.HookFunc(lambda e, lvl, msg: e.str("msg_len", str(len(msg))))
+        l = zerolog.new(w).hook(hook).sample(BasicSampler(2))
+        with l.batch() as bl:
+            for m in ("a", "bb", "ccc"):
+                e = bl.info()
+                if e is not None:
+                    e.msg(m)
+        self.assertEqual(
+            [
+                '{"level":"info","msg_len":"1","message":"a"}\n'
+                '{"level":"info","msg_len":"3","message":"ccc"}\n'
+            ],
+            w.out,
+        )
+
+    def test_batch_max_bytes(self):
+        w = Writer()
+        b = zerolog.new(w).batch(max_bytes=19)
+        b.logger.log().str("a", "0123456789").msg("")
+        self.assertEqual(['{"a":"0123456789"}\n'], w.out)
+        b.logger.log().msg("")
+        b.flush()
+        self.assertEqual("{}\n", w.out[1])
+
+    def test_batch_exception(self):
+        w = Writer()
+        with self.assertRaises(ValueError):
+            with zerolog.new(w).batch() as bl:
+                bl.log().msg("before")
+                raise ValueError()
+        self.assertEqual(['{"message":"before"}\n'], w.out)
+
+    def test_batch_stats(self):
+        s = zerolog.Stats()
+        with zerolog.new(Writer()).stats(s).batch() as bl:
+            bl.info().msg("")
+            bl.warn().msg("")
+            self.assertEqual(0, sum(s.snapshot()["emitted"].values()))
+        got = s.snapshot()
+        self.assertEqual(1, got["emitted"]["info"])
+        self.assertEqual(1, got["emitted"]["warn"])
+        self.assertEqual(len('{"level":"info"}\n'), got["bytes"]["info"])
+
+        of = zerolog.ExceptionHandler
+        try:
+            zerolog.ExceptionHandler = lambda e: None
+            with zerolog.new(FailingWriter()).stats(s).batch() as bl:
+                bl.info().msg("")
+        finally:
+            zerolog.ExceptionHandler = of
+        got = s.snapshot()
+        self.assertEqual(1, got["emitted"]["info"])
+        self.assertEqual(1, got["write_errors"]["info"])
@@ -0,0 +1,72 @@
+import unittest
+
+from zerolog.bench import Benchmark, benchmarks, compare, load, run_benchmark
+
+
+class TestBench(unittest.TestCase):
+    def test_benchmarks(self):
+        names = [b.name for b in benchmarks()]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertIn("event/info", names)
+        self.assertEqual(["event/info"], [b.name for b in benchmarks("^event/info$")])
+
+    def test_run_benchmark(self):
+        calls = []
+        for threads in (1, 2):
+            r = run_benchmark(
+                Benchmark("test", lambda: lambda: calls.append(1), threads),
+                min_time=0.001,
+                repeat=2,
+            )
+            self.assertEqual(threads, r["threads"])
+            self.assertGreater(r["ns_per_op"], 0)
+            self.assertGreaterEqual(len(calls), r["calls"])
+
+    def test_run_benchmark_generator(self):
+        done = []
+
+        def setup():
+            try:
+                yield lambda: None
+            finally:
+                done.append(True)
+
+        run_benchmark(Benchmark("test", setup), min_time=0.001, repeat=1)
+        self.assertEqual([True], done)
+
+    def test_compare(self):
+        old = {"results": {"a": {"ns_per_op": 100}, "b": {"ns_per_op": 100}}}
+        new = {
+            "results": {
+                "a": {"ns_per_op": 105},
+                "b": {"ns_per_op": 150},
+                "c": {"ns_per_op": 10},
+            }
+        }
+        rows, regressions = compare(old, new, 0.1)
+        self.assertEqual([("a", 100, 105, 0.05), ("b", 100, 150, 0.5)], rows)
+        self.assertEqual(["b"], regressions)
+
+
+class TestLoad(unittest.TestCase):
+    def test_parse_mix(self):
+        self.assertEqual({"info": 3, "error": 1}, load.parse_mix("info:3,error"))
+        with self.assertRaises(ValueError):
+            load.parse_mix("nope:1")
+
+    def test_sequence(self):
+        seq = load._sequence({"info": 3, "error": 1})
+        calls = load._calls
+        self.assertEqual(
+            [calls["info"], calls["info"], calls["error"], calls["info"]], seq
+        )
+
+    def test_run(self):
+        cfg = load.Config(mix=load.parse_mix("info,debug,fields,with"), duration=0.05)
+        got = load.run(cfg, [1, 2])
+        self.assertEqual("threads", got["mode"])
+        self.assertEqual([1, 2], [r["workers"] for r in got["results"]])
+        first = got["results"][0]
+        self.assertEqual(1.0, first["efficiency"])
+        self.assertGreater(first["events"], 0)
+        self.assertIn("p99", first["latency_ns"])
@@ -0,0 +1,58 @@
+import asyncio
+import contextvars
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import zerolog
+from zerolog.encoder_json import decode_if_binary_to_string
+
+
+def log_to_string(l: zerolog.Logger) -> str:
+    out = io.BytesIO()
+    l.output(out).log().msg("")
+    return decode_if_binary_to_string(out.read())
+
+
+class TestBind(unittest.TestCase):
+    def test_bind(self):
+        log = zerolog.new(None).ctx().str("app", "api").logger()
+        with zerolog.bind(request_id="abc"):
+            self.assertEqual('{"app":"api","request_id":"abc"}\n', log_to_string(log))
+            with zerolog.bind({"user": "bob"}, n=1):
+                self.assertEqual(
+                    '{"app":"api","request_id":"abc","user":"bob","n":1}\n',
+                    log_to_string(log),
+                )
+            self.assertEqual('{"app":"api","request_id":"abc"}\n', log_to_string(log))
+        self.assertEqual('{"app":"api"}\n', log_to_string(log))
+
+    def test_bind_reset(self):
+        log = zerolog.new(None)
+        b = zerolog.bind(a=1)
+        self.assertEqual('{"a":1}\n', log_to_string(log))
+        b.reset()
+        self.assertEqual("{}\n", log_to_string(log))
+
+    def test_bind_asyncio(self):
+        log = zerolog.new(None)
+
+        async def handle(i: int) -> str:
+            with zerolog.bind(task=i):
+                await asyncio.sleep(0)
+                return log_to_string(log)
+
+        async def main():
+            return await asyncio.gather(*(handle(i) for i in range(3)))
+
+        got = asyncio.run(main())
+        self.assertEqual([f'{{"task":{i}}}\n' for i in range(3)], got)
+
+    def test_bind_thread_pool(self):
+        log = zerolog.new(None)
+        with zerolog.bind(a=1):
+            ctx = contextvars.copy_context()
+        with ThreadPoolExecutor(1) as pool:
+            self.assertEqual("{}\n", pool.submit(log_to_string, log).result())
+            got = pool.submit(ctx.run, log_to_string, log).result()
+        self.assertEqual('{"a":1}\n', got)
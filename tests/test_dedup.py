@@ -0,0 +1,77 @@
+import json
+import time
+import unittest
+
+import zerolog
+from zerolog import DedupHook
+from tests import Writer
+
+
+class TestDedupHook(unittest.TestCase):
+    def test_suppress(self):
+        w = Writer()
+        h = DedupHook(window=60)
+        log = zerolog.new(w).hook(h)
+        for _ in range(5):
+            log.info().str("foo", "bar").msg("failed")
+        log.info().msg("other")
+        self.assertEqual(
+            [
+                {"level": "info", "foo": "bar", "message": "failed"},
+                {"level": "info", "message": "other"},
+            ],
+            w.events(),
+        )
+
+        h.flush()
+        self.assertEqual(3, len(w.events()))
+        got = w.events()[2]
+        self.assertEqual(
+            ["level", "foo", "repeat_count", "first_seen", "last_seen", "message"],
+            list(got),
+        )
+        self.assertEqual(4, got["repeat_count"])
+        self.assertEqual("failed", got["message"])
+
+    def test_flush_without_repeat(self):
+        w = Writer()
+        h = DedupHook(window=60)
+        log = zerolog.new(w).hook(h)
+        log.info().msg("once")
+        h.flush()
+        self.assertEqual([{"level": "info", "message": "once"}], w.events())
+
+    def test_levels(self):
+        w = Writer()
+        log = zerolog.new(w).hook(DedupHook(window=60))
+        log.info().msg("failed")
+        log.warn().msg("failed")
+        self.assertEqual(2, len(w.events()))
+
+    def test_fields(self):
+        w = Writer()
+        log = zerolog.new(w).hook(DedupHook(window=60, fields=["id"]))
+        log.info().int("id", 1).int("n", 1).msg("failed")
+        log.info().int("id", 2).int("n", 2).msg("failed")
+        log.info().int("id", 1).int("n", 3).msg("failed")
+        self.assertEqual([1, 2], [o["id"] for o in w.events()])
+
+    def test_window(self):
+        w = Writer()
+        log = zerolog.new(w).hook(DedupHook(window=0.01))
+        log.info().msg("failed")
+        log.info().msg("failed")
+        time.sleep(0.02)
+        log.info().msg("failed")
+        self.assertEqual(3, len(w.events()))
+        self.assertEqual(1, w.events()[1]["repeat_count"])
+        self.assertNotIn("repeat_count", w.events()[2])
+
+    def test_max_keys(self):
+        w = Writer()
+        log = zerolog.new(w).hook(DedupHook(window=60, max_keys=1))
+        log.info().msg("a")
+        log.info().msg("a")
+        log.info().msg("b")
+        self.assertEqual(["a", "a", "b"], [o["message"] for o in w.events()])
+        self.assertEqual(1, w.events()[1]["repeat_count"])
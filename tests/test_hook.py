@@ -7,6 +7,7 @@ import zerolog
 from zerolog import Level, Logger
 from zerolog.encoder_json import decode_if_binary_to_string
 from zerolog.hook import HookFunc
+from tests import Writer
 
 
 level_name_hook = HookFunc(
@@ -215,3 +216,63 @@ class TestHook(unittest.TestCase):
             t.test(log)
             got = decode_if_binary_to_string(out.read())
             self.assertEqual(t.want, got)
+
+    def test_level_hook(self):
+        w = Writer()
+        log = zerolog.new(w).hook(
+            zerolog.LevelHook(info_hook=level_name_hook, error_hook=simple_hook)
+        )
+
+        # Events only run the hook of their level.
+        self.assertEqual(1, len(log._dispatch[zerolog.InfoLevel + 1]))
+        self.assertEqual((), log._dispatch[zerolog.DebugLevel + 1])
+
+        log.info().msg("")
+        log.debug().msg("")
+        log.with_(a=1).error().msg("")
+        self.assertEqual(
+            [
+                '{"level":"info","level_name":"info"}\n',
+                '{"level":"debug"}\n',
+                '{"level":"error","a":1,"has_level":true,"test":"logged"}\n',
+            ],
+            w.out,
+        )
+
+    def test_level_hook_changed(self):
+        w = Writer()
+        lh = zerolog.LevelHook()
+        log = zerolog.new(w).hook(lh)
+        log.info().msg("")
+        # The hooks of a LevelHook can be set once it is added to a logger.
+        lh.info_hook = level_name_hook
+        log.info().msg("")
+        self.assertEqual(1, len(log._dispatch[zerolog.InfoLevel + 1]))
+        self.assertEqual((), log._dispatch[zerolog.DebugLevel + 1])
+        self.assertEqual(
+            ['{"level":"info"}\n', '{"level":"info","level_name":"info"}\n'],
+            w.out,
+        )
+
+
+class TestPostHook(unittest.TestCase):
+    def test_post_hook(self):
+        w = Writer()
+        stats = zerolog.Stats()
+        log = zerolog.new(w).hook(level_name_hook).stats(stats)
+        log.post_hook(zerolog.PostHookFunc(lambda p, level: p.upper()))
+        log.post_hook(
+            zerolog.PostHookFunc(lambda p, level: None if b"DROP" in p else p)
+        )
+
+        log.info().msg("hello")
+        log.info().msg("drop")
+        log.template(Level.WarnLevel, "t", "k").emit(1)
+        self.assertEqual(
+            [
+                '{"LEVEL":"INFO","LEVEL_NAME":"INFO","MESSAGE":"HELLO"}\n',
+                '{"LEVEL":"WARN","K":1,"LEVEL_NAME":"WARN","MESSAGE":"T"}\n',
+            ],
+            w.out,
+        )
+        self.assertEqual(1, stats.snapshot()["discarded"]["info"])
@@ -0,0 +1,102 @@
+import subprocess
+import sys
+import unittest
+
+# EagerModules are the zerolog modules imported by import zerolog. Import
+# times are too noisy to be compared with a fixed budget, so the tests check
+# which modules are imported instead: a new module must either be needed by
+# every logger and added here, or be imported on first use.
+EagerModules = {
+    "zerolog",
+    "zerolog._globals",
+    "zerolog.array",
+    "zerolog.bind",
+    "zerolog.constants",
+    "zerolog.context",
+    "zerolog.encoder",
+    "zerolog.encoder_json",
+    "zerolog.event",
+    "zerolog.fields",
+    "zerolog.hook",
+    "zerolog.internal",
+    "zerolog.internal.json",
+    "zerolog.internal.json.json",
+    "zerolog.internal.util",
+    "zerolog.internal.util.atomic",
+    "zerolog.internal.util.time",
+    "zerolog.level",
+    "zerolog.logger",
+    "zerolog.marshal",
+    "zerolog.sampler",
+    "zerolog.stats",
+    "zerolog.time",
+    "zerolog.timer",
+    "zerolog.vector",
+    "zerolog.writer",
+}
+
+# Modules only imported when used.
+LazyModules = (
+    "dateutil",
+    "decimal",
+    "uuid",
+    "zlib",
+    "zerolog.batch",
+    "zerolog.bench",
+    "zerolog.console",
+    "zerolog.dedup",
+    "zerolog.metrics",
+    "zerolog.reservoir",
+    "zerolog.stacktrace",
+    "zerolog.redact",
+    "zerolog.tail",
+    "zerolog.template",
+)
+
+
+def importtime(code: str) -> dict:
+    p = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImport(unittest.TestCase):
+    def test_lazy_modules(self):
+        times = importtime("import zerolog")
+        self.assertIn("zerolog", times)
+        for m in LazyModules:
+            self.assertNotIn(m, times)
+
+    def test_eager_modules(self):
+        times = importtime("import zerolog")
+        got = {m for m in times if m.split(".")[0] == "zerolog"}
+        self.assertEqual(EagerModules, got)
+
+    def test_lazy_attributes(self):
+        code = (
+            "import zerolog; "
+            "assert 'GlobalLogger' not in vars(zerolog); "
+            "assert zerolog.ConsoleWriter.__module__ == 'zerolog.console'; "
+            "assert zerolog.stacktrace.marshal_stack; "
+            "assert zerolog.GlobalLogger is zerolog.GlobalLogger; "
+            "assert 'TailSampler' in dir(zerolog); "
+            "assert zerolog.Template.__module__ == 'zerolog.template'; "
+            "assert zerolog.Batch.__module__ == 'zerolog.batch'"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_unknown_attribute(self):
+        import zerolog
+
+        with self.assertRaises(AttributeError):
+            zerolog.NotAnAttribute
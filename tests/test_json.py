@@ -2,6 +2,7 @@ import unittest
 from dataclasses import dataclass
 
 from zerolog.encoder_json import enc
+from zerolog.internal.json.json import field_value
 
 
 class TestEncoder(unittest.TestCase):
@@ -60,3 +61,15 @@ class TestEncoder(unittest.TestCase):
             got = b.decode()
             want = t.out
             self.assertEqual(want, got)
+
+    def test_field_value(self):
+        buf = (
+            b'{"level":"info","msg":"a,\\"id\\":1","user":{"name":"}"},'
+            b'"id":"a\\"b","n":12,"l":[1,{"a":"]"}]'
+        )
+        self.assertEqual(b'"a\\"b"', field_value(buf, b'"id":'))
+        self.assertEqual(b"12", field_value(buf, b'"n":'))
+        self.assertEqual(b'{"name":"}"}', field_value(buf, b'"user":'))
+        self.assertEqual(b'[1,{"a":"]"}]', field_value(buf, b'"l":'))
+        self.assertEqual(b'"}"', field_value(buf, b'"name":'))
+        self.assertIsNone(field_value(buf, b'"missing":'))
@@ -1,11 +1,24 @@
+import array
 import datetime
+import decimal
+import enum
+import inspect
 import io
+import json
+import time
 import unittest
+import uuid
 from dataclasses import dataclass
 
 import zerolog
-from zerolog import stacktrace
+from zerolog import marshal, stacktrace, timer
 from zerolog.encoder_json import decode_if_binary_to_string
+from tests import Writer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestLog(unittest.TestCase):
@@ -77,6 +90,358 @@ class TestLog(unittest.TestCase):
         want = '{"foo":[],"n":[],"f":[],"b":[]}\n'
         self.assertEqual(want, got)
 
+    def test_dict(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().str("foo", "bar").dict(
+            "sub",
+            zerolog.dict()
+            .str("baz", "quux")
+            .ints("n", [1, 2])
+            .dict("nested", zerolog.dict().bool("ok", True)),
+        ).send()
+        got = decode_if_binary_to_string(out.read())
+        want = '{"foo":"bar","sub":{"baz":"quux","n":[1,2],"nested":{"ok":true}}}\n'
+        self.assertEqual(want, got)
+
+    def test_dict_empty(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().dict("sub", zerolog.dict()).send()
+        got = decode_if_binary_to_string(out.read())
+        want = '{"sub":{}}\n'
+        self.assertEqual(want, got)
+
+    def test_array(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().array(
+            "arr",
+            zerolog.arr()
+            .str("a")
+            .int(1)
+            .float(1.5)
+            .bool(False)
+            .dict(zerolog.dict().str("k", "v"))
+            .exc(Exception("boom")),
+        ).array("empty", zerolog.arr()).send()
+        got = decode_if_binary_to_string(out.read())
+        want = '{"arr":["a",1,1.5,false,{"k":"v"},"boom"],"empty":[]}\n'
+        self.assertEqual(want, got)
+
+    def test_fields(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().fields(
+            {
+                "str": "foo",
+                "int": 1,
+                "float": 1.5,
+                "bool": True,
+                "none": None,
+                "time": datetime.datetime(2006, 1, 2, tzinfo=datetime.UTC),
+                "list": ["a", 1, [False]],
+                "dict": {"k": "v"},
+                "exc": Exception("boom"),
+                "level": zerolog.InfoLevel,
+            }
+        ).send()
+        got = decode_if_binary_to_string(out.read())
+        want = (
+            '{"str":"foo","int":1,"float":1.5,"bool":true,"none":null,'
+            '"time":"2006-01-02T00:00:00.000Z","list":["a",1,[false]],'
+            '"dict":{"k":"v"},"exc":"boom","level":1}\n'
+        )
+        self.assertEqual(want, got)
+
+    def test_fields_pairs(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().fields([("foo", "bar"), ("n", 123)]).send()
+        got = decode_if_binary_to_string(out.read())
+        want = '{"foo":"bar","n":123}\n'
+        self.assertEqual(want, got)
+
+    def test_context_fields(self):
+        out = io.BytesIO()
+        log = zerolog.new(out).ctx().fields({"foo": "bar", "n": 123}).logger()
+        log.log().send()
+        got = decode_if_binary_to_string(out.read())
+        want = '{"foo":"bar","n":123}\n'
+        self.assertEqual(want, got)
+
+    def test_vector(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().vector("d", array.array("d", [1.5, 2.5])).vector(
+            "i", memoryview(array.array("i", [1, 2, 3]))
+        ).vector("b", [True, False]).vector("e", array.array("i")).send()
+        got = decode_if_binary_to_string(out.read())
+        want = '{"d":[1.5,2.5],"i":[1,2,3],"b":[true,false],"e":[]}\n'
+        self.assertEqual(want, got)
+
+    def test_vector_limit(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().vector("i", array.array("i", range(10)), limit=3).vector(
+            "j", [1, 2], limit=3
+        ).send()
+        got = decode_if_binary_to_string(out.read())
+        want = '{"i":[0,1,2],"i_count":10,"j":[1,2]}\n'
+        self.assertEqual(want, got)
+
+    def test_vector_summary(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().vector_summary("i", array.array("i", range(101))).vector_summary(
+            "f", [4.0, 1.0, 2.0, 3.0], percentiles=[50]
+        ).vector_summary("e", []).send()
+        got = decode_if_binary_to_string(out.read())
+        want = (
+            '{"i":{"count":101,"min":0,"max":100,"mean":50.0,"p50":50.0,"p90":90.0,"p99":99.0},'
+            '"f":{"count":4,"min":1.0,"max":4.0,"mean":2.5,"p50":2.5},'
+            '"e":{"count":0}}\n'
+        )
+        self.assertEqual(want, got)
+
+    def test_vector_mixed(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().bools("b", [1, 0, 2]).vector("v", [True, 2, 1.5]).vector(
+            "n", [1, None]
+        ).vector_summary("s", [True, 2]).vector_summary("x", [1, "a"]).send()
+        got = json.loads(out.read())
+        # The error depends on whether the summary is computed with NumPy.
+        self.assertTrue(got.pop("x").startswith("marshaling error: "))
+        want = {
+            "b": [True, False, True],
+            "v": [True, 2, 1.5],
+            "n": [1, None],
+            "s": {"count": 2, "min": 1, "max": 2, "mean": 1.5},
+        }
+        for k in ("p50", "p90", "p99"):
+            got["s"].pop(k)
+        self.assertEqual(want, got)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_vector_numpy(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        a = numpy.arange(6, dtype=numpy.int64).reshape(2, 3)
+        log.log().vector("a", a, limit=4).vector_summary("s", a, [50]).send()
+        got = decode_if_binary_to_string(out.read())
+        want = (
+            '{"a":[0,1,2,3],"a_count":6,'
+            '"s":{"count":6,"min":0,"max":5,"mean":2.5,"p50":2.5}}\n'
+        )
+        self.assertEqual(want, got)
+
+    def test_raw_json_bytes(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log = (
+            log.ctx().raw_json("cfg", b'{"debug":true}').hex("id", b"\x01\xff").logger()
+        )
+        payload = bytearray(b'[1,{"a":"b"}]')
+        log.log().raw_json("resp", memoryview(payload)).raw_json("e", b"").hex(
+            "h", array.array("B", [1, 2])
+        ).base64("b", memoryview(b"hello")[1:]).send()
+        got = decode_if_binary_to_string(out.read())
+        want = (
+            '{"cfg":{"debug":true},"id":"01ff","resp":[1,{"a":"b"}],"e":null,'
+            '"h":"0102","b":"ZWxsbw=="}\n'
+        )
+        self.assertEqual(want, got)
+
+    def test_any(self):
+        class Color(enum.Enum):
+            RED = "red"
+
+        @dataclass
+        class Point:
+            x: int
+            y: float
+
+        class Slots:
+            __slots__ = ("a", "b")
+
+            def __init__(self):
+                self.a = "a"
+
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().any(
+            "v",
+            {
+                "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                "decimal": decimal.Decimal("1.10"),
+                "enum": Color.RED,
+                "date": datetime.date(2006, 1, 2),
+                "set": {1},
+                "bytes": b"foo",
+                "point": Point(1, 2.5),
+                "slots": Slots(),
+                1: (True, None),
+            },
+        ).send()
+        got = decode_if_binary_to_string(out.read())
+        want = (
+            '{"v":{"uuid":"12345678-1234-5678-1234-567812345678","decimal":1.10,'
+            '"enum":"red","date":"2006-01-02","set":[1],"bytes":"foo",'
+            '"point":{"x":1,"y":2.5},"slots":{"a":"a"},"1":[true,null]}}\n'
+        )
+        self.assertEqual(want, got)
+
+    def test_any_plain(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().any(
+            "v", {"s": 'a"\n✭', "l": [1, 2.5, None, True], "t": (1,), 2: {}}
+        ).any("w", [{"d": datetime.date(2006, 1, 2)}]).send()
+        got = decode_if_binary_to_string(out.read())
+        want = (
+            '{"v":{"s":"a\\"\\n✭","l":[1,2.5,null,true],"t":[1],"2":{}},'
+            '"w":[{"d":"2006-01-02"}]}\n'
+        )
+        self.assertEqual(want, got)
+
+    def test_any_types_bound(self):
+        n = len(marshal._value_encoders)
+        types = [type(f"T{i}", (), {}) for i in range(marshal._max_types)]
+        try:
+            for t in types:
+                zerolog.new(io.BytesIO()).log().any("v", t()).send()
+            self.assertEqual(marshal._max_types, len(marshal._value_encoders))
+        finally:
+            for t in types:
+                marshal._value_encoders.pop(t, None)
+        self.assertEqual(n, len(marshal._value_encoders))
+
+    def test_any_marshaling_error(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        log.log().any("v", object()).send()
+        got = decode_if_binary_to_string(out.read())
+        want = (
+            '{"v":"marshaling error: Object of type object is not JSON serializable"}\n'
+        )
+        self.assertEqual(want, got)
+
+    def test_register_marshal_func(self):
+        class Money:
+            def __init__(self, amount: int, currency: str):
+                self.amount = amount
+                self.currency = currency
+
+        class Euros(Money):
+            pass
+
+        zerolog.register_marshal_func(Money, lambda m: f"{m.amount} {m.currency}")
+        try:
+            out = io.BytesIO()
+            log = zerolog.new(out)
+            log.log().any("m", Money(1, "CAD")).any("e", [Euros(2, "EUR")]).send()
+            got = decode_if_binary_to_string(out.read())
+            want = '{"m":"1 CAD","e":["2 EUR"]}\n'
+            self.assertEqual(want, got)
+        finally:
+            zerolog.unregister_marshal_func(Money)
+
+    def test_dur(self):
+        ou, oi = zerolog.DurationFieldUnit, zerolog.DurationFieldInteger
+        try:
+            out = io.BytesIO()
+            log = zerolog.new(out)
+            log.log().dur("ns", 1_500_000).dur("s", 0.25).dur(
+                "td", datetime.timedelta(seconds=1)
+            ).durs("l", [1_000_000, 2_000_000]).send()
+            got = decode_if_binary_to_string(out.read())
+            want = '{"ns":1.5,"s":250.0,"td":1000.0,"l":[1.0,2.0]}\n'
+            self.assertEqual(want, got)
+
+            zerolog.DurationFieldUnit = zerolog.time.Microsecond
+            zerolog.DurationFieldInteger = True
+            out = io.BytesIO()
+            log = zerolog.new(out)
+            log.log().dur("ns", 1_500).any("td", datetime.timedelta(seconds=1)).send()
+            got = decode_if_binary_to_string(out.read())
+            want = '{"ns":1,"td":1000000}\n'
+            self.assertEqual(want, got)
+        finally:
+            zerolog.DurationFieldUnit, zerolog.DurationFieldInteger = ou, oi
+
+    def test_timer(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        with log.timer("done", zerolog.InfoLevel):
+            pass
+        got = json.loads(decode_if_binary_to_string(out.read()))
+        self.assertEqual(["level", "elapsed", "message"], list(got))
+        self.assertEqual("done", got["message"])
+        self.assertGreaterEqual(got["elapsed"], 0)
+
+    def test_timer_decorator(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+
+        @log.timer("failed", key="took")
+        def f():
+            raise Exception("boom")
+
+        self.assertRaises(Exception, f)
+        got = json.loads(decode_if_binary_to_string(out.read()))
+        self.assertEqual(["level", "took", "exception", "message"], list(got))
+        self.assertEqual("boom", got["exception"])
+
+    def test_timer_reentrant(self):
+        w = Writer()
+        t = zerolog.new(w).timer("done", key="ms")
+        with t:
+            with t:
+                pass
+            time.sleep(0.01)
+        got = w.events()
+        self.assertLess(got[0]["ms"], 10)
+        self.assertGreaterEqual(got[1]["ms"], 10)
+
+    def test_timer_caller(self):
+        out = io.BytesIO()
+        log = zerolog.new(out).ctx().caller().logger()
+        line = inspect.currentframe().f_lineno + 1
+        with log.timer("done"):
+            pass
+        got = json.loads(decode_if_binary_to_string(out.read()))
+        self.assertEqual(f"{__file__}:{line}", got["caller"])
+
+    def test_timer_disabled(self):
+        out = io.BytesIO()
+        log = zerolog.new(out).level(zerolog.InfoLevel)
+        with log.timer("done"):
+            # The timer isn't entered.
+            self.assertEqual((), timer._starts.get())
+        self.assertEqual(b"", out.read())
+
+        @log.timer("done")
+        def f():
+            return 1
+
+        self.assertEqual(1, f())
+        self.assertEqual(b"", out.read())
+
+    def test_context_dict_array(self):
+        out = io.BytesIO()
+        log = (
+            zerolog.new(out)
+            .ctx()
+            .dict("sub", zerolog.dict().str("foo", "bar"))
+            .array("arr", zerolog.arr().int(1).int(2))
+            .logger()
+        )
+        log.log().str("baz", "quux").send()
+        got = decode_if_binary_to_string(out.read())
+        want = '{"sub":{"foo":"bar"},"arr":[1,2],"baz":"quux"}\n'
+        self.assertEqual(want, got)
+
     def test_time_rfc3339(self):
         of = zerolog.TimeFieldFormat
         try:
@@ -267,3 +632,68 @@ class TestEmptyLevelFieldName(unittest.TestCase):
         got = decode_if_binary_to_string(out.read())
         want = '{"foo":"bar","n":123}\n'
         self.assertEqual(want, got)
+
+
+class TestEnabled(unittest.TestCase):
+    def tearDown(self):
+        zerolog.set_global_level(zerolog.DebugLevel)
+
+    def test_enabled(self):
+        log = zerolog.new(io.BytesIO()).level(zerolog.InfoLevel)
+        self.assertFalse(log.enabled(zerolog.DebugLevel))
+        self.assertTrue(log.enabled(zerolog.InfoLevel))
+        self.assertFalse(zerolog.new(None).enabled(zerolog.ErrorLevel))
+
+        log.level(zerolog.DebugLevel)
+        self.assertTrue(log.enabled(zerolog.DebugLevel))
+
+    def test_global_level(self):
+        out = io.BytesIO()
+        log = zerolog.new(out)
+        self.assertTrue(log.enabled(zerolog.InfoLevel))
+        self.assertIsNotNone(log.info())
+
+        zerolog.set_global_level(zerolog.WarnLevel)
+        self.assertIs(zerolog.WarnLevel, zerolog.global_level())
+        self.assertFalse(log.enabled(zerolog.InfoLevel))
+        self.assertIsNone(log.info())
+        self.assertIsNotNone(log.warn())
+
+        zerolog.set_global_level(zerolog.DebugLevel)
+        self.assertTrue(log.enabled(zerolog.InfoLevel))
+
+
+class TestWith(unittest.TestCase):
+    def test_with(self):
+        parent = zerolog.new(None).ctx().str("app", "api").logger()
+        child = parent.with_({"req": 1}, user="bob")
+        out = io.BytesIO()
+        child.output(out).log().msg("")
+        got = decode_if_binary_to_string(out.read())
+        self.assertEqual('{"app":"api","req":1,"user":"bob"}\n', got)
+
+        out = io.BytesIO()
+        parent.output(out).log().msg("")
+        got = decode_if_binary_to_string(out.read())
+        self.assertEqual('{"app":"api"}\n', got)
+
+    def test_with_empty_context(self):
+        out = io.BytesIO()
+        zerolog.new(out).with_(a=1).with_(b=2).log().msg("")
+        got = decode_if_binary_to_string(out.read())
+        self.assertEqual('{"a":1,"b":2}\n', got)
+
+    def test_with_hooks(self):
+        hook = zerolog.HookFunc(lambda e, lvl, msg: e.bool("hooked", True))
+        parent = zerolog.new(None)
+        child = parent.with_(a=1)
+        parent.hook(hook)
+
+        out = io.BytesIO()
+        child.output(out).log().msg("")
+        self.assertEqual('{"a":1}\n', decode_if_binary_to_string(out.read()))
+
+        out = io.BytesIO()
+        parent.with_(a=1).output(out).log().msg("")
+        got = decode_if_binary_to_string(out.read())
+        self.assertEqual('{"a":1,"hooked":true}\n', got)
@@ -0,0 +1,87 @@
+import json
+import threading
+import unittest
+
+import zerolog
+from zerolog import Histogram, Metrics
+from zerolog.metrics import _bounds, _index
+from tests import Writer
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets(self):
+        bits = 3
+        prev = -1
+        for v in list(range(100)) + [1000, 12345, 2**40 + 7, 2**63]:
+            i = _index(v, bits)
+            lo, hi = _bounds(i, bits)
+            self.assertTrue(lo <= v <= hi, f"{v} not in [{lo}, {hi}]")
+            self.assertLessEqual(hi - lo, max(1, lo >> bits), v)
+            self.assertGreaterEqual(i, prev)
+            prev = i
+
+    def test_snapshot(self):
+        h = Histogram()
+        self.assertEqual({"count": 0}, h.snapshot())
+        for v in range(1, 1001):
+            h.record(v)
+        snap = h.snapshot()
+        self.assertEqual(1000, snap["count"])
+        self.assertEqual(1, snap["min"])
+        self.assertEqual(1000, snap["max"])
+        self.assertEqual(500.5, snap["mean"])
+        for p in (50, 90, 99, 99.9):
+            want = p * 10
+            got = snap[f"p{p:g}"]
+            self.assertTrue(want <= got <= want * 1.125, f"p{p}: {got}")
+
+    def test_threads(self):
+        h = Histogram()
+
+        def run():
+            for v in range(100):
+                h.record(v)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(400, h.snapshot()["count"])
+        self.assertEqual((0, 4), h.buckets()[0])
+
+
+class TestMetrics(unittest.TestCase):
+    def test_metrics(self):
+        m = Metrics(sample_every=2)
+        hook = zerolog.HookFunc(lambda e, lvl, msg: None)
+        log = zerolog.new(Writer()).hook(hook).metrics(m)
+        self.assertIs(m, log.get_metrics())
+        for _ in range(10):
+            log.info().str("foo", "bar").msg("")
+        snap = m.snapshot()
+        for name in ("encode_ns", "hook_ns", "write_ns", "event_bytes"):
+            self.assertEqual(5, snap[name]["count"], name)
+        self.assertEqual(
+            len(b'{"level":"info","foo":"bar"}\n'), snap["event_bytes"]["max"]
+        )
+        self.assertEqual({"count": 0}, snap["queue_depth"])
+
+    def test_report(self):
+        m = Metrics(sample_every=1)
+        w = Writer()
+        log = zerolog.new(w).metrics(m)
+        log.info().msg("")
+        m.report(log)
+        self.assertEqual("zerolog metrics", w.events()[1]["message"])
+        self.assertEqual(1, w.events()[1]["write_ns"]["count"])
+
+    def test_start_report(self):
+        m = Metrics()
+        w = Writer()
+        done = threading.Event()
+        log = zerolog.new(w).hook(zerolog.HookFunc(lambda e, lvl, msg: done.set()))
+        m.start_report(log, interval=0.01)
+        self.assertTrue(done.wait(5))
+        m.stop_report()
+        self.assertEqual("zerolog metrics", w.events()[0]["message"])
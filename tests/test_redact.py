@@ -0,0 +1,142 @@
+import unittest
+from dataclasses import dataclass
+
+import zerolog
+from zerolog.encoder_json import decode_if_binary_to_string
+from tests import Writer
+
+
+@dataclass
+class User:
+    name: str
+    password: str
+
+
+class TestRedaction(unittest.TestCase):
+    def setUp(self):
+        zerolog.set_redaction(
+            zerolog.Redaction(
+                keys=["password", "authorization"],
+                patterns=["*_token"],
+                values=[r"\b\d{4}(?:[ -]?\d{4}){3}\b"],
+            )
+        )
+
+    def tearDown(self):
+        zerolog.set_redaction(None)
+
+    def test_redaction(self):
+        w = Writer()
+        l = zerolog.new(w).ctx().str("api_token", "t").str("service", "a").logger()
+        l.info().str("password", "p").dict(
+            "Authorization", zerolog.dict().str("scheme", "basic")
+        ).ints("refresh_token", [1, 2]).str("card", "4111 1111 1111 1111").fields(
+            {"headers": {"authorization": "Bearer t", "accept": ["*/*"]}}
+        ).any(
+            "user", User("bob", "p")
+        ).msg(
+            "done"
+        )
+        l.with_(password="p").log().send()
+        self.assertEqual(
+            [
+                '{"level":"info","api_token":"[REDACTED]","service":"a",'
+                '"password":"[REDACTED]","Authorization":"[REDACTED]",'
+                '"refresh_token":"[REDACTED]","card":"[REDACTED]",'
+                '"headers":{"authorization":"[REDACTED]","accept":["*/*"]},'
+                '"user":{"name":"bob","password":"[REDACTED]"},"message":"done"}\n',
+                '{"api_token":"[REDACTED]","service":"a","password":"[REDACTED]"}\n',
+            ],
+            w.out,
+        )
+
+    def test_redaction_nested(self):
+        w = Writer()
+        zerolog.new(w).log().any("password", {"a": {"b": 1}}).any(
+            "authorization", [{"a": "b"}, 1]
+        ).any("session_token", User("bob", "p")).fields(
+            {"password": {"a": [1, {"b": 2}]}, "user": "bob"}
+        ).vector_summary(
+            "password", [1, 2, 3]
+        ).vector(
+            "csrf_token", [1, 2, 3], limit=2
+        ).send()
+        self.assertEqual(
+            [
+                {
+                    "password": "[REDACTED]",
+                    "authorization": "[REDACTED]",
+                    "session_token": "[REDACTED]",
+                    "user": "bob",
+                    "csrf_token": "[REDACTED]",
+                }
+            ],
+            w.events(),
+        )
+        self.assertEqual(
+            '{"password":"[REDACTED]","authorization":"[REDACTED]",'
+            '"session_token":"[REDACTED]","password":"[REDACTED]","user":"bob",'
+            '"password":"[REDACTED]","csrf_token":"[REDACTED]"}\n',
+            w.out[0],
+        )
+
+    def test_redaction_nested_context(self):
+        w = Writer()
+        l = zerolog.new(w).ctx().any("password", {"a": {"b": 1}}).logger()
+        l.log().any("user", {"password": {"a": 1}, "name": "bob"}).send()
+        self.assertEqual(
+            [
+                '{"password":"[REDACTED]",'
+                '"user":{"password":"[REDACTED]","name":"bob"}}\n'
+            ],
+            w.out,
+        )
+
+    def test_redaction_values_nested(self):
+        w = Writer()
+        card = "4111 1111 1111 1111"
+        zerolog.new(w).log().any(
+            "v", {"e": ValueError(card), "b": card.encode(), "l": [card]}
+        ).fields({"b": bytearray(card.encode())}).send()
+        self.assertEqual(
+            [
+                '{"v":{"e":"[REDACTED]","b":"[REDACTED]","l":["[REDACTED]"]},'
+                '"b":"[REDACTED]"}\n'
+            ],
+            w.out,
+        )
+
+    def test_redaction_template(self):
+        w = Writer()
+        t = zerolog.new(w).template(
+            zerolog.InfoLevel, "login", ("user", str), ("password", str)
+        )
+        t.emit("bob", "p")
+        self.assertEqual(
+            [
+                '{"level":"info","user":"bob","password":"[REDACTED]","message":"login"}\n'
+            ],
+            w.out,
+        )
+
+    def test_redaction_removed(self):
+        r = zerolog.get_redaction()
+        self.assertTrue(r.redacts("PASSWORD"))
+        self.assertTrue(r.redacts("csrf_token"))
+        self.assertFalse(r.redacts("user"))
+
+        zerolog.set_redaction(None)
+        self.assertIsNone(zerolog.get_redaction())
+        w = Writer()
+        zerolog.new(w).log().str("password", "p").any("user", User("bob", "p")).send()
+        self.assertEqual(
+            ['{"password":"p","user":{"name":"bob","password":"p"}}\n'], w.out
+        )
+
+    def test_redaction_case(self):
+        zerolog.set_redaction(
+            zerolog.Redaction(keys=["password"], mask="***", ignore_case=False)
+        )
+        w = Writer()
+        zerolog.new(w).log().str("Password", "p").str("password", "p").send()
+        self.assertEqual(['{"Password":"p","password":"***"}\n'], w.out)
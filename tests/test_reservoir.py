@@ -0,0 +1,119 @@
+import json
+import time
+import unittest
+
+import zerolog
+from zerolog import ReservoirSampler
+from tests import FailingWriter, Writer
+
+
+class TestReservoirSampler(unittest.TestCase):
+    def test_sample(self):
+        w = Writer()
+        r = ReservoirSampler(k=5, interval=60)
+        log = zerolog.new(w).hook(r)
+        for i in range(100):
+            log.info().int("i", i).msg("")
+        self.assertEqual([], w.events())
+
+        r.flush()
+        self.assertEqual(5, len(w.events()))
+        self.assertEqual([20.0] * 5, [o["sample_weight"] for o in w.events()])
+        # Events are written in the order they were logged.
+        ids = [o["i"] for o in w.events()]
+        self.assertEqual(sorted(ids), ids)
+        self.assertEqual(5, len(set(ids)))
+
+    def test_stats(self):
+        s = zerolog.Stats()
+        r = ReservoirSampler(k=5, interval=60)
+        log = zerolog.new(Writer()).stats(s).hook(r)
+        for i in range(100):
+            log.info().int("i", i).msg("")
+        r.flush()
+        r = ReservoirSampler(k=5, interval=60)
+        of = zerolog.ExceptionHandler
+        try:
+            zerolog.ExceptionHandler = lambda e: None
+            zerolog.new(FailingWriter()).stats(s).hook(r).warn().msg("")
+            r.flush()
+        finally:
+            zerolog.ExceptionHandler = of
+        got = s.snapshot()
+        self.assertEqual(5, got["emitted"]["info"])
+        self.assertEqual(95, got["discarded"]["info"])
+        self.assertEqual(1, got["write_errors"]["warn"])
+
+    def test_writers(self):
+        r = ReservoirSampler(k=5, interval=60)
+        for _ in range(100):
+            zerolog.new(Writer()).hook(r).info().msg("")
+        self.assertLessEqual(len(r._writers), 64)
+
+    def test_less_than_k(self):
+        w = Writer()
+        r = ReservoirSampler(k=5, interval=60)
+        log = zerolog.new(w).hook(r)
+        log.info().msg("a")
+        log.log().msg("")
+        r.flush()
+        self.assertEqual(
+            [
+                {"level": "info", "message": "a", "sample_weight": 1.0},
+                {"sample_weight": 1.0},
+            ],
+            w.events(),
+        )
+
+    def test_k(self):
+        with self.assertRaises(ValueError):
+            ReservoirSampler(k=0)
+
+    def test_post_hook(self):
+        w = Writer()
+        r = ReservoirSampler(k=5, interval=60)
+        posts = {
+            "a": lambda p, lvl: p.rstrip(b"\n"),
+            "b": lambda p, lvl: p + b"\r\n",
+            "c": lambda p, lvl: b"c\n",
+        }
+        for msg, post in posts.items():
+            log = zerolog.new(w).hook(r).post_hook(zerolog.PostHookFunc(post))
+            log.log().msg(msg)
+        r.flush()
+        self.assertEqual(
+            [
+                '{"message":"a","sample_weight":1.0}\n',
+                '{"message":"b","sample_weight":1.0}\n',
+                "c\n",
+            ],
+            w.out,
+        )
+
+    def test_by_level(self):
+        w = Writer()
+        r = ReservoirSampler(k=2, interval=60, by_level=True)
+        log = zerolog.new(w).hook(r)
+        for _ in range(10):
+            log.info().msg("")
+        for _ in range(3):
+            log.warn().msg("")
+        r.flush()
+        got = [(o["level"], o["sample_weight"]) for o in w.events()]
+        self.assertEqual(
+            [("info", 5.0), ("info", 5.0), ("warn", 1.5), ("warn", 1.5)],
+            sorted(got),
+        )
+
+    def test_interval(self):
+        w = Writer()
+        r = ReservoirSampler(k=1, interval=0.01)
+        log = zerolog.new(w).hook(r)
+        log.info().msg("a")
+        log.info().msg("a")
+        time.sleep(0.02)
+        log.info().msg("b")
+        self.assertEqual(1, len(w.events()))
+        self.assertEqual(2.0, w.events()[0]["sample_weight"])
+        r.flush()
+        self.assertEqual("b", w.events()[1]["message"])
@@ -1,8 +1,24 @@
+import contextvars
+import threading
+import time
 import unittest
 from dataclasses import dataclass
 
+import zerolog
 from zerolog import Level
-from zerolog.sampler import Sampler, BasicSampler, BurstSampler, RandomSampler
+from zerolog.sampler import (
+    Sampler,
+    AdaptiveSampler,
+    BasicSampler,
+    BurstSampler,
+    HashSampler,
+    KeyedTokenBucketSampler,
+    RandomSampler,
+    TokenBucketSampler,
+    _RateWindow,
+    key_by_level,
+)
+from tests import Writer
 
 
 class TestSampler(unittest.TestCase):
@@ -33,3 +49,180 @@ class TestSampler(unittest.TestCase):
 
             msg = f"{t.name}.sample(0) == true {got} on {t.total}, want [{t.want_min}, {t.want_max}]"
             self.assertFalse(got < t.want_min or got > t.want_max, msg)
+
+    def test_basic_sampler_threads(self):
+        for lock in (None, threading.Lock()):
+            self._test_basic_sampler_threads(lock)
+
+    def _test_basic_sampler_threads(self, lock):
+        s = BasicSampler(5)
+        # The lock is only set when running without the GIL.
+        s._lock = lock
+        got = []
+
+        def run():
+            got.append(sum(s.sample(Level.InfoLevel) for _ in range(100)))
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # Every 5th event of all the threads is sent.
+        self.assertEqual(80, sum(got))
+
+    def test_burst_sampler_threads(self):
+        s = BurstSampler(20, 60)
+        got = []
+
+        def run():
+            got.append(sum(s.sample(Level.InfoLevel) for _ in range(100)))
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(20, sum(got))
+
+    def test_sampling_disabled(self):
+        log = zerolog.new(Writer()).sample(RandomSampler(0))
+        self.assertIsNone(log.info())
+        zerolog.disable_sampling(True)
+        try:
+            self.assertTrue(zerolog.sampling_disabled())
+            self.assertIsNotNone(log.info())
+        finally:
+            zerolog.disable_sampling(False)
+        self.assertIsNone(log.info())
+
+    def test_token_bucket_sampler(self):
+        s = TokenBucketSampler(rate=0.0001, burst=20)
+        got = sum(1 for _ in range(100) if s.sample(Level.DebugLevel))
+        self.assertEqual(20, got)
+
+        s = TokenBucketSampler(rate=0.0001, burst=20, next_sampler=BasicSampler(5))
+        got = sum(1 for _ in range(120) if s.sample(Level.DebugLevel))
+        self.assertEqual(40, got)
+
+    def test_token_bucket_sampler_refill(self):
+        s = TokenBucketSampler(rate=1000, burst=1)
+        self.assertTrue(s.sample(Level.DebugLevel))
+        time.sleep(0.01)
+        self.assertTrue(s.sample(Level.DebugLevel))
+
+    def test_keyed_token_bucket_sampler(self):
+        s = KeyedTokenBucketSampler(rate=0.0001, burst=5, key_func=key_by_level)
+        got = {}
+        for lvl in [Level.DebugLevel, Level.InfoLevel]:
+            got[lvl] = sum(1 for _ in range(50) if s.sample(lvl))
+        self.assertEqual({Level.DebugLevel: 5, Level.InfoLevel: 5}, got)
+
+    def test_keyed_token_bucket_sampler_call_site(self):
+        s = KeyedTokenBucketSampler(rate=0.0001, burst=1)
+        w = Writer()
+        log = zerolog.new(w).sample(s)
+        for _ in range(10):
+            e = log.info()
+            if e is not None:
+                e.msg("a")
+            e = log.info()
+            if e is not None:
+                e.msg("b")
+        self.assertEqual(2, len(w.out))
+
+    def test_keyed_token_bucket_sampler_frame(self):
+        frames = []
+        s = KeyedTokenBucketSampler(
+            rate=0.0001, burst=1, key_func=lambda lvl, f: frames.append(f())
+        )
+        zerolog.new(Writer()).sample(s).info()
+        self.assertEqual(
+            "test_keyed_token_bucket_sampler_frame", frames[0].f_code.co_name
+        )
+
+    def test_keyed_token_bucket_sampler_max_keys(self):
+        s = KeyedTokenBucketSampler(
+            rate=0.0001, burst=1, key_func=lambda lvl, f: next(keys), max_keys=2
+        )
+        keys = iter(["a", "b", "c", "a"])
+        got = [s.sample(Level.DebugLevel) for _ in range(4)]
+        # "a" was evicted by "c", so it gets a new bucket.
+        self.assertEqual([True, True, True, True], got)
+        self.assertEqual(["c", "a"], list(s._buckets))
+
+    def test_adaptive_sampler(self):
+        s = AdaptiveSampler(rate=10, period=1)
+        got = sum(1 for _ in range(1000) if s.sample(Level.DebugLevel))
+        # The first event is kept, then the probability decreases as the
+        # observed rate increases.
+        self.assertTrue(1 <= got <= 30, got)
+        self.assertAlmostEqual(0.001, s._windows[Level.DebugLevel].p)
+
+        # Levels are measured separately.
+        self.assertTrue(s.sample(Level.InfoLevel))
+
+    def test_adaptive_sampler_window(self):
+        s = AdaptiveSampler(rate=1000, period=0.01)
+        for _ in range(1000):
+            s.sample(Level.DebugLevel)
+        self.assertLess(s._windows[Level.DebugLevel].p, 1.0)
+        time.sleep(0.05)
+        # The previous window was long and quiet, the rate is low again.
+        self.assertTrue(s.sample(Level.DebugLevel))
+        self.assertEqual(1.0, s._windows[Level.DebugLevel].p)
+
+    def test_adaptive_sampler_spike(self):
+        s = AdaptiveSampler(rate=100, period=1)
+        w = s._windows[Level.DebugLevel] = _RateWindow(time.monotonic())
+        # The previous period was at the rate.
+        w.prev_count, w.prev_elapsed = 100, 1.0
+        got = sum(1 for _ in range(5000) if s.sample(Level.DebugLevel))
+        self.assertLess(got, 150)
+
+    def test_adaptive_sampler_hook(self):
+        s = AdaptiveSampler(rate=1000)
+        w = Writer()
+        log = zerolog.new(w).sample(s).hook(s)
+        log.info().msg("")
+        self.assertEqual(['{"level":"info","sample_rate":1.0}\n'], w.out)
+
+    def test_hash_sampler(self):
+        request_id = contextvars.ContextVar("request_id", default=None)
+        s = HashSampler(rate=0.25, key_func=request_id.get)
+
+        # Events without a key are kept.
+        self.assertTrue(s.sample(Level.DebugLevel))
+
+        got = 0
+        for i in range(10000):
+            request_id.set(f"request-{i}")
+            ok = s.sample(Level.DebugLevel)
+            # The decision only depends on the key.
+            self.assertEqual(ok, HashSampler(rate=0.25).keep(f"request-{i}"))
+            if ok:
+                got += 1
+        self.assertTrue(2000 <= got <= 3000, got)
+
+    def test_hash_sampler_bounds(self):
+        self.assertFalse(HashSampler(rate=0).keep("foo"))
+        self.assertTrue(HashSampler(rate=1).keep("foo"))
+
+    def test_hash_sampler_hook(self):
+        w = Writer()
+        log = zerolog.new(w).hook(HashSampler(rate=0.5, field="id"))
+        kept = [i for i in range(20) if HashSampler(rate=0.5).keep(i)]
+        for i in range(20):
+            log.info().int("id", i).msg("")
+        log.info().msg("no id")
+        self.assertEqual(len(kept) + 1, len(w.out))
+        self.assertTrue(0 < len(kept) < 20)
+
+    def test_hash_sampler_hook_string(self):
+        w = Writer()
+        log = zerolog.new(w).hook(HashSampler(rate=0.5, field="id"))
+        ids = [f'req-"{i}"' if i % 2 else f"req-{i}" for i in range(20)]
+        kept = [i for i in ids if HashSampler(rate=0.5).keep(i)]
+        for i in ids:
+            log.info().str("id", i).msg("")
+        self.assertEqual(kept, [e["id"] for e in w.events()])
@@ -0,0 +1,102 @@
+import threading
+import unittest
+
+import zerolog
+from zerolog import Stats
+from zerolog.hook import HookFunc
+from zerolog.sampler import BasicSampler
+from tests import FailingWriter, Writer
+
+
+class TestStats(unittest.TestCase):
+    def test_logger_stats(self):
+        s = Stats()
+        log = zerolog.new(Writer()).level(zerolog.InfoLevel).stats(s)
+        log.debug()
+        log.info().msg("")
+        log.info().msg("")
+        log.warn().msg("")
+
+        sampled = log.sample(BasicSampler(2))
+        for _ in range(4):
+            e = sampled.error()
+            if e is not None:
+                e.msg("")
+
+        got = s.snapshot()
+        self.assertEqual(1, got["filtered"]["debug"])
+        self.assertEqual(2, got["emitted"]["info"])
+        self.assertEqual(1, got["emitted"]["warn"])
+        self.assertEqual(2, got["emitted"]["error"])
+        self.assertEqual(2, got["sampled"]["error"])
+        self.assertEqual(len(b'{"level":"info"}\n') * 2, got["bytes"]["info"])
+
+    def test_discarded_and_write_errors(self):
+        of = zerolog.ExceptionHandler
+        try:
+            zerolog.ExceptionHandler = lambda e: None
+            s = Stats()
+            log = zerolog.new(FailingWriter()).stats(s)
+            log.info().msg("")
+            log.hook(HookFunc(lambda e, level, msg: e.discard())).warn().msg("")
+            got = s.snapshot()
+            self.assertEqual(1, got["write_errors"]["info"])
+            self.assertEqual(1, got["discarded"]["warn"])
+            self.assertEqual(0, got["emitted"]["info"])
+        finally:
+            zerolog.ExceptionHandler = of
+
+    def test_global_stats(self):
+        before = zerolog.global_stats().snapshot()["emitted"]["info"]
+        zerolog.new(Writer()).info().msg("")
+        after = zerolog.global_stats().snapshot()["emitted"]["info"]
+        self.assertEqual(before + 1, after)
+
+    def test_global_filtered(self):
+        def filtered():
+            return zerolog.global_stats().snapshot()["filtered"]["trace"]
+
+        log = zerolog.new(Writer())
+        before = filtered()
+        log.trace()
+        self.assertEqual(before, filtered())
+        zerolog.count_filtered(True)
+        try:
+            self.assertTrue(zerolog.filtered_counted())
+            log.trace()
+            self.assertEqual(before + 1, filtered())
+        finally:
+            zerolog.count_filtered(False)
+
+    def test_threads(self):
+        s = Stats()
+        log = zerolog.new(Writer()).stats(s)
+
+        def run():
+            for _ in range(1000):
+                log.info().msg("")
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(8000, s.snapshot()["emitted"]["info"])
+        # The shards of the exited threads were folded into the retired one.
+        self.assertEqual(1, len(s._counters._shards.all()))
+
+    def test_prometheus(self):
+        s = Stats()
+        zerolog.new(Writer()).stats(s).info().msg("")
+        got = s.prometheus(labels={"logger": "api"})
+        self.assertIn(
+            "# TYPE zerolog_events_emitted_total counter\n"
+            'zerolog_events_emitted_total{level="trace",logger="api"} 0\n',
+            got,
+        )
+        self.assertIn(
+            'zerolog_events_emitted_total{level="info",logger="api"} 1\n', got
+        )
+        self.assertIn(
+            'zerolog_bytes_written_total{level="info",logger="api"} 17\n', got
+        )
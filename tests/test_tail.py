@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+
+import zerolog
+from zerolog import TailSampler
+from tests import Writer
+
+
+class TestTailSampler(unittest.TestCase):
+    def setUp(self):
+        self.w = Writer()
+        self.tail = TailSampler(max_events=3)
+        self.log = zerolog.new(self.w).level(zerolog.DebugLevel).hook(self.tail)
+
+    def test_drop(self):
+        with self.tail.scope():
+            self.log.debug().msg("a")
+            self.log.debug().msg("b")
+            self.log.info().msg("c")
+        self.assertEqual(['{"level":"info","message":"c"}\n'], self.w.out)
+
+    def test_stats(self):
+        s = zerolog.Stats()
+        log = self.log.stats(s)
+        with self.tail.scope():
+            for m in "abcd":
+                log.debug().msg(m)
+        with self.tail.scope():
+            log.debug().msg("e")
+            log.error().msg("f")
+        got = s.snapshot()
+        self.assertEqual({"debug": 1, "error": 1}, _nonzero(got["emitted"]))
+        self.assertEqual({"debug": 4}, _nonzero(got["discarded"]))
+
+    def test_flush_on_error(self):
+        with self.tail.scope():
+            self.log.debug().msg("a")
+            self.log.info().msg("b")
+            self.log.error().msg("c")
+            self.log.debug().msg("d")
+        self.assertEqual(
+            [
+                '{"level":"info","message":"b"}\n',
+                '{"level":"debug","message":"a"}\n',
+                '{"level":"error","message":"c"}\n',
+                '{"level":"debug","message":"d"}\n',
+            ],
+            self.w.out,
+        )
+
+    def test_max_events(self):
+        with self.tail.scope():
+            for m in "abcde":
+                self.log.debug().msg(m)
+            self.tail.flush()
+        self.assertEqual(
+            [f'{{"level":"debug","message":"{m}"}}\n' for m in "cde"],
+            self.w.out,
+        )
+
+    def test_no_scope(self):
+        self.log.debug().msg("a")
+        self.assertEqual(['{"level":"debug","message":"a"}\n'], self.w.out)
+
+    def test_scopes_are_isolated(self):
+        with self.tail.scope():
+            self.log.debug().msg("a")
+        with self.tail.scope():
+            self.log.error().msg("b")
+        self.assertEqual(['{"level":"error","message":"b"}\n'], self.w.out)
+
+    def test_asyncio(self):
+        async def work(i: int):
+            self.log.debug().int("i", i).msg("")
+            if i == 1:
+                self.log.error().int("i", i).msg("")
+
+        async def request(i: int):
+            with self.tail.scope():
+                await asyncio.gather(work(i), work(i))
+
+        async def main():
+            await asyncio.gather(request(0), request(1))
+
+        asyncio.run(main())
+        self.assertEqual(
+            [
+                '{"level":"debug","i":1}\n',
+                '{"level":"error","i":1}\n',
+                '{"level":"debug","i":1}\n',
+                '{"level":"error","i":1}\n',
+            ],
+            self.w.out,
+        )
+
+
+def _nonzero(counts):
+    return {k: v for k, v in counts.items() if v}
@@ -0,0 +1,77 @@
+import io
+import unittest
+
+import zerolog
+from zerolog.encoder_json import decode_if_binary_to_string
+from zerolog.sampler import BasicSampler
+from tests import Writer
+
+
+class TestTemplate(unittest.TestCase):
+    def test_emit(self):
+        w = Writer()
+        l = zerolog.new(w).ctx().str("app", "api").logger()
+        t = l.template(
+            zerolog.InfoLevel, "req", ("route", str), ("status", int), "extra"
+        )
+        t.emit("/users", 200, {"a": [1]})
+        l.info().str("route", "/users").int("status", 200).any("extra", {"a": [1]}).msg(
+            "req"
+        )
+        self.assertEqual(
+            '{"level":"info","app":"api","route":"/users","status":200,'
+            '"extra":{"a":[1]},"message":"req"}\n',
+            w.out[0],
+        )
+        self.assertEqual(w.out[0], w.out[1])
+
+    def test_emit_no_level(self):
+        out = io.BytesIO()
+        zerolog.new(out).template(zerolog.NoLevel, "", ("n", float)).emit(1.5)
+        self.assertEqual('{"n":1.5}\n', decode_if_binary_to_string(out.read()))
+
+        out = io.BytesIO()
+        zerolog.new(out).template(zerolog.NoLevel, "hello").emit()
+        got = decode_if_binary_to_string(out.read())
+        self.assertEqual('{"message":"hello"}\n', got)
+
+    def test_emit_values(self):
+        t = zerolog.new(Writer()).template(zerolog.InfoLevel, "", "a", "b")
+        with self.assertRaises(TypeError):
+            t.emit(1)
+
+    def test_level(self):
+        w = Writer()
+        l = zerolog.new(w).level(zerolog.WarnLevel)
+        l.template(zerolog.InfoLevel, "no").emit()
+        l.template(zerolog.WarnLevel, "yes").emit()
+        self.assertEqual(['{"level":"warn","message":"yes"}\n'], w.out)
+
+    def test_sampler(self):
+        w = Writer()
+        t = zerolog.new(w).sample(BasicSampler(2)).template(zerolog.InfoLevel, "")
+        for _ in range(4):
+            t.emit()
+        self.assertEqual(2, len(w.out))
+
+    def test_hooks(self):
+        w = Writer()
+        got = []
+
+        def hook(e: zerolog.Event, lvl: zerolog.Level, msg: str):
+            got.append((lvl, msg))
+            e.bool("hooked", True)
+
+        l = zerolog.new(w).hook(zerolog.HookFunc(hook))
+        l.template(zerolog.ErrorLevel, "failed", ("code", int)).emit(3)
+        self.assertEqual([(zerolog.ErrorLevel, "failed")], got)
+        self.assertEqual(
+            '{"level":"error","code":3,"hooked":true,"message":"failed"}\n', w.out[0]
+        )
+
+    def test_bind(self):
+        w = Writer()
+        t = zerolog.new(w).template(zerolog.InfoLevel, "", ("n", int))
+        with zerolog.bind(request_id="abc"):
+            t.emit(1)
+        self.assertEqual('{"level":"info","request_id":"abc","n":1}\n', w.out[0])
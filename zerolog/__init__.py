@@ -1,4 +1,6 @@
+import importlib
 import sys
+from typing import TYPE_CHECKING, Any, List
 
 from ._globals import (
     _TimestampFieldName as TimestampFieldName,
@@ -19,6 +21,8 @@ from ._globals import (
     _ExceptionMarshalFunc as ExceptionMarshalFunc,
     _AnyMarshalFunc as AnyMarshalFunc,
     _TimeFieldFormat as TimeFieldFormat,
+    _DurationFieldUnit as DurationFieldUnit,
+    _DurationFieldInteger as DurationFieldInteger,
     _TimestampFunc as TimestampFunc,
     _ExceptionHandler as ExceptionHandler,
     _LevelColors as LevelColors,
@@ -27,8 +31,11 @@ from ._globals import (
     _global_level as global_level,
     _disable_sampling as disable_sampling,
     _sampling_disabled as sampling_disabled,
+    _count_filtered as count_filtered,
+    _filtered_counted as filtered_counted,
 )
-from .console import ConsoleWriter
+from .array import Array, arr
+from .bind import Binding, bind
 from .constants import (
     TimeFormatRFC3339,
     TimeFormatRFC3339Ms,
@@ -38,8 +45,8 @@ from .constants import (
     TimeFormatUnixMicro,
 )
 from .context import Context
-from .event import Event
-from .hook import Hook, HookFunc, LevelHook
+from .event import Event, dict
+from .hook import Hook, HookFunc, LevelHook, PostHook, PostHookFunc
 from .level import (
     Level,
     DebugLevel,
@@ -52,7 +59,69 @@ from .level import (
     TraceLevel,
 )
 from .logger import Logger, new
-from .sampler import Sampler, BasicSampler, BurstSampler, LevelSampler, RandomSampler
+from .marshal import register_marshal_func, unregister_marshal_func
+from .sampler import (
+    Sampler,
+    AdaptiveSampler,
+    BasicSampler,
+    BurstSampler,
+    HashSampler,
+    KeyedTokenBucketSampler,
+    LevelSampler,
+    RandomSampler,
+    TokenBucketSampler,
+)
+from .stats import Stats, global_stats
+from .timer import Timer
+from .writer import Writer
+
+if TYPE_CHECKING:
+    from . import console, stacktrace
+    from .batch import Batch
+    from .console import ConsoleWriter
+    from .dedup import DedupHook
+    from .metrics import Histogram, Metrics
+    from .redact import Redaction, get_redaction, set_redaction
+    from .reservoir import ReservoirSampler
+    from .tail import TailSampler
+    from .template import Template
+
+    # GlobalLogger is the global logger.
+    GlobalLogger: Logger
+
+# Optional subsystems are imported on first access, so importing zerolog
+# doesn't pay for what isn't used: ConsoleWriter pulls dateutil for instance.
+_lazy = {
+    "Batch": "batch",
+    "ConsoleWriter": "console",
+    "DedupHook": "dedup",
+    "Histogram": "metrics",
+    "Metrics": "metrics",
+    "Redaction": "redact",
+    "ReservoirSampler": "reservoir",
+    "TailSampler": "tail",
+    "Template": "template",
+    "get_redaction": "redact",
+    "set_redaction": "redact",
+}
+_lazy_modules = ("bench", "console", "stacktrace")
+
+
+def __getattr__(name: str) -> Any:
+    if name == "GlobalLogger":
+        # GlobalLogger is created on first use, unless set before.
+        value: Any = new(sys.stderr.buffer).ctx().timestamp().logger()
+    elif name in _lazy:
+        value = getattr(importlib.import_module(f".{_lazy[name]}", __name__), name)
+    elif name in _lazy_modules:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 
-# GlobalLogger is the global logger.
-GlobalLogger = new(sys.stderr.buffer).ctx().timestamp().logger()
+def __dir__() -> List[str]:
+    names = set(globals()) | set(_lazy) | set(_lazy_modules)
+    names.add("GlobalLogger")
+    return sorted(names)
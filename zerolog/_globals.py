@@ -1,11 +1,12 @@
 import json
+import threading
 from datetime import datetime
 from functools import partial
 from inspect import Traceback
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Callable, NamedTuple
 
 from .constants import TimeFormatRFC3339Ms
-from .internal.util.atomic import Int
+from .time import Millisecond
 from .level import Level
 
 # _TimestampFieldName is the field name used for the timestamp field.
@@ -61,7 +62,8 @@ def _exception_marshal_func(e: Exception) -> Any:
 # _ExceptionMarshalFunc allows customization of global exception marshaling
 _ExceptionMarshalFunc = _exception_marshal_func
 
-# _AnyMarshalFunc allows customization of any marshaling.
+# _AnyMarshalFunc allows customization of any marshaling for the types
+# zerolog doesn't encode natively.
 _AnyMarshalFunc = json.dumps
 
 # _TimeFieldFormat defines the time format of the time field type. If set to
@@ -70,6 +72,14 @@ _AnyMarshalFunc = json.dumps
 # TimeFormatRFC3339Micro the time is formatted as a RFC3339 date string.
 _TimeFieldFormat = TimeFormatRFC3339Ms
 
+# _DurationFieldUnit defines the unit, in nanoseconds, for duration fields
+# added using the dur method.
+_DurationFieldUnit = Millisecond
+
+# _DurationFieldInteger renders duration fields as integers instead of floats
+# if set to True.
+_DurationFieldInteger = False
+
 # _TimestampFunc defines the function called to generate a timestamp.
 _TimestampFunc = partial(datetime.now, datetime.now().astimezone().tzinfo)
 
@@ -100,8 +110,21 @@ _FormattedLevels: Dict[Level, str] = {
     Level.FatalLevel: "FTL",
 }
 
-__g_level = Int(0)
-__disable_sampling = Int(0)
+
+# _GlobalState is an immutable snapshot of the global settings read on each
+# event. Writers replace the snapshot under _state_lock with an incremented
+# version; readers load _state once without locking, which is safe with and
+# without the GIL as rebinding a module attribute is atomic. The version lets
+# loggers cache values derived from the snapshot.
+class _GlobalState(NamedTuple):
+    version: int
+    level: Level
+    sampling_disabled: bool
+    count_filtered: bool
+
+
+_state = _GlobalState(0, Level.DebugLevel, False, False)
+_state_lock = threading.Lock()
 
 
 # _set_global_level sets the global override for log level. If this
@@ -109,21 +132,43 @@ __disable_sampling = Int(0)
 #
 # To globally disable logs, set global_level to Disabled.
 def _set_global_level(lvl: Level):
-    __g_level.store(lvl)
+    global _state
+    with _state_lock:
+        _state = _state._replace(version=_state.version + 1, level=Level(lvl))
 
 
 # _global_level returns the current global log level
 def _global_level() -> Level:
-    return Level(__g_level.load())
+    return _state.level
 
 
 # _disable_sampling will disable sampling in all Loggers if true.
 def _disable_sampling(v: bool):
-    i = 0
-    if v:
-        i = 1
-    __disable_sampling.store(i)
+    global _state
+    with _state_lock:
+        _state = _state._replace(version=_state.version + 1, sampling_disabled=bool(v))
 
 
 def _sampling_disabled() -> bool:
-    return __disable_sampling.load() == 1
+    return _state.sampling_disabled
+
+
+# _bump_version replaces the snapshot with a new version, so loggers update
+# the values they derive from the global settings, like their hooks.
+def _bump_version():
+    global _state
+    with _state_lock:
+        _state = _state._replace(version=_state.version + 1)
+
+
+# _count_filtered makes the global stats count the events filtered by level
+# if true. They are not counted by default so that a disabled event costs no
+# more than a level check; loggers with their own stats always count them.
+def _count_filtered(v: bool):
+    global _state
+    with _state_lock:
+        _state = _state._replace(version=_state.version + 1, count_filtered=bool(v))
+
+
+def _filtered_counted() -> bool:
+    return _state.count_filtered
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import zerolog
+from .encoder_json import enc
+from .internal.util.time import duration_ns
+from .marshal import append_any
+
+if TYPE_CHECKING:
+    from .event import Event
+
+# needed because some Array methods name conflict with types
+_str = str
+_int = int
+_float = float
+_bool = bool
+
+
+# Array is used to prepare an array of values to be added to an Event
+# or a Context. Elements are encoded as they are appended, so the array
+# is copied into its parent as already encoded bytes.
+class Array:
+    __slots__ = ("_buf",)
+
+    def __init__(self):
+        self._buf = b""
+
+    def _write(self, dst: bytes) -> bytes:
+        dst = enc.append_array_start(dst)
+        if len(self._buf) > 0:
+            dst += self._buf
+        return enc.append_array_end(dst)
+
+    # dict adds the dictionary d as an element of the array.
+    def dict(self, d: "Event") -> "Array":
+        d._buf = enc.append_end_marker(d._buf)
+        self._buf = enc.append_array_delim(self._buf)
+        self._buf += d._buf
+        return self
+
+    # str appends val as a string to the array.
+    def str(self, val: _str) -> "Array":
+        r = enc.redaction
+        if r is None:
+            self._buf = enc.append_string(enc.append_array_delim(self._buf), val)
+        else:
+            self._buf = r.append_string(enc.append_array_delim(self._buf), val)
+        return self
+
+    # int appends val as an int to the array.
+    def int(self, val: _int) -> "Array":
+        self._buf = enc.append_int(enc.append_array_delim(self._buf), val)
+        return self
+
+    # float appends val as a float to the array.
+    def float(self, val: _float) -> "Array":
+        self._buf = enc.append_float(enc.append_array_delim(self._buf), val)
+        return self
+
+    # bool appends val as a bool to the array.
+    def bool(self, val: _bool) -> "Array":
+        self._buf = enc.append_bool(enc.append_array_delim(self._buf), val)
+        return self
+
+    # time appends t formatted as string using zerolog.TimeFieldFormat.
+    def time(self, t: datetime) -> "Array":
+        self._buf = enc.append_time(
+            enc.append_array_delim(self._buf), t, zerolog.TimeFieldFormat
+        )
+        return self
+
+    # dur appends d to the array.
+    def dur(self, d: _int | _float | timedelta) -> "Array":
+        self._buf = enc.append_duration(
+            enc.append_array_delim(self._buf),
+            duration_ns(d),
+            zerolog.DurationFieldUnit,
+            zerolog.DurationFieldInteger,
+        )
+        return self
+
+    # any appends val encoded according to its type.
+    def any(self, val: Any) -> "Array":
+        self._buf = append_any(enc.append_array_delim(self._buf), val)
+        return self
+
+    # exc serializes and appends e to the array.
+    def exc(self, e: Exception) -> "Array":
+        m = zerolog.ExceptionMarshalFunc(e)
+        if m is None:
+            return self
+        if isinstance(m, _str):
+            return self.str(m)
+        if isinstance(m, Exception):
+            return self.str(_str(m))
+        return self.any(m)
+
+
+# arr creates an array to be added to an Event or Context.
+def arr() -> Array:
+    return Array()
@@ -0,0 +1,79 @@
+import threading
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+from .event import _Deferred, _write_error
+from .level import Level
+from .stats import BYTES, EMITTED, WRITE_ERRORS, Stats, record
+
+if TYPE_CHECKING:
+    from .logger import Logger
+
+
+# Batch accumulates the events of a logger in memory and writes them to its
+# output in a single write when flushed. It is created with Logger.batch and
+# used as a context manager, flushing on exit:
+#
+#   with log.batch() as blog:
+#       for m in messages:
+#           blog.info().str("id", m.id).msg("processed")
+#
+# blog is a Logger: events are built, filtered, sampled and hooked as usual,
+# only the write is deferred. If max_bytes is set, the events are also flushed
+# once they reach max_bytes. Events are counted in the stats when the batch
+# is written.
+class Batch(_Deferred):
+    def __init__(self, l: "Logger", max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.logger: "Logger" = l.output(self)
+
+        self._w = l._w
+        self._lock = threading.Lock()
+        self._buf: List[bytes] = []
+        self._events: List[Tuple[Stats | None, Level, int]] = []
+        self._size = 0
+
+    def __enter__(self) -> "Logger":
+        return self.logger
+
+    def __exit__(self, *exc: Any):
+        self.flush()
+
+    # write adds p to the batch.
+    def write(self, p: bytes) -> int:
+        self.defer(p, None, Level.NoLevel)
+        return len(p)
+
+    # defer adds the event p to the batch. It is called by the events of
+    # logger.
+    def defer(self, p: bytes, stats: Stats | None, lvl: Level):
+        with self._lock:
+            self._buf.append(p)
+            self._events.append((stats, lvl, len(p)))
+            self._size += len(p)
+            full = self.max_bytes > 0 and self._size >= self.max_bytes
+        if full:
+            self.flush()
+
+    # flush writes the events of the batch to the output of the logger.
+    def flush(self):
+        with self._lock:
+            buf = self._buf
+            events = self._events
+            self._buf = []
+            self._events = []
+            self._size = 0
+        if len(buf) == 0 or self._w is None:
+            return
+        w = self._w
+        try:
+            w.write(b"".join(buf))
+            if hasattr(w, "seek"):
+                w.seek(0)
+        except Exception as e:
+            for stats, lvl, _ in events:
+                record(stats, WRITE_ERRORS, lvl)
+            _write_error(e)
+            return
+        for stats, lvl, n in events:
+            record(stats, EMITTED, lvl)
+            record(stats, BYTES, lvl, n)
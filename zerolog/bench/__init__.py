@@ -0,0 +1,17 @@
+# Package bench holds the benchmarks of zerolog and the tools to run them and
+# compare their results:
+#
+#   python -m zerolog.bench run --output bench.json
+#   python -m zerolog.bench compare baseline.json bench.json
+from .runner import (
+    Benchmark,
+    Discard,
+    Op,
+    Setup,
+    benchmarks,
+    compare,
+    environment,
+    register,
+    run,
+    run_benchmark,
+)
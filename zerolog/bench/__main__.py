@@ -0,0 +1,84 @@
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+from .runner import benchmarks, compare, run
+
+
+def _print_result(name: str, r: Dict):
+    print(
+        f"{name:<45} {r['ns_per_op']:>12.1f} ns/op "
+        f"± {r['stdev_ns_per_op']:>8.1f} ({r['calls']} calls)",
+        flush=True,
+    )
+
+
+def _run(args: argparse.Namespace) -> int:
+    if args.list:
+        for b in benchmarks(args.filter):
+            print(b.name)
+        return 0
+    results = run(args.filter, args.min_time, args.repeat, _print_result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    rows, regressions = compare(old, new, args.threshold)
+    for name, before, after, change in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<45} {before:>12.1f} {after:>12.1f} ns/op {change:>+8.1%}{flag}")
+    if regressions:
+        print(
+            f"{len(regressions)} benchmark(s) slower by more than "
+            f"{args.threshold:.0%}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m zerolog.bench", description="zerolog benchmarks"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="run the benchmarks")
+    p.add_argument("-k", "--filter", help="only run benchmarks matching this regex")
+    p.add_argument("-o", "--output", help="write the results to this JSON file")
+    p.add_argument(
+        "--min-time",
+        type=float,
+        default=0.1,
+        help="minimum duration of each run in seconds (default: 0.1)",
+    )
+    p.add_argument("--repeat", type=int, default=5, help="number of runs (default: 5)")
+    p.add_argument("--list", action="store_true", help="list the benchmarks")
+    p.set_defaults(func=_run)
+
+    p = sub.add_parser("compare", help="compare two results files")
+    p.add_argument("old", help="baseline results")
+    p.add_argument("new", help="new results")
+    p.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown reported as a regression (default: 0.1)",
+    )
+    p.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
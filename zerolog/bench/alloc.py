@@ -0,0 +1,51 @@
+import gc
+import tracemalloc
+from typing import Dict
+
+from .runner import Op
+
+_filters = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+# measure returns the memory allocated by calls to op, per call:
+#
+#   - peak_bytes: the highest memory in use during a call, above the memory
+#     in use before it,
+#   - retained_bytes and retained_blocks: the memory and number of blocks
+#     still allocated after n calls, divided by n.
+#
+# op is called warmup times first so caches are filled.
+def measure(op: Op, n: int = 1000, warmup: int = 100) -> Dict[str, float]:
+    for _ in range(warmup):
+        op()
+    gc.collect()
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(min(n, 100)):
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            op()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+
+        gc.collect()
+        before = tracemalloc.take_snapshot().filter_traces(_filters)
+        for _ in range(n):
+            op()
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces(_filters)
+    finally:
+        if not started:
+            tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    return {
+        "peak_bytes": peak,
+        "retained_bytes": sum(s.size_diff for s in diff) / n,
+        "retained_blocks": sum(s.count_diff for s in diff) / n,
+    }
@@ -0,0 +1,312 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+import zerolog
+from zerolog.level import parse_level
+from zerolog.metrics import Histogram
+from zerolog.sampler import (
+    BasicSampler,
+    BurstSampler,
+    KeyedTokenBucketSampler,
+    Sampler,
+    TokenBucketSampler,
+)
+from .runner import Discard, environment
+from .soak import _tmp_dir
+
+_samplers: Dict[str, Callable[[], Sampler | None]] = {
+    "none": lambda: None,
+    "basic": lambda: BasicSampler(10),
+    "burst": lambda: BurstSampler(1000, 1, BasicSampler(10)),
+    "token_bucket": lambda: TokenBucketSampler(100000, 1000),
+    "keyed_token_bucket": lambda: KeyedTokenBucketSampler(100000, 1000),
+}
+
+_error = ValueError("connection refused")
+
+
+def _call(e: zerolog.Event | None, f: Callable[[zerolog.Event], Any]):
+    if e is not None:
+        f(e)
+
+
+# Calls are the log calls the load is made of, by name.
+_calls: Dict[str, Callable[[zerolog.Logger], None]] = {
+    "info": lambda l: _call(
+        l.info(),
+        lambda e: e.str("user", "bob").int("status", 200).msg("request handled"),
+    ),
+    "debug": lambda l: _call(l.debug(), lambda e: e.str("user", "bob").msg("debug")),
+    "error": lambda l: _call(l.error(), lambda e: e.exc(_error).msg("failed")),
+    "fields": lambda l: _call(
+        l.info(),
+        lambda e: e.str("user", "bob")
+        .str("request_id", "7b3c2f6a")
+        .int("status", 200)
+        .float("latency", 12.345)
+        .bool("cached", False)
+        .str("path", "/api/v1/users")
+        .str("method", "GET")
+        .int("bytes", 5120)
+        .int("retries", 0)
+        .str("region", "us-east-1")
+        .msg("request handled"),
+    ),
+    "with": lambda l: _call(
+        l.with_(request_id="7b3c2f6a").info(), lambda e: e.msg("request handled")
+    ),
+}
+
+
+@dataclass
+class Config:
+    # mix is the weight of each call of _calls.
+    mix: Dict[str, int]
+    writer: str = "discard"
+    sampler: str = "none"
+    level: str = "info"
+    duration: float = 2
+    path: str = ""
+
+
+# parse_mix parses a mix like "info:80,debug:15,error:5".
+def parse_mix(s: str) -> Dict[str, int]:
+    mix = {}
+    for part in s.split(","):
+        name, _, weight = part.partition(":")
+        name = name.strip()
+        if name not in _calls:
+            raise ValueError(f"unknown call {name}, expected one of {list(_calls)}")
+        mix[name] = int(weight) if weight else 1
+    return mix
+
+
+# _sequence returns the calls of the mix interleaved in their proportions.
+def _sequence(mix: Dict[str, int]) -> List[Callable[[zerolog.Logger], None]]:
+    total = sum(mix.values())
+    seq = []
+    credits = {name: 0 for name in mix}
+    for _ in range(total):
+        for name, weight in mix.items():
+            credits[name] += weight
+        name = max(credits, key=lambda n: credits[n])
+        credits[name] -= total
+        seq.append(_calls[name])
+    return seq
+
+
+def _new_writer(cfg: Config) -> zerolog.Writer:
+    match cfg.writer:
+        case "discard":
+            return Discard()
+        case "file":
+            return open(cfg.path, "ab")
+        case "console":
+            return zerolog.ConsoleWriter(out=Discard(), no_color=True)
+    raise ValueError(f"unknown writer {cfg.writer}")
+
+
+def _new_logger(cfg: Config, w: zerolog.Writer) -> zerolog.Logger:
+    l = zerolog.new(w).level(parse_level(cfg.level))
+    l = l.ctx().timestamp().str("service", "load").logger()
+    s = _samplers[cfg.sampler]()
+    if s is not None:
+        l = l.sample(s)
+    return l
+
+
+# _work calls the mix on l until the deadline, recording the latency of each
+# call in h. It returns the number of calls.
+def _work(l: zerolog.Logger, cfg: Config, h: Histogram, deadline: float) -> int:
+    seq = _sequence(cfg.mix)
+    clock = time.perf_counter_ns
+    n = 0
+    while time.monotonic() < deadline:
+        for call in seq:
+            start = clock()
+            call(l)
+            h.record(clock() - start)
+        n += len(seq)
+    return n
+
+
+def _run_threads(cfg: Config, workers: int) -> Tuple[int, float, Histogram]:
+    h = Histogram()
+    w = _new_writer(cfg)
+    l = _new_logger(cfg, w)
+    counts = [0] * workers
+    barrier = threading.Barrier(workers + 1)
+
+    def run(i: int):
+        barrier.wait()
+        counts[i] = _work(l, cfg, h, time.monotonic() + cfg.duration)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(workers)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if hasattr(w, "close"):
+        w.close()
+    return sum(counts), elapsed, h
+
+
+def _process(args: Tuple[Config, float]) -> Tuple[int, List[Tuple[int, int]]]:
+    cfg, start_at = args
+    h = Histogram()
+    w = _new_writer(cfg)
+    l = _new_logger(cfg, w)
+    time.sleep(max(0.0, start_at - time.time()))
+    n = _work(l, cfg, h, time.monotonic() + cfg.duration)
+    if hasattr(w, "close"):
+        w.close()
+    return n, h.buckets()
+
+
+def _run_processes(cfg: Config, workers: int) -> Tuple[int, float, Histogram]:
+    h = Histogram()
+    with multiprocessing.Pool(workers) as pool:
+        # Start all the processes at the same time, once they are spawned.
+        start_at = time.time() + 1
+        start = time.perf_counter() + 1
+        results = pool.map(_process, [(cfg, start_at)] * workers)
+        elapsed = time.perf_counter() - start
+    for _, buckets in results:
+        for v, c in buckets:
+            h.record(v, c)
+    return sum(n for n, _ in results), elapsed, h
+
+
+# run drives cfg from each number of workers, as threads or processes, and
+# returns the throughput, latency percentiles and scaling efficiency: the
+# throughput divided by the throughput with one worker times the number of
+# workers.
+def run(
+    cfg: Config,
+    workers: List[int],
+    processes: bool = False,
+    progress: Callable[[Dict[str, Any]], None] | None = None,
+) -> Dict[str, Any]:
+    results = []
+    base = None
+    for n in workers:
+        if processes:
+            events, elapsed, h = _run_processes(cfg, n)
+        else:
+            events, elapsed, h = _run_threads(cfg, n)
+        rate = events / elapsed
+        if base is None:
+            base = rate / n
+        snap = h.snapshot()
+        r = {
+            "workers": n,
+            "events": events,
+            "events_per_sec": rate,
+            "efficiency": rate / (base * n),
+            "latency_ns": {k: v for k, v in snap.items() if k != "count"},
+        }
+        results.append(r)
+        if progress is not None:
+            progress(r)
+    return {
+        "environment": environment(),
+        "config": asdict(cfg),
+        "mode": "processes" if processes else "threads",
+        "results": results,
+    }
+
+
+def _print_result(r: Dict[str, Any]):
+    lat = r["latency_ns"]
+    print(
+        f"{r['workers']:>4} workers {r['events_per_sec']:>12.0f} events/s "
+        f"efficiency {r['efficiency']:>6.1%} "
+        f"p50 {lat['p50']:>7} p99 {lat['p99']:>8} p99.9 {lat['p99.9']:>9} ns",
+        flush=True,
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m zerolog.bench.load",
+        description="drive log calls from several threads or processes",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        default="1,2,4,8",
+        help="comma separated numbers of workers to run (default: 1,2,4,8)",
+    )
+    parser.add_argument(
+        "--processes", action="store_true", help="run workers as processes"
+    )
+    parser.add_argument(
+        "--mix",
+        default="info:80,debug:15,error:5",
+        help=f"weighted calls among {', '.join(_calls)} (default: info:80,debug:15,error:5)",
+    )
+    parser.add_argument(
+        "--writer", choices=["discard", "file", "console"], default="discard"
+    )
+    parser.add_argument(
+        "--path", help="file written by the file writer (default: a file in tmpfs)"
+    )
+    parser.add_argument("--sampler", choices=list(_samplers), default="none")
+    parser.add_argument("--level", default="info", help="logger level (default: info)")
+    parser.add_argument(
+        "-d",
+        "--duration",
+        type=float,
+        default=2,
+        help="seconds per number of workers (default: 2)",
+    )
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    cfg = Config(
+        mix=parse_mix(args.mix),
+        writer=args.writer,
+        sampler=args.sampler,
+        level=args.level,
+        duration=args.duration,
+    )
+    tmp = None
+    if cfg.writer == "file":
+        if args.path:
+            cfg.path = args.path
+        else:
+            fd, tmp = tempfile.mkstemp(prefix="zerolog-load-", dir=_tmp_dir())
+            os.close(fd)
+            cfg.path = tmp
+    try:
+        env = environment()
+        print(
+            f"{env['implementation']} {env['python']} gil={env['gil']} "
+            f"{'processes' if args.processes else 'threads'}",
+            flush=True,
+        )
+        workers = [int(n) for n in args.workers.split(",")]
+        results = run(cfg, workers, args.processes, _print_result)
+    finally:
+        if tmp is not None:
+            os.remove(tmp)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+import inspect
+import platform
+import re
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# Op is a benchmarked operation, called in a loop.
+Op = Callable[[], Any]
+
+# Setup prepares a benchmark and returns its Op. It can also be a generator
+# yielding the Op, the code after the yield is run once the benchmark is done.
+Setup = Callable[[], Op | Iterator[Op]]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Setup
+    # threads is the number of threads calling the Op concurrently.
+    threads: int = 1
+
+
+_benchmarks: Dict[str, Benchmark] = {}
+
+
+# register registers the decorated Setup as the benchmark name.
+def register(name: str, threads: int = 1) -> Callable[[Setup], Setup]:
+    def decorator(setup: Setup) -> Setup:
+        if name in _benchmarks:
+            raise ValueError(f"benchmark {name} already registered")
+        _benchmarks[name] = Benchmark(name, setup, threads)
+        return setup
+
+    return decorator
+
+
+# benchmarks returns the registered benchmarks whose name matches pattern,
+# in registration order.
+def benchmarks(pattern: str | None = None) -> List[Benchmark]:
+    from . import suites  # noqa: F401 registers the benchmarks
+
+    r = re.compile(pattern) if pattern else None
+    return [b for b in _benchmarks.values() if r is None or r.search(b.name)]
+
+
+# Discard is a writer dropping what is written to it.
+class Discard:
+    def write(self, p: bytes | str) -> int:
+        return len(p)
+
+    def flush(self):
+        pass
+
+
+def _time(op: Op, n: int, threads: int) -> int:
+    if threads == 1:
+        start = time.perf_counter_ns()
+        for _ in range(n):
+            op()
+        return time.perf_counter_ns() - start
+
+    barrier = threading.Barrier(threads + 1)
+
+    def run():
+        barrier.wait()
+        for _ in range(n):
+            op()
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter_ns()
+    for w in workers:
+        w.join()
+    return time.perf_counter_ns() - start
+
+
+# run_benchmark runs b repeat times, each run calling the Op for at least
+# min_time seconds, and returns the time per call in nanoseconds. With
+# several threads, the time per call is the elapsed time divided by the
+# number of calls of all the threads.
+def run_benchmark(b: Benchmark, min_time: float = 0.1, repeat: int = 5) -> Dict:
+    setup = b.setup()
+    if inspect.isgenerator(setup):
+        op = next(setup)
+    else:
+        op = setup
+    try:
+        target = int(min_time * 1e9)
+        n = 1
+        while True:
+            elapsed = _time(op, n, b.threads)
+            if elapsed >= target:
+                break
+            # Grow n to reach min_time, at most 10 times per step.
+            n = min(n * 10, int(n * target * 1.2 / max(elapsed, 1)) + 1)
+        runs = [elapsed]
+        for _ in range(repeat - 1):
+            runs.append(_time(op, n, b.threads))
+    finally:
+        if inspect.isgenerator(setup):
+            setup.close()
+    calls = n * b.threads
+    per_op = [r / calls for r in runs]
+    return {
+        "ns_per_op": statistics.median(per_op),
+        "min_ns_per_op": min(per_op),
+        "stdev_ns_per_op": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        "calls": calls,
+        "threads": b.threads,
+    }
+
+
+# environment describes the interpreter and machine running the benchmarks.
+def environment() -> Dict[str, Any]:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "gil": is_gil_enabled() if is_gil_enabled is not None else True,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "time": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+# run runs the benchmarks matching pattern and returns their results with the
+# environment. progress is called with the name and result of each benchmark.
+def run(
+    pattern: str | None = None,
+    min_time: float = 0.1,
+    repeat: int = 5,
+    progress: Callable[[str, Dict], None] | None = None,
+) -> Dict[str, Any]:
+    results = {}
+    for b in benchmarks(pattern):
+        r = results[b.name] = run_benchmark(b, min_time, repeat)
+        if progress is not None:
+            progress(b.name, r)
+    return {"environment": environment(), "results": results}
+
+
+# compare compares the ns_per_op of the benchmarks found in both old and new
+# results. It returns (name, old, new, change) tuples, change being the
+# relative change of the time per call, and the names of the benchmarks
+# slower by more than threshold.
+def compare(
+    old: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.1
+) -> Tuple[List[Tuple[str, float, float, float]], List[str]]:
+    rows = []
+    regressions = []
+    for name, r in new["results"].items():
+        o = old["results"].get(name)
+        if o is None:
+            continue
+        before = o["ns_per_op"]
+        after = r["ns_per_op"]
+        change = (after - before) / before if before > 0 else 0.0
+        rows.append((name, before, after, change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
@@ -0,0 +1,184 @@
+import argparse
+import gc
+import os
+import re
+import sys
+import tempfile
+from contextlib import ExitStack
+from typing import Callable, Dict, Iterator, List
+
+import zerolog
+from zerolog.sampler import (
+    BasicSampler,
+    BurstSampler,
+    KeyedTokenBucketSampler,
+    Sampler,
+    TokenBucketSampler,
+)
+from .runner import Discard
+
+
+# rss returns the resident set size of the process in bytes. Where the current
+# value isn't available, the peak value is returned instead.
+def rss() -> int:
+    if sys.platform == "win32":
+        return _working_set()
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # resource is only available on Unix.
+        import resource
+
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class _MemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    # _working_set returns the working set size of the process, its RSS on
+    # Windows.
+    def _working_set() -> int:
+        c = _MemoryCounters()
+        c.cb = ctypes.sizeof(c)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(c), c.cb):
+            raise ctypes.WinError()
+        return c.WorkingSetSize
+
+
+def _tmp_dir() -> str:
+    # Prefer a tmpfs to not measure the disk.
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+# Writers are created in an ExitStack closing them once the scenario is done.
+_writers: Dict[str, Callable[[ExitStack], zerolog.Writer]] = {
+    "discard": lambda stack: Discard(),
+    "file": lambda stack: stack.enter_context(
+        tempfile.TemporaryFile("wb", dir=_tmp_dir())
+    ),
+    "console": lambda stack: zerolog.ConsoleWriter(out=Discard(), no_color=True),
+}
+
+_samplers: Dict[str, Callable[[], Sampler | None]] = {
+    "none": lambda: None,
+    "basic": lambda: BasicSampler(10),
+    "burst": lambda: BurstSampler(100, 1, BasicSampler(10)),
+    "token_bucket": lambda: TokenBucketSampler(10000, 100),
+    "keyed_token_bucket": lambda: KeyedTokenBucketSampler(10000, 100),
+}
+
+
+# scenarios returns the names of the soak scenarios matching pattern: each
+# writer without sampler, then each sampler with the discard writer.
+def scenarios(pattern: str | None = None) -> List[str]:
+    names = [f"{w}/none" for w in _writers]
+    names += [f"discard/{s}" for s in _samplers if s != "none"]
+    r = re.compile(pattern) if pattern else None
+    return [n for n in names if r is None or r.search(n)]
+
+
+def _emit(l: zerolog.Logger, n: int):
+    for i in range(n):
+        e = l.info()
+        if e is not None:
+            e.str("user", "bob").int("i", i).float("latency", 12.5).msg("soak")
+
+
+# soak logs events through the scenario in chunks and yields the RSS after
+# each of them.
+def soak(name: str, events: int, chunks: int = 10) -> Iterator[int]:
+    writer, sampler = name.split("/")
+    with ExitStack() as stack:
+        l = zerolog.new(_writers[writer](stack)).ctx().timestamp().logger()
+        s = _samplers[sampler]()
+        if s is not None:
+            l = l.sample(s)
+        for _ in range(chunks):
+            _emit(l, events // chunks)
+            gc.collect()
+            yield rss()
+
+
+# run soaks each scenario matching pattern with events events and returns
+# the RSS after the first chunk, at the end and the growth between them, by
+# scenario. The first chunk warms up caches and buffers.
+def run(
+    events: int = 1_000_000,
+    pattern: str | None = None,
+    chunks: int = 10,
+    progress: Callable[[str, Dict[str, int]], None] | None = None,
+) -> Dict[str, Dict[str, int]]:
+    results = {}
+    for name in scenarios(pattern):
+        samples = list(soak(name, events, chunks))
+        r = results[name] = {
+            "start_rss": samples[0],
+            "end_rss": samples[-1],
+            "growth": samples[-1] - samples[0],
+        }
+        if progress is not None:
+            progress(name, r)
+    return results
+
+
+def _print_result(name: str, r: Dict[str, int]):
+    mb = 1024 * 1024
+    print(
+        f"{name:<30} rss {r['start_rss'] / mb:>8.1f} MB -> {r['end_rss'] / mb:>8.1f}"
+        f" MB ({r['growth'] / mb:+.1f} MB)",
+        flush=True,
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m zerolog.bench.soak",
+        description="log millions of events and check that the RSS stays flat",
+    )
+    parser.add_argument(
+        "-n",
+        "--events",
+        type=int,
+        default=1_000_000,
+        help="events per scenario (default: 1000000)",
+    )
+    parser.add_argument("-k", "--filter", help="only run scenarios matching this regex")
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=5,
+        help="RSS growth in MB reported as a leak (default: 5)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.events, args.filter, progress=_print_result)
+    leaks = [n for n, r in results.items() if r["growth"] > args.max_growth * 1024**2]
+    if leaks:
+        print(f"RSS grew by more than {args.max_growth} MB: {', '.join(leaks)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
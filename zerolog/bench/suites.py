@@ -0,0 +1,466 @@
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Iterator, List
+
+import zerolog
+from zerolog import stacktrace
+from zerolog.encoder_json import enc
+from zerolog.sampler import (
+    BasicSampler,
+    BurstSampler,
+    KeyedTokenBucketSampler,
+    TokenBucketSampler,
+)
+from .runner import Discard, Op, register
+
+_message = "The quick brown fox jumps over the lazy dog"
+_fields = {
+    "user": "bob",
+    "request_id": "7b3c2f6a-5d1e-4c7b-9a2d-0e8f1b6c4d3a",
+    "status": 200,
+    "latency": 12.345,
+    "cached": False,
+    "path": "/api/v1/users",
+    "method": "GET",
+    "bytes": 5120,
+    "retries": 0,
+    "region": "us-east-1",
+}
+
+
+def _logger() -> zerolog.Logger:
+    return zerolog.new(Discard())
+
+
+# Events at each level.
+
+
+def _level_setup(lvl: zerolog.Level):
+    def setup() -> Iterator[Op]:
+        l = _logger().level(zerolog.TraceLevel)
+        zerolog.set_global_level(zerolog.TraceLevel)
+        try:
+
+            def op():
+                e = l.with_level(lvl)
+                assert e is not None
+                e.msg(_message)
+
+            yield op
+        finally:
+            zerolog.set_global_level(zerolog.DebugLevel)
+
+    return setup
+
+
+for _lvl in (
+    zerolog.TraceLevel,
+    zerolog.DebugLevel,
+    zerolog.InfoLevel,
+    zerolog.WarnLevel,
+    zerolog.ErrorLevel,
+):
+    register(f"event/{_lvl.string()}")(_level_setup(_lvl))
+
+
+@register("event/nolevel")
+def _event_nolevel() -> Op:
+    l = _logger()
+
+    def op():
+        e = l.log()
+        assert e is not None
+        e.msg(_message)
+
+    return op
+
+
+@register("event/disabled")
+def _event_disabled() -> Op:
+    l = _logger().level(zerolog.InfoLevel)
+    return lambda: l.debug()
+
+
+@register("event/disabled_global")
+def _event_disabled_global() -> Iterator[Op]:
+    l = _logger()
+    zerolog.set_global_level(zerolog.WarnLevel)
+    try:
+        yield lambda: l.info()
+    finally:
+        zerolog.set_global_level(zerolog.DebugLevel)
+
+
+@register("event/enabled_check")
+def _event_enabled_check() -> Op:
+    l = _logger().level(zerolog.InfoLevel)
+    return lambda: l.enabled(zerolog.DebugLevel)
+
+
+@register("event/10_fields")
+def _event_10_fields() -> Op:
+    l = _logger()
+
+    def op():
+        e = l.info()
+        assert e is not None
+        (
+            e.str("user", "bob")
+            .str("request_id", "7b3c2f6a-5d1e-4c7b-9a2d-0e8f1b6c4d3a")
+            .int("status", 200)
+            .float("latency", 12.345)
+            .bool("cached", False)
+            .str("path", "/api/v1/users")
+            .str("method", "GET")
+            .int("bytes", 5120)
+            .int("retries", 0)
+            .str("region", "us-east-1")
+            .msg(_message)
+        )
+
+    return op
+
+
+@register("event/fields_mapping")
+def _event_fields_mapping() -> Op:
+    l = _logger()
+
+    def op():
+        e = l.info()
+        assert e is not None
+        e.fields(_fields).msg(_message)
+
+    return op
+
+
+@register("event/template")
+def _event_template() -> Op:
+    t = _logger().template(
+        zerolog.InfoLevel, _message, ("route", str), ("status", int), ("ms", float)
+    )
+    return lambda: t.emit("/api/v1/users", 200, 12.345)
+
+
+@register("event/template_equivalent")
+def _event_template_equivalent() -> Op:
+    l = _logger()
+
+    def op():
+        e = l.info()
+        assert e is not None
+        e.str("route", "/api/v1/users").int("status", 200).float("ms", 12.345).msg(
+            _message
+        )
+
+    return op
+
+
+# A pre-serialized payload, like an upstream API response.
+_payload = json.dumps(
+    {"users": [dict(_fields, id=i) for i in range(20)], "next": None}
+).encode()
+
+
+@register("event/raw_json")
+def _event_raw_json() -> Op:
+    l = _logger()
+
+    def op():
+        e = l.info()
+        assert e is not None
+        e.raw_json("response", _payload).msg(_message)
+
+    return op
+
+
+@register("event/raw_json_equivalent")
+def _event_raw_json_equivalent() -> Op:
+    l = _logger()
+
+    def op():
+        e = l.info()
+        assert e is not None
+        e.any("response", json.loads(_payload)).msg(_message)
+
+    return op
+
+
+@register("event/level_hook")
+def _event_level_hook() -> Op:
+    def severity(e: zerolog.Event, lvl: zerolog.Level, msg: str):
+        e.str("severity", "high")
+
+    h = zerolog.HookFunc(severity)
+    l = _logger().hook(zerolog.LevelHook(error_hook=h, warn_hook=h))
+
+    def op():
+        e = l.info()
+        assert e is not None
+        e.msg(_message)
+
+    return op
+
+
+@register("event/redaction")
+def _event_redaction() -> Iterator[Op]:
+    l = _logger()
+    zerolog.set_redaction(
+        zerolog.Redaction(keys=["password", "authorization"], patterns=["*_token"])
+    )
+    try:
+
+        def op():
+            e = l.info()
+            assert e is not None
+            e.fields(_fields).str("password", "hunter2").msg(_message)
+
+        yield op
+    finally:
+        zerolog.set_redaction(None)
+
+
+@register("event/timestamp")
+def _event_timestamp() -> Op:
+    l = _logger().ctx().timestamp().logger()
+
+    def op():
+        e = l.info()
+        assert e is not None
+        e.msg(_message)
+
+    return op
+
+
+# Encoders, on realistic payloads.
+
+_now = datetime(2023, 12, 14, 23, 32, 26, 368000, tzinfo=timezone.utc)
+_ints = list(range(0, 10000, 100))
+_floats = [i * 1.5 for i in range(100)]
+_bools = [i % 2 == 0 for i in range(100)]
+_strings = [f"item-{i}" for i in range(100)]
+_durations: List[int | float] = [i * 1000 for i in range(100)]
+_digest = memoryview(bytes(range(32)))
+_context = enc.append_begin_marker(b"")
+for _k, _v in _fields.items():
+    _context = enc.append_string(enc.append_key(_context, _k), str(_v))
+
+_encoders = {
+    "append_any": lambda: enc.append_any(b"{", {"a": 1, "b": [1, 2, 3]}),
+    "append_array_delim": lambda: enc.append_array_delim(b"[1"),
+    "append_array_end": lambda: enc.append_array_end(b"[1"),
+    "append_array_start": lambda: enc.append_array_start(b"{"),
+    "append_base64": lambda: enc.append_base64(b"{", _digest),
+    "append_begin_marker": lambda: enc.append_begin_marker(b""),
+    "append_bool": lambda: enc.append_bool(b"{", True),
+    "append_bools": lambda: enc.append_bools(b"{", _bools),
+    "append_duration": lambda: enc.append_duration(
+        b"{", 12345678, zerolog.DurationFieldUnit, False
+    ),
+    "append_durations": lambda: enc.append_durations(
+        b"{", _durations, zerolog.DurationFieldUnit, False
+    ),
+    "append_end_marker": lambda: enc.append_end_marker(b"{"),
+    "append_float": lambda: enc.append_float(b"{", 12.345),
+    "append_floats": lambda: enc.append_floats(b"{", _floats),
+    "append_hex": lambda: enc.append_hex(b"{", _digest),
+    "append_int": lambda: enc.append_int(b"{", 1234567),
+    "append_ints": lambda: enc.append_ints(b"{", _ints),
+    "append_key": lambda: enc.append_key(b'{"a":1', "request_id"),
+    "append_line_break": lambda: enc.append_line_break(b"{}"),
+    "append_nil": lambda: enc.append_nil(b"{"),
+    "append_object_data": lambda: enc.append_object_data(b'{"a":1', _context),
+    "append_raw_json": lambda: enc.append_raw_json(b"{", _payload),
+    "append_string": lambda: enc.append_string(b"{", _message),
+    "append_string_escaped": lambda: enc.append_string(
+        b"{", 'line 1\nline "2"\ttab, café ☃'
+    ),
+    "append_strings": lambda: enc.append_strings(b"{", _strings),
+    "append_time": lambda: enc.append_time(b"{", _now, zerolog.TimeFieldFormat),
+}
+
+
+def _encoder_setup(op: Op):
+    return lambda: op
+
+
+for _name, _op in _encoders.items():
+    register(f"encoder/{_name}")(_encoder_setup(_op))
+
+
+# Context heavy loggers.
+
+
+@register("context/20_fields")
+def _context_20_fields() -> Op:
+    c = _logger().ctx()
+    for i in range(20):
+        c = c.str(f"field_{i}", f"value_{i}")
+    l = c.logger()
+
+    def op():
+        e = l.info()
+        assert e is not None
+        e.msg(_message)
+
+    return op
+
+
+@register("context/new_logger")
+def _context_new_logger() -> Op:
+    w = Discard()
+    return lambda: zerolog.new(w).ctx().fields(_fields).logger()
+
+
+@register("context/with")
+def _context_with() -> Op:
+    l = _logger().ctx().fields(_fields).logger()
+    return lambda: l.with_(request_id="7b3c2f6a")
+
+
+@register("context/bind")
+def _context_bind() -> Iterator[Op]:
+    l = _logger()
+    with zerolog.bind(_fields):
+
+        def op():
+            e = l.info()
+            assert e is not None
+            e.msg(_message)
+
+        yield op
+
+
+# Caller and stack.
+
+
+@register("caller/event")
+def _caller_event() -> Op:
+    l = _logger()
+
+    def op():
+        e = l.info()
+        assert e is not None
+        e.caller().msg(_message)
+
+    return op
+
+
+@register("caller/context")
+def _caller_context() -> Op:
+    l = _logger().ctx().caller().logger()
+
+    def op():
+        e = l.info()
+        assert e is not None
+        e.msg(_message)
+
+    return op
+
+
+@register("stack/exc")
+def _stack_exc() -> Iterator[Op]:
+    l = _logger()
+    try:
+        raise ValueError("boom")
+    except ValueError as e:
+        err = e
+    marshaler = zerolog.ExceptionStackMarshaler
+    zerolog.ExceptionStackMarshaler = stacktrace.marshal_stack
+    try:
+
+        def op():
+            e = l.error()
+            assert e is not None
+            e.stack().exc(err).msg(_message)
+
+        yield op
+    finally:
+        zerolog.ExceptionStackMarshaler = marshaler
+
+
+# Samplers under thread contention.
+
+_samplers = {
+    "basic": lambda: BasicSampler(10),
+    "burst": lambda: BurstSampler(100, 1, BasicSampler(10)),
+    "token_bucket": lambda: TokenBucketSampler(1000, 100),
+    "keyed_token_bucket": lambda: KeyedTokenBucketSampler(1000, 100),
+}
+
+
+def _sampler_setup(new_sampler):
+    def setup() -> Op:
+        s = new_sampler()
+        return lambda: s.sample(zerolog.InfoLevel)
+
+    return setup
+
+
+for _name, _new in _samplers.items():
+    for _threads in (1, 8):
+        register(f"sampler/{_name}/threads={_threads}", _threads)(_sampler_setup(_new))
+
+
+@register("sampler/logger/threads=8", 8)
+def _sampler_logger() -> Op:
+    l = _logger().sample(BurstSampler(100, 1, BasicSampler(10)))
+
+    def op():
+        e = l.info()
+        if e is not None:
+            e.msg(_message)
+
+    return op
+
+
+# ConsoleWriter.
+
+
+@register("console/write")
+def _console_write() -> Op:
+    w = zerolog.ConsoleWriter(out=Discard(), no_color=True)
+    p = enc.append_line_break(
+        enc.append_end_marker(
+            enc.append_object_data(
+                b'{"level":"info","time":"2023-12-14T23:32:26.368Z",'
+                b'"message":"hello"',
+                _context,
+            )
+        )
+    )
+    return lambda: w.write(p)
+
+
+# Standard library logging, for comparison.
+
+
+def _stdlib_logger(fmt: str) -> logging.Logger:
+    l = logging.Logger("zerolog.bench")
+    h = logging.StreamHandler(Discard())
+    h.setFormatter(logging.Formatter(fmt))
+    l.addHandler(h)
+    return l
+
+
+@register("stdlib/info")
+def _stdlib_info() -> Op:
+    l = _stdlib_logger(
+        '{"level":"%(levelname)s","time":"%(asctime)s","message":"%(message)s"}'
+    )
+    return lambda: l.info(_message)
+
+
+@register("stdlib/disabled")
+def _stdlib_disabled() -> Op:
+    l = _stdlib_logger("%(message)s")
+    l.setLevel(logging.INFO)
+    return lambda: l.debug(_message)
+
+
+@register("stdlib/10_fields")
+def _stdlib_10_fields() -> Op:
+    l = _stdlib_logger("%(levelname)s %(message)s")
+    fmt = " ".join(f"{k}=%s" for k in _fields) + " %s"
+    values = tuple(_fields.values())
+    return lambda: l.info(fmt, *values, _message)
@@ -0,0 +1,49 @@
+from contextvars import ContextVar, Token
+from typing import Any
+
+from .encoder_json import enc
+from .fields import Fields, append_fields
+
+# _bound holds the encoded fields bound to the current context, starting with
+# the begin marker like a logger context, or empty if no field is bound.
+_bound: ContextVar[bytes] = ContextVar("zerolog_bound", default=b"")
+
+
+# Binding is returned by bind. The fields stay bound until reset is called,
+# or until the with block exits when used as a context manager.
+class Binding:
+    __slots__ = ("_token",)
+
+    def __init__(self, token: Token[bytes]):
+        self._token = token
+
+    def __enter__(self) -> "Binding":
+        return self
+
+    def __exit__(self, *exc: Any):
+        self.reset()
+
+    # reset restores the fields bound before the call to bind.
+    def reset(self):
+        _bound.reset(self._token)
+
+
+# bind adds fields to all the events logged in the current context, by any
+# logger, until the returned Binding is reset:
+#
+#   with zerolog.bind(request_id=request.id):
+#       log.info().msg("handling request")
+#
+# The fields are encoded once by bind. They are kept in a contextvar, so they
+# follow asyncio tasks and functions run with contextvars.copy_context().
+# fields can be a mapping or an iterable of (key, value) pairs, keyword
+# arguments are added after them.
+def bind(fields: Fields | None = None, **kwargs: Any) -> Binding:
+    bound = _bound.get()
+    if len(bound) == 0:
+        bound = enc.append_begin_marker(bound)
+    if fields is not None:
+        bound = append_fields(bound, fields)
+    if len(kwargs) > 0:
+        bound = append_fields(bound, kwargs)
+    return Binding(_bound.set(bound))
@@ -3,7 +3,7 @@ import json
 import os
 import sys
 from datetime import datetime
-from typing import Any, Callable, Dict, IO, List
+from typing import Any, Callable, Dict, List
 
 from dateutil.parser import parse
 
@@ -11,6 +11,7 @@ import zerolog
 from zerolog import constants, time
 from .internal.util.time import convert_offset
 from .level import parse_level
+from .writer import Writer
 
 
 class Colors(enum.IntEnum):
@@ -38,7 +39,7 @@ _console_default_time_format = time.Kitchen
 class ConsoleWriter:
     def __init__(
         self,
-        out: IO = sys.stdout.buffer,
+        out: Writer = sys.stdout.buffer,
         no_color: bool = False,
         time_format: str = _console_default_time_format,
         parts_order: List[str] | None = None,
@@ -52,7 +53,7 @@ class ConsoleWriter:
         format_field_value: Formatter | None = None,
         format_exc_field_name: Formatter | None = None,
         format_exc_field_value: Formatter | None = None,
-        format_extra: Callable[[Dict[str, Any], IO], None] | None = None,
+        format_extra: Callable[[Dict[str, Any], Writer], None] | None = None,
         format_prepare: Callable[[Dict[str, Any]], None] | None = None,
     ):
         # out is the output destination.
@@ -106,7 +107,7 @@ class ConsoleWriter:
         return len(p)
 
     # _write_fields appends formatted key-value pairs to buf.
-    def _write_fields(self, evt: Dict[str, Any], buf: IO):
+    def _write_fields(self, evt: Dict[str, Any], buf: Writer):
         fields = []
         for field in evt.keys():
             is_excluded = False
@@ -179,7 +180,7 @@ class ConsoleWriter:
                 buf.write(b" ")
 
     # _write_part appends a formatted part to buf.
-    def _write_part(self, buf: IO, evt: Dict[str, Any], p: str):
+    def _write_part(self, buf: Writer, evt: Dict[str, Any], p: str):
         if len(self.parts_exclude) > 0:
             for exclude in self.parts_exclude:
                 if exclude == p:
@@ -1,15 +1,20 @@
 import builtins
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any, List
 
 import zerolog
 from zerolog import constants
+from .encoder import Buffer
 from .encoder_json import enc
 from .event import Event
+from .fields import Fields, append_fields
+from .internal.util.time import duration_ns
+from .marshal import append_any
 from .level import Level
 
 if TYPE_CHECKING:
+    from .array import Array
     from .logger import Logger
 
 # needed because some Context methods name conflict with types
@@ -73,53 +78,132 @@ class Context:
             case _:
                 return self.any(zerolog.ExceptionFieldName, m)
 
-    # any adds the field key with val marshaled using reflection.
+    # fields is a helper function to use a mapping or an iterable of
+    # (key, value) pairs to add fields to the logger context.
+    def fields(self, fields: Fields) -> "Context":
+        self._l._context = append_fields(self._l._context, fields)
+        return self
+
+    # dict adds the field key with the dict to the logger context.
+    def dict(self, key: _str, d: Event) -> "Context":
+        if enc.redaction is None or not self._mask(key):
+            d._buf = enc.append_end_marker(d._buf)
+            self._l._context = enc.append_key(self._l._context, key)
+            self._l._context += d._buf
+        return self
+
+    # array adds the field key with an array to the logger context.
+    def array(self, key: _str, a: "Array") -> "Context":
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = a._write(enc.append_key(self._l._context, key))
+        return self
+
+    # any adds the field key with val encoded according to its type.
     def any(self, key: _str, val: Any) -> "Context":
-        self._l._context = enc.append_any(enc.append_key(self._l._context, key), val)
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = append_any(enc.append_key(self._l._context, key), val)
         return self
 
     # bool adds the field key with val as a bool to the logger context.
     def bool(self, key: _str, val: _bool) -> "Context":
-        self._l._context = enc.append_bool(enc.append_key(self._l._context, key), val)
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_bool(
+                enc.append_key(self._l._context, key), val
+            )
         return self
 
     # bools adds the field key with vals as a List[bool] to the logger context.
     def bools(self, key: _str, vals: List[_bool]) -> "Context":
-        self._l._context = enc.append_bools(enc.append_key(self._l._context, key), vals)
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_bools(
+                enc.append_key(self._l._context, key), vals
+            )
         return self
 
     # float adds the field key with val as a float to the logger context.
     def float(self, key: _str, val: _float) -> "Context":
-        self._l._context = enc.append_float(enc.append_key(self._l._context, key), val)
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_float(
+                enc.append_key(self._l._context, key), val
+            )
         return self
 
     # floats adds the field key with vals as a List[float] to the logger context.
     def floats(self, key: _str, vals: List[_float]) -> "Context":
-        self._l._context = enc.append_floats(
-            enc.append_key(self._l._context, key), vals
-        )
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_floats(
+                enc.append_key(self._l._context, key), vals
+            )
         return self
 
     # int adds the field key with val as an int to the logger context.
     def int(self, key: _str, val: _int) -> "Context":
-        self._l._context = enc.append_int(enc.append_key(self._l._context, key), val)
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_int(
+                enc.append_key(self._l._context, key), val
+            )
         return self
 
     # ints adds the field key with vals as a List[int] to the logger context.
     def ints(self, key: _str, vals: List[_int]) -> "Context":
-        self._l._context = enc.append_ints(enc.append_key(self._l._context, key), vals)
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_ints(
+                enc.append_key(self._l._context, key), vals
+            )
         return self
 
     # str adds the field key with val as a string to the logger context.
     def str(self, key: _str, val: _str) -> "Context":
-        self._l._context = enc.append_string(enc.append_key(self._l._context, key), val)
+        r = enc.redaction
+        if r is None:
+            self._l._context = enc.append_string(
+                enc.append_key(self._l._context, key), val
+            )
+        elif not self._mask(key):
+            self._l._context = r.append_string(
+                enc.append_key(self._l._context, key), val
+            )
         return self
 
     # strs adds the field key with vals as a List[str] to the logger context.
     def strs(self, key: _str, vals: List[_str]) -> "Context":
-        self._l._context = enc.append_strings(
-            enc.append_key(self._l._context, key), vals
-        )
+        r = enc.redaction
+        if r is None:
+            self._l._context = enc.append_strings(
+                enc.append_key(self._l._context, key), vals
+            )
+        elif not self._mask(key):
+            self._l._context = r.append_strings(
+                enc.append_key(self._l._context, key), vals
+            )
+        return self
+
+    # raw_json adds the field key with b, already encoded JSON, to the logger
+    # context. b isn't decoded nor validated and must hold a single valid JSON
+    # value.
+    def raw_json(self, key: _str, b: Buffer) -> "Context":
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_raw_json(
+                enc.append_key(self._l._context, key), b
+            )
+        return self
+
+    # hex adds the field key with val encoded as a hex string to the logger
+    # context.
+    def hex(self, key: _str, val: Buffer) -> "Context":
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_hex(
+                enc.append_key(self._l._context, key), val
+            )
+        return self
+
+    # base64 adds the field key with val encoded as a base64 string to the
+    # logger context.
+    def base64(self, key: _str, val: Buffer) -> "Context":
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_base64(
+                enc.append_key(self._l._context, key), val
+            )
         return self
 
     # timestamp adds the current local time to the logger context with the "time" key,
@@ -134,9 +218,32 @@ class Context:
 
     # time adds the field key with t formatted as string using zerolog.TimeFieldFormat.
     def time(self, key: _str, t: datetime) -> "Context":
-        self._l._context = enc.append_time(
-            enc.append_key(self._l._context, key), t, zerolog.TimeFieldFormat
-        )
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_time(
+                enc.append_key(self._l._context, key), t, zerolog.TimeFieldFormat
+            )
+        return self
+
+    # dur adds the field key with duration d to the logger context.
+    def dur(self, key: _str, d: _int | _float | timedelta) -> "Context":
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_duration(
+                enc.append_key(self._l._context, key),
+                duration_ns(d),
+                zerolog.DurationFieldUnit,
+                zerolog.DurationFieldInteger,
+            )
+        return self
+
+    # durs adds the field key with a list of durations to the logger context.
+    def durs(self, key: _str, d: List[_int | _float | timedelta]) -> "Context":
+        if enc.redaction is None or not self._mask(key):
+            self._l._context = enc.append_durations(
+                enc.append_key(self._l._context, key),
+                [duration_ns(v) for v in d],
+                zerolog.DurationFieldUnit,
+                zerolog.DurationFieldInteger,
+            )
         return self
 
     # caller adds the file:line of the caller with the zerolog.CallerFieldName key.
@@ -155,3 +262,13 @@ class Context:
     def stack(self) -> "Context":
         self._l._stack = True
         return self
+
+    # _mask appends key with the mask of the redaction policy as its value to
+    # the logger context and returns True if the policy redacts key, see
+    # zerolog.set_redaction.
+    def _mask(self, key: _str) -> _bool:
+        context = enc.append_masked(self._l._context, key)
+        if context is None:
+            return False
+        self._l._context = context
+        return True
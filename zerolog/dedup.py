@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Hashable, Iterable, List
+
+import zerolog
+from .encoder_json import enc
+from .event import Event, _new_event
+from .internal.json.json import field_value
+from .level import Level
+from .writer import Writer
+
+# RepeatCountFieldName is the field name used by DedupHook for the number
+# of suppressed events.
+RepeatCountFieldName = "repeat_count"
+
+# FirstSeenFieldName is the field name used by DedupHook for the time of
+# the first occurrence of a suppressed event.
+FirstSeenFieldName = "first_seen"
+
+# LastSeenFieldName is the field name used by DedupHook for the time of
+# the last suppressed event.
+LastSeenFieldName = "last_seen"
+
+
+class _Entry:
+    __slots__ = ("start", "count", "first_seen", "last_seen", "buf", "w", "lvl", "msg")
+
+    def __init__(self, start: float, e: Event, lvl: Level, msg: str):
+        self.start = start
+        self.count = 0
+        self.first_seen: datetime = zerolog.TimestampFunc()
+        self.last_seen = self.first_seen
+        self.buf = e._buf
+        self.w: Writer | None = e._w
+        self.lvl = lvl
+        self.msg = msg
+
+
+# DedupHook suppresses events identical to an event logged less than window
+# seconds before. Events are identical if they have the same level, message
+# and values for fields. Once the window is over, a summary of the suppressed
+# events is logged with the fields of the first one, the number of suppressed
+# events and the times of the first and last ones.
+#
+# Windows are checked when events are logged; call flush to log the pending
+# summaries, for instance before exiting. At most max_keys distinct events
+# are tracked, the oldest one is summarized when the limit is reached.
+#
+# Fields are read back from the event, so DedupHook must be added after the
+# hooks adding the fields it compares.
+class DedupHook:
+    def __init__(
+        self,
+        window: float = 1,
+        fields: Iterable[str] | None = None,
+        max_keys: int = 1024,
+    ):
+        self.window = window
+        self.fields = list(fields) if fields is not None else []
+        self.max_keys = max_keys
+
+        self._keys = [enc.append_string(b"", f) + b":" for f in self.fields]
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+
+    def run(self, e: Event, lvl: Level, msg: str):
+        key = self._key(e, lvl, msg)
+        now = time.monotonic()
+        entries = self._entries
+        with self._lock:
+            done = self._expire(now)
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = _Entry(now, e, lvl, msg)
+                if len(entries) > self.max_keys:
+                    done.append(entries.popitem(last=False)[1])
+            else:
+                entry.count += 1
+                entry.last_seen = zerolog.TimestampFunc()
+        for d in done:
+            _emit(d)
+        if entry is not None:
+            e.discard()
+
+    # flush logs the summaries of all the suppressed events and resets the
+    # windows.
+    def flush(self):
+        with self._lock:
+            done = list(self._entries.values())
+            self._entries.clear()
+        for d in done:
+            _emit(d)
+
+    # _key returns the key of the event: its level, message and the encoded
+    # values of the compared fields, read from the event without decoding it.
+    def _key(self, e: Event, lvl: Level, msg: str) -> Hashable:
+        if len(self._keys) == 0:
+            return lvl, msg
+        return lvl, msg, tuple(field_value(e._buf, k) for k in self._keys)
+
+    # _expire removes the entries whose window is over. Entries are kept in
+    # the order they were created, so the oldest ones are first.
+    def _expire(self, now: float) -> List[_Entry]:
+        done = []
+        entries = self._entries
+        while len(entries) > 0:
+            entry = next(iter(entries.values()))
+            if now - entry.start < self.window:
+                break
+            done.append(entries.popitem(last=False)[1])
+        return done
+
+
+def _emit(entry: _Entry):
+    if entry.count == 0:
+        return
+    e = _new_event(entry.w, entry.lvl)
+    e._buf = entry.buf
+    e.int(RepeatCountFieldName, entry.count)
+    e.time(FirstSeenFieldName, entry.first_seen)
+    e.time(LastSeenFieldName, entry.last_seen)
+    e.msg(entry.msg)
@@ -2,12 +2,57 @@ from abc import abstractmethod
 from datetime import datetime
 from typing import Any, List, Protocol
 
+# Buffer is any object implementing the buffer protocol: bytes, bytearray,
+# memoryview, array.array...
+Buffer = Any
+
+
+# Redactor is a policy masking the values of fields, see zerolog.Redaction.
+# It is set as the redaction of the encoder, which doesn't apply it itself:
+# the code appending a field checks append_masked first and only encodes the
+# value if its key isn't redacted.
+class Redactor(Protocol):
+    # masked_key returns the encoded key followed by the encoded mask if the
+    # values of key are redacted, None otherwise.
+    @abstractmethod
+    def masked_key(self, key: str) -> bytes | None:
+        pass
+
+    # append_string appends s, or the mask if s is a redacted value.
+    @abstractmethod
+    def append_string(self, dst: bytes, s: str) -> bytes:
+        pass
+
+    # append_strings appends vals, with the redacted values masked.
+    @abstractmethod
+    def append_strings(self, dst: bytes, vals: List[str]) -> bytes:
+        pass
+
 
 class Encoder(Protocol):
+    # redaction is the policy masking the values of fields, if any.
+    redaction: Redactor | None
+
     @abstractmethod
     def append_any(self, dst: bytes, val: Any) -> bytes:
         pass
 
+    @abstractmethod
+    def append_array_delim(self, dst: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def append_array_end(self, dst: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def append_array_start(self, dst: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def append_base64(self, dst: bytes, val: Buffer) -> bytes:
+        pass
+
     @abstractmethod
     def append_begin_marker(self, dst: bytes) -> bytes:
         pass
@@ -20,6 +65,18 @@ class Encoder(Protocol):
     def append_bools(self, dst: bytes, val: List[bool]) -> bytes:
         pass
 
+    @abstractmethod
+    def append_duration(
+        self, dst: bytes, d: int | float, unit: int, use_int: bool
+    ) -> bytes:
+        pass
+
+    @abstractmethod
+    def append_durations(
+        self, dst: bytes, vals: List[int | float], unit: int, use_int: bool
+    ) -> bytes:
+        pass
+
     @abstractmethod
     def append_end_marker(self, dst: bytes) -> bytes:
         pass
@@ -32,6 +89,10 @@ class Encoder(Protocol):
     def append_floats(self, dst: bytes, val: List[float]) -> bytes:
         pass
 
+    @abstractmethod
+    def append_hex(self, dst: bytes, val: Buffer) -> bytes:
+        pass
+
     @abstractmethod
     def append_int(self, dst: bytes, val: int) -> bytes:
         pass
@@ -48,10 +109,22 @@ class Encoder(Protocol):
     def append_line_break(self, dst: bytes) -> bytes:
         pass
 
+    @abstractmethod
+    def append_masked(self, dst: bytes, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def append_nil(self, dst: bytes) -> bytes:
+        pass
+
     @abstractmethod
     def append_object_data(self, dst: bytes, o: bytes) -> bytes:
         pass
 
+    @abstractmethod
+    def append_raw_json(self, dst: bytes, val: Buffer) -> bytes:
+        pass
+
     @abstractmethod
     def append_string(self, dst: bytes, s: str) -> bytes:
         pass
@@ -1,13 +1,26 @@
 import sys
-from dataclasses import dataclass, field
-from datetime import datetime
+from abc import abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from inspect import getframeinfo, stack
-from typing import Any, Callable, IO, List
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Sequence
 
 import zerolog
+from .encoder import Buffer
 from .encoder_json import enc
-from .hook import Hook
+from .fields import Fields, append_fields
+from .internal.util.time import duration_ns
+from .marshal import append_any
+from .vector import DefaultPercentiles, Vector, append_vector, append_vector_summary
+from .hook import HookRun, PostHookRun
 from .level import Level
+from .stats import BYTES, DISCARDED, EMITTED, WRITE_ERRORS, Stats, record
+from .writer import Writer
+
+if TYPE_CHECKING:
+    from .array import Array
+    from .metrics import Metrics
 
 # needed because some Event methods name conflict with types
 _str = str
@@ -21,14 +34,18 @@ _bool = bool
 @dataclass(slots=True)
 class Event:
     _buf: bytes = b""
-    _w: IO | None = None
+    _w: Writer | None = None
     _level: Level = Level.TraceLevel
     _done: Callable[[str], None] | None = None
     _stack: bool = False  # enable error stack trace
-    _ch: List[Hook] = field(default_factory=lambda: [])  # hooks from context
+    _ch: Sequence[HookRun] = ()  # hooks from context applying to the level
+    _post: Sequence[PostHookRun] = ()  # post hooks from context
     _skip_frames: int = (
         0  # The number of additional frames to skip when printing the caller.
     )
+    _stats: Stats | None = None  # stats of the logger
+    _metrics: "Metrics | None" = None  # metrics if the event is measured
+    _start: int = 0  # creation time of a measured event
 
     # enabled return false if the Event is going to be filtered out by
     # log level or sampling.
@@ -54,32 +71,61 @@ class Event:
         self._msg("")
 
     def _msg(self, msg: _str):
+        lvl = self._level
+        m = self._metrics
         try:
-            for hook in self._ch:
-                hook.run(self, self._level, msg)
+            if m is not None:
+                t = perf_counter_ns()
+                m.encode_ns.record(t - self._start)
+                for hook in self._ch:
+                    hook(self, self._level, msg)
+                m.hook_ns.record(perf_counter_ns() - t)
+            else:
+                for hook in self._ch:
+                    hook(self, self._level, msg)
+            if self._level == Level.Disabled:
+                record(self._stats, DISCARDED, lvl)
+                return
             if msg != "":
-                self._buf = enc.append_string(
-                    enc.append_key(self._buf, zerolog.MessageFieldName), msg
-                )
+                if enc.redaction is None:
+                    self._buf = enc.append_string(
+                        enc.append_key(self._buf, zerolog.MessageFieldName), msg
+                    )
+                else:
+                    self.str(zerolog.MessageFieldName, msg)
+            self._buf = enc.append_line_break(enc.append_end_marker(self._buf))
+            for post in self._post:
+                p = post(self._buf, lvl)
+                if p is None:
+                    record(self._stats, DISCARDED, lvl)
+                    return
+                self._buf = p
             try:
                 self._write()
             except Exception as e:
-                if zerolog.ExceptionHandler is not None:
-                    zerolog.ExceptionHandler(e)
-                else:
-                    print(f"zerolog: could not write event: {e}", file=sys.stderr)
+                record(self._stats, WRITE_ERRORS, lvl)
+                _write_error(e)
         finally:
             if self._done is not None:
                 self._done(msg)
 
     def _write(self):
-        if self._level != Level.Disabled:
-            self._buf = enc.append_end_marker(self._buf)
-            self._buf = enc.append_line_break(self._buf)
-            if self._w is not None:
+        if self._w is not None:
+            if isinstance(self._w, _Deferred):
+                self._w.defer(self._buf, self._stats, self._level)
+                return
+            m = self._metrics
+            if m is not None:
+                t = perf_counter_ns()
                 self._w.write(self._buf)
-                if hasattr(self._w, "seek"):
-                    self._w.seek(0)
+                m.write_ns.record(perf_counter_ns() - t)
+                m.event_bytes.record(len(self._buf))
+            else:
+                self._w.write(self._buf)
+            if hasattr(self._w, "seek"):
+                self._w.seek(0)
+            record(self._stats, EMITTED, self._level)
+            record(self._stats, BYTES, self._level, len(self._buf))
 
     # func allows an anonymous function to run only if the event is enabled.
     def func(self, f: Callable[["Event"], None]) -> "Event":
@@ -89,47 +135,133 @@ class Event:
 
     # bool adds the field key with i as a bool to the Event context.
     def bool(self, key: _str, i: _bool) -> "Event":
-        self._buf = enc.append_bool(enc.append_key(self._buf, key), i)
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_bool(enc.append_key(self._buf, key), i)
         return self
 
     # bools adds the field key with i as a List[bool] to the Event context.
     def bools(self, key: _str, i: List[_bool]) -> "Event":
-        self._buf = enc.append_bools(enc.append_key(self._buf, key), i)
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_bools(enc.append_key(self._buf, key), i)
         return self
 
     # float adds the field key with i as a float to the Event context.
     def float(self, key: _str, i: _float) -> "Event":
-        self._buf = enc.append_float(enc.append_key(self._buf, key), i)
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_float(enc.append_key(self._buf, key), i)
         return self
 
     # floats adds the field key with i as a List[float] to the Event context.
     def floats(self, key: _str, i: List[_float]) -> "Event":
-        self._buf = enc.append_floats(enc.append_key(self._buf, key), i)
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_floats(enc.append_key(self._buf, key), i)
         return self
 
     # int adds the field key with i as a int to the Event context.
     def int(self, key: _str, i: _int) -> "Event":
-        self._buf = enc.append_int(enc.append_key(self._buf, key), i)
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_int(enc.append_key(self._buf, key), i)
         return self
 
     # ints adds the field key with i as a List[int] to the Event context.
     def ints(self, key: _str, i: List[_int]) -> "Event":
-        self._buf = enc.append_ints(enc.append_key(self._buf, key), i)
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_ints(enc.append_key(self._buf, key), i)
+        return self
+
+    # vector adds the field key with vals as a list of numbers. vals can be
+    # an array.array, a memoryview or any object implementing the buffer
+    # protocol, a NumPy array or a list; it is encoded in bulk.
+    #
+    # If limit is greater than 0, only the first limit elements are added and
+    # the total number of elements is added with the "<key>_count" key.
+    def vector(self, key: _str, vals: Vector, limit: _int = 0) -> "Event":
+        self._buf = append_vector(self._buf, key, vals, limit)
+        return self
+
+    # vector_summary adds the field key with the count, min, max, mean and
+    # percentiles of vals instead of the values themselves.
+    def vector_summary(
+        self,
+        key: _str,
+        vals: Vector,
+        percentiles: Iterable[_float] = DefaultPercentiles,
+    ) -> "Event":
+        self._buf = append_vector_summary(self._buf, key, vals, percentiles)
         return self
 
     # string adds the field key with val as a string to the Event context.
     def str(self, key: str, val: str) -> "Event":
-        self._buf = enc.append_string(enc.append_key(self._buf, key), val)
+        r = enc.redaction
+        if r is None:
+            self._buf = enc.append_string(enc.append_key(self._buf, key), val)
+        elif not self._mask(key):
+            self._buf = r.append_string(enc.append_key(self._buf, key), val)
         return self
 
     # strs adds the field key with vals as a List[str] to the Event context.
     def strs(self, key: _str, vals: List[_str]) -> "Event":
-        self._buf = enc.append_strings(enc.append_key(self._buf, key), vals)
+        r = enc.redaction
+        if r is None:
+            self._buf = enc.append_strings(enc.append_key(self._buf, key), vals)
+        elif not self._mask(key):
+            self._buf = r.append_strings(enc.append_key(self._buf, key), vals)
+        return self
+
+    # raw_json adds the field key with b, already encoded JSON, to the Event
+    # context. b isn't decoded nor validated and must hold a single valid JSON
+    # value. It can be bytes, a memoryview or any object implementing the
+    # buffer protocol.
+    def raw_json(self, key: _str, b: Buffer) -> "Event":
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_raw_json(enc.append_key(self._buf, key), b)
+        return self
+
+    # hex adds the field key with val encoded as a hex string to the Event
+    # context. val can be bytes, a memoryview or any object implementing the
+    # buffer protocol.
+    def hex(self, key: _str, val: Buffer) -> "Event":
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_hex(enc.append_key(self._buf, key), val)
+        return self
+
+    # base64 adds the field key with val encoded as a base64 string to the
+    # Event context. val can be bytes, a memoryview or any object implementing
+    # the buffer protocol.
+    def base64(self, key: _str, val: Buffer) -> "Event":
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_base64(enc.append_key(self._buf, key), val)
+        return self
+
+    # fields is a helper function to use a mapping or an iterable of
+    # (key, value) pairs to add fields to the event. Values are encoded
+    # according to their type, nested lists and dicts included.
+    def fields(self, fields: Fields) -> "Event":
+        self._buf = append_fields(self._buf, fields)
+        return self
+
+    # dict adds the field key with a dict to the event context.
+    # Use zerolog.dict() to create the dictionary.
+    def dict(self, key: _str, d: "Event") -> "Event":
+        if enc.redaction is None or not self._mask(key):
+            d._buf = enc.append_end_marker(d._buf)
+            self._buf = enc.append_key(self._buf, key)
+            self._buf += d._buf
         return self
 
-    # any adds the field key with val marshaled using reflection.
+    # array adds the field key with an array to the event context.
+    # Use zerolog.arr() to create the array.
+    def array(self, key: _str, a: "Array") -> "Event":
+        if enc.redaction is None or not self._mask(key):
+            self._buf = a._write(enc.append_key(self._buf, key))
+        return self
+
+    # any adds the field key with val encoded according to its type.
+    # Types without a built-in encoder or a function registered with
+    # zerolog.register_marshal_func are marshaled using zerolog.AnyMarshalFunc.
     def any(self, key: _str, val: Any) -> "Event":
-        self._buf = enc.append_any(enc.append_key(self._buf, key), val)
+        if enc.redaction is None or not self._mask(key):
+            self._buf = append_any(enc.append_key(self._buf, key), val)
         return self
 
     # exc adds the field "exception" with serialized e to the Event context.
@@ -176,18 +308,47 @@ class Event:
     # NOTE: It won't dedupe the "time" key if the Event (or Context) has one
     # already.
     def timestamp(self) -> "Event":
-        self._buf = enc.append_time(
-            enc.append_key(self._buf, zerolog.TimestampFieldName),
-            zerolog.TimestampFunc(),
-            zerolog.TimeFieldFormat,
-        )
+        if enc.redaction is None or not self._mask(zerolog.TimestampFieldName):
+            self._buf = enc.append_time(
+                enc.append_key(self._buf, zerolog.TimestampFieldName),
+                zerolog.TimestampFunc(),
+                zerolog.TimeFieldFormat,
+            )
         return self
 
     # time adds the field key with t formatted as string using zerolog.TimeFieldFormat.
     def time(self, key: _str, t: datetime) -> "Event":
-        self._buf = enc.append_time(
-            enc.append_key(self._buf, key), t, zerolog.TimeFieldFormat
-        )
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_time(
+                enc.append_key(self._buf, key), t, zerolog.TimeFieldFormat
+            )
+        return self
+
+    # dur adds the field key with duration d stored as zerolog.DurationFieldUnit.
+    # If zerolog.DurationFieldInteger is True, durations are rendered as integer
+    # instead of float.
+    #
+    # d can be an int in nanoseconds (time.perf_counter_ns), a float in seconds
+    # (time.perf_counter) or a timedelta.
+    def dur(self, key: _str, d: _int | _float | timedelta) -> "Event":
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_duration(
+                enc.append_key(self._buf, key),
+                duration_ns(d),
+                zerolog.DurationFieldUnit,
+                zerolog.DurationFieldInteger,
+            )
+        return self
+
+    # durs adds the field key with a list of durations to the Event context.
+    def durs(self, key: _str, d: List[_int | _float | timedelta]) -> "Event":
+        if enc.redaction is None or not self._mask(key):
+            self._buf = enc.append_durations(
+                enc.append_key(self._buf, key),
+                [duration_ns(v) for v in d],
+                zerolog.DurationFieldUnit,
+                zerolog.DurationFieldInteger,
+            )
         return self
 
     # caller_skip_frame instructs any future caller calls to skip the specified number of frames.
@@ -207,23 +368,72 @@ class Event:
 
     def _caller(self, skip: _int) -> "Event":
         try:
-            tb = getframeinfo(stack()[skip][0])
+            tb = getframeinfo(stack()[skip + self._skip_frames][0])
         except Exception as e:
             print(f"zerolog: could not get traceback: {e}", file=sys.stderr)
             return self
-        self._buf = enc.append_string(
-            enc.append_key(self._buf, zerolog.CallerFieldName),
-            zerolog.CallerMarshalFunc(tb),
-        )
-        return self
+        return self.str(zerolog.CallerFieldName, zerolog.CallerMarshalFunc(tb))
+
+    # _mask appends key with the mask of the redaction policy as its value and
+    # returns True if the policy redacts key, see zerolog.set_redaction.
+    def _mask(self, key: _str) -> _bool:
+        buf = enc.append_masked(self._buf, key)
+        if buf is None:
+            return False
+        self._buf = buf
+        return True
+
 
+# _Deferred is the base of the writers deferring the write of events, like
+# TailSampler. Events are given to defer with the stats of their logger, to be
+# counted by _write_deferred when they are actually written, or as DISCARDED
+# if they are dropped.
+class _Deferred:
+    __slots__ = ()
 
-def _new_event(w: IO | None, lvl: Level) -> Event:
+    @abstractmethod
+    def defer(self, p: bytes, stats: Stats | None, lvl: Level):
+        pass
+
+
+# _write_deferred writes the event p deferred by a _Deferred writer to w and
+# counts it in stats.
+def _write_deferred(w: Writer, p: bytes, stats: Stats | None, lvl: Level):
+    try:
+        w.write(p)
+        if hasattr(w, "seek"):
+            w.seek(0)
+    except Exception as e:
+        record(stats, WRITE_ERRORS, lvl)
+        _write_error(e)
+        return
+    record(stats, EMITTED, lvl)
+    record(stats, BYTES, lvl, len(p))
+
+
+# _write_error reports the error of a failed event write to
+# zerolog.ExceptionHandler, or to stderr if it isn't set. It is shared by the
+# writers deferring the write of events.
+def _write_error(e: Exception):
+    if zerolog.ExceptionHandler is not None:
+        zerolog.ExceptionHandler(e)
+    else:
+        print(f"zerolog: could not write event: {e}", file=sys.stderr)
+
+
+def _new_event(w: Writer | None, lvl: Level) -> Event:
     e = Event()
-    e._ch = []
+    e._ch = ()
     e._buf = enc.append_begin_marker(e._buf)
     e._w = w
     e._level = lvl
     e._stack = False
     e._skip_frames = 0
     return e
+
+
+# dict creates an Event to be used with the Event.dict method.
+# Call usual field methods like str, int etc to add fields to this
+# event and give it as argument the Event.dict method.
+def dict() -> Event:
+    return _new_event(None, Level.NoLevel)
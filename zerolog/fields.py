@@ -0,0 +1,34 @@
+from typing import Any, Iterable, Mapping, Tuple
+
+from .encoder_json import enc
+from .marshal import _resolve, _value_encoders
+
+# Fields is the input accepted by Event.fields and Context.fields: a mapping
+# of keys to values or an iterable of (key, value) pairs.
+Fields = Mapping[str, Any] | Iterable[Tuple[str, Any]]
+
+
+# append_fields encodes each key/value pair of fields and appends them
+# to dst, dispatching on the type of each value.
+def append_fields(dst: bytes, fields: Fields) -> bytes:
+    if isinstance(fields, Mapping):
+        fields = fields.items()
+    append_key = enc.append_key
+    encoders = _value_encoders
+    # The values of the keys redacted by zerolog.set_redaction aren't encoded.
+    redacted = enc.redaction is not None
+    for key, val in fields:
+        if redacted:
+            masked = enc.append_masked(dst, key)
+            if masked is not None:
+                dst = masked
+                continue
+        dst = append_key(dst, key)
+        f = encoders.get(type(val))
+        if f is None:
+            f = _resolve(type(val))
+        try:
+            dst = f(dst, val)
+        except Exception as e:
+            dst = enc.append_string(dst, f"marshaling error: {e}")
+    return dst
@@ -1,7 +1,8 @@
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable, Protocol
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Protocol, Tuple
 
+from . import _globals
 from .level import Level
 
 if TYPE_CHECKING:
@@ -25,7 +26,9 @@ class HookFunc:
         self.func(e, level, message)
 
 
-# LevelHook applies a different hook for each level.
+# LevelHook applies a different hook for each level. Its hooks are resolved
+# per level when it is added to a logger; setting one of them afterwards makes
+# the loggers resolve them again on their next event.
 @dataclass
 class LevelHook:
     no_level_hook: Hook | None = None
@@ -36,31 +39,103 @@ class LevelHook:
     error_hook: Hook | None = None
     fatal_hook: Hook | None = None
 
+    def __setattr__(self, name: str, value: Any):
+        changed = name in self.__dict__
+        object.__setattr__(self, name, value)
+        if changed:
+            # Loggers recompile their hooks when the global state changes.
+            _globals._bump_version()
+
     def run(self, e: "Event", lvl: Level, msg: str):
+        h = self.hook_for(lvl)
+        if h is not None:
+            h.run(e, lvl, msg)
+
+    # hook_for returns the hook applied to lvl, if any.
+    def hook_for(self, lvl: Level) -> Hook | None:
         match lvl:
             case Level.TraceLevel:
-                if self.trace_hook is not None:
-                    self.trace_hook.run(e, lvl, msg)
+                return self.trace_hook
             case Level.DebugLevel:
-                if self.debug_hook is not None:
-                    self.debug_hook.run(e, lvl, msg)
+                return self.debug_hook
             case Level.InfoLevel:
-                if self.info_hook is not None:
-                    self.info_hook.run(e, lvl, msg)
+                return self.info_hook
             case Level.WarnLevel:
-                if self.warn_hook is not None:
-                    self.warn_hook.run(e, lvl, msg)
+                return self.warn_hook
             case Level.ErrorLevel:
-                if self.error_hook is not None:
-                    self.error_hook.run(e, lvl, msg)
+                return self.error_hook
             case Level.FatalLevel:
-                if self.fatal_hook is not None:
-                    self.fatal_hook.run(e, lvl, msg)
+                return self.fatal_hook
             case Level.NoLevel:
-                if self.no_level_hook is not None:
-                    self.no_level_hook.run(e, lvl, msg)
+                return self.no_level_hook
+        return None
 
 
 # new_level_hook returns a new LevelHook.
 def new_level_hook() -> LevelHook:
     return LevelHook()
+
+
+# PostHook defines an interface to a hook run on the encoded event, once its
+# message is added. run returns the bytes written in place of p, or None to
+# discard the event.
+class PostHook(Protocol):
+    @abstractmethod
+    def run(self, p: bytes, level: Level) -> bytes | None:
+        pass
+
+
+# PostHookFunc is an adaptor to allow the use of an ordinary function
+# as a PostHook.
+class PostHookFunc:
+    def __init__(self, func: Callable[[bytes, Level], bytes | None]):
+        self.func = func
+
+    def run(self, p: bytes, level: Level) -> bytes | None:
+        return self.func(p, level)
+
+
+# HookRun and PostHookRun are the functions hooks are resolved to.
+HookRun = Callable[["Event", Level, str], None]
+PostHookRun = Callable[[bytes, Level], bytes | None]
+
+# Dispatch holds the hooks applied to each level, indexed by level + 1.
+Dispatch = Tuple[Tuple[HookRun, ...], ...]
+
+_levels = sorted(Level)
+
+
+# _resolve returns the function running h for lvl, if any. Adaptors are
+# unwrapped so events call the underlying function directly.
+def _resolve(h: Hook, lvl: Level) -> HookRun | None:
+    if type(h) is LevelHook:
+        sub = h.hook_for(lvl)
+        if sub is None:
+            return None
+        return _resolve(sub, lvl)
+    if type(h) is HookFunc:
+        return h.func
+    return h.run
+
+
+# _resolve_post returns the function running the post hook h.
+def _resolve_post(h: PostHook) -> PostHookRun:
+    if type(h) is PostHookFunc:
+        return h.func
+    return h.run
+
+
+# _compile_hooks returns the dispatch table of hooks, so an event only runs
+# the hooks applying to its level.
+def _compile_hooks(hooks: Iterable[Hook]) -> Dispatch:
+    hooks = tuple(hooks)
+    if len(hooks) == 0:
+        return _no_hooks
+    table = []
+    for lvl in _levels:
+        runs = (_resolve(h, lvl) for h in hooks)
+        table.append(tuple(r for r in runs if r is not None))
+    return tuple(table)
+
+
+_no_hooks: Dispatch = tuple(() for _ in _levels)
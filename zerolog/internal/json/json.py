@@ -1,21 +1,27 @@
+import binascii
+import re
 from datetime import datetime
-from typing import Any, List
+from json import encoder
+from typing import Any, Callable, List
 
 import zerolog
 from zerolog import constants
+from zerolog.encoder import Redactor
 from zerolog.internal.util.time import convert_offset
 
 LEFT_BRACE = 123  # {
+RIGHT_BRACE = 125  # }
+COMMA = 44  # ,
 
-_hex = "0123456789abcdef"
-_no_escape_table: List[bool] = [False] * 256
-
-for i in range(0x00, 0x7F):
-    # 0x20 space 0x5c \ 0x22 "
-    _no_escape_table[i] = i >= 0x20 and i != 0x5C and i != 0x22
+# _encode_string is the string encoder of the json module, implemented in C.
+_encode_string: Callable[[str], str] = getattr(encoder, "encode_basestring")
 
 
 class Encoder:
+    # redaction is the policy masking the values of fields, set with
+    # zerolog.set_redaction.
+    redaction: Redactor | None = None
+
     # append_begin_marker inserts a map start into the dst byte array.
     @staticmethod
     def append_begin_marker(dst: bytes) -> bytes:
@@ -28,6 +34,25 @@ class Encoder:
         dst += b"}"
         return dst
 
+    # append_array_start adds markers to indicate the start of an array.
+    @staticmethod
+    def append_array_start(dst: bytes) -> bytes:
+        dst += b"["
+        return dst
+
+    # append_array_end adds markers to indicate the end of an array.
+    @staticmethod
+    def append_array_end(dst: bytes) -> bytes:
+        dst += b"]"
+        return dst
+
+    # append_array_delim adds markers to indicate end of a particular array element.
+    @staticmethod
+    def append_array_delim(dst: bytes) -> bytes:
+        if len(dst) > 0:
+            dst += b","
+        return dst
+
     # append_any marshals the input to a string and
     # appends the encoded string to the input byte slice.
     def append_any(self, dst: bytes, val: Any) -> bytes:
@@ -39,6 +64,16 @@ class Encoder:
         dst += f"{m}".encode()
         return dst
 
+    # append_base64 encodes the input bytes to a base64 string and appends
+    # it to the input byte slice. val can be any object implementing the
+    # buffer protocol, it is encoded without being copied first.
+    @staticmethod
+    def append_base64(dst: bytes, val: Any) -> bytes:
+        dst += b'"'
+        dst += binascii.b2a_base64(val, newline=False)
+        dst += b'"'
+        return dst
+
     # append_bool converts the input bool to a string and
     # appends the encoded string to the input byte slice.
     @staticmethod
@@ -46,22 +81,35 @@ class Encoder:
         dst += f"{str(val).lower()}".encode()
         return dst
 
-    # append_floats encodes the input bools to json and
+    # append_bools encodes the input bools to json and
     # appends the encoded string list to the input byte slice.
     @staticmethod
     def append_bools(dst: bytes, vals: List[bool]) -> bytes:
-        if len(vals) == 0:
-            dst += b"[]"
-            return dst
         dst += b"["
-        dst += f"{str(vals[0]).lower()}".encode()
-        if len(vals) > 1:
-            for val in vals[1:]:
-                dst += b","
-                dst += f"{str(val).lower()}".encode()
+        dst += ",".join(["true" if v else "false" for v in vals]).encode()
         dst += b"]"
         return dst
 
+    # append_duration formats the input duration, given in nanoseconds,
+    # with the given unit and appends the encoded string to the input byte
+    # slice. If use_int is True, the duration is truncated to an integer.
+    def append_duration(
+        self, dst: bytes, d: int | float, unit: int, use_int: bool
+    ) -> bytes:
+        if use_int:
+            return self.append_int(dst, int(d // unit))
+        return self.append_float(dst, d / unit)
+
+    # append_durations formats the input durations, given in nanoseconds,
+    # with the given unit and appends the encoded string list to the input
+    # byte slice.
+    def append_durations(
+        self, dst: bytes, vals: List[int | float], unit: int, use_int: bool
+    ) -> bytes:
+        if use_int:
+            return self.append_ints(dst, [int(d // unit) for d in vals])
+        return self.append_floats(dst, [d / unit for d in vals])
+
     # append_float converts the input float to a string and
     # appends the encoded string to the input byte slice.
     @staticmethod
@@ -73,18 +121,21 @@ class Encoder:
     # appends the encoded string list to the input byte slice.
     @staticmethod
     def append_floats(dst: bytes, vals: List[float]) -> bytes:
-        if len(vals) == 0:
-            dst += b"[]"
-            return dst
         dst += b"["
-        dst += f"{str(vals[0])}".encode()
-        if len(vals) > 1:
-            for val in vals[1:]:
-                dst += b","
-                dst += f"{str(val)}".encode()
+        dst += ",".join(map(str, vals)).encode()
         dst += b"]"
         return dst
 
+    # append_hex encodes the input bytes to a hex string and appends it to
+    # the input byte slice. val can be any object implementing the buffer
+    # protocol, it is encoded without being copied first.
+    @staticmethod
+    def append_hex(dst: bytes, val: Any) -> bytes:
+        dst += b'"'
+        dst += binascii.b2a_hex(val)
+        dst += b'"'
+        return dst
+
     # append_int converts the input int to a string and
     # appends the encoded string to the input byte slice.
     @staticmethod
@@ -96,15 +147,8 @@ class Encoder:
     # appends the encoded string list to the input byte slice.
     @staticmethod
     def append_ints(dst: bytes, vals: List[int]) -> bytes:
-        if len(vals) == 0:
-            dst += b"[]"
-            return dst
         dst += b"["
-        dst += f"{str(vals[0])}".encode()
-        if len(vals) > 1:
-            for val in vals[1:]:
-                dst += b","
-                dst += f"{str(val)}".encode()
+        dst += ",".join(map(str, vals)).encode()
         dst += b"]"
         return dst
 
@@ -114,6 +158,12 @@ class Encoder:
         dst += b"\n"
         return dst
 
+    # append_nil inserts a 'Nil' object into the dst byte array.
+    @staticmethod
+    def append_nil(dst: bytes) -> bytes:
+        dst += b"null"
+        return dst
+
     # append_key appends a new key to the output JSON.
     def append_key(self, dst: bytes, key: str) -> bytes:
         if dst[len(dst) - 1] != LEFT_BRACE:
@@ -123,28 +173,37 @@ class Encoder:
         dst += b":"
         return dst
 
+    # append_masked appends key with the mask as its value if the redaction
+    # policy redacts key. It returns None otherwise, the key and its value are
+    # then appended as usual.
+    def append_masked(self, dst: bytes, key: str) -> bytes | None:
+        r = self.redaction
+        if r is None:
+            return None
+        masked = r.masked_key(key)
+        if masked is None:
+            return None
+        if dst[len(dst) - 1] != LEFT_BRACE:
+            dst += b","
+        return dst + masked
+
+    # append_raw_json appends the input bytes, which must hold valid encoded
+    # JSON, as is to the input byte slice. val can be any object implementing
+    # the buffer protocol, it is copied once. Empty input is appended as null.
+    @staticmethod
+    def append_raw_json(dst: bytes, val: Any) -> bytes:
+        if len(val) == 0:
+            dst += b"null"
+            return dst
+        dst += val
+        return dst
+
+    # append_string encodes the input string to json and appends the encoded
+    # string to the input byte slice. Control characters, the backslash and
+    # the double quote are escaped, other characters are utf8 encoded.
     @staticmethod
     def append_string(dst: bytes, s: str) -> bytes:
-        dst += b'"'
-        for i, _ in enumerate(s):
-            # Check if the character needs encoding. Control characters, slashes,
-            # and the double quote need json encoding. Bytes above the ascii
-            # boundary needs utf8 encoding.
-            try:
-                if not _no_escape_table[ord(s[i])]:
-                    # We encountered a character that needs to be encoded. Switch
-                    # to complex version of the algorithm.
-                    dst = append_string_complex(dst, s, i)
-                    dst += b'"'
-                    return dst
-            except IndexError:
-                dst = append_string_complex(dst, s, i)
-                dst += b'"'
-                return dst
-        # The string has no need for encoding and therefore is directly
-        # appended to the byte slice.
-        dst += str.encode(s)
-        dst += b'"'
+        dst += _encode_string(s).encode()
         return dst
 
     # append_strings encodes the input strings to json and
@@ -208,42 +267,34 @@ class Encoder:
 # append_string_complex is used by append_string to take over an in
 # progress JSON string encoding that encountered a character that needs
 # to be encoded.
-def append_string_complex(dst: bytes, s: str, i: int) -> bytes:
-    start = 0
-    while i < len(s):
-        b = s[i]
-        if b > "\x80":
-            size = len(s.encode())
-            i += size
-            continue
-        if _no_escape_table[ord(b)]:
-            i += 1
-            continue
-        # We encountered a character that needs to be encoded.
-        # Let's append the previous simple characters to the byte slice
-        # and switch our operation to read and encode the remainder
-        # characters byte-by-byte.
-        if start < i:
-            dst += s[start:i].encode()
-        match b:
-            case "\x22" | "\x5c":  # " and space
-                dst += f"\\{b}".encode()
-            case "\x08":  # \b backspace
-                dst += f"\\b".encode()
-            case "\x0c":  # \f form feed
-                dst += f"\\f".encode()
-            case "\x0a":  # \n line feed
-                dst += f"\\n".encode()
-            case "\x0d":  # \r carriage return
-                dst += f"\\r".encode()
-            case "\x09":  # \t horizontal tab
-                dst += f"\\t".encode()
-            case _:
-                dst += b"\\u00"
-                dst += _hex[int.from_bytes(b.encode()) >> 4].encode()
-                dst += _hex[int.from_bytes(b.encode()) & 0xF].encode()
-        i += 1
-        start = i
-    if start < len(s):
-        dst += s[start:].encode()
-    return dst
+_string = rb'"(?:[^"\\]|\\.)*"'
+_scalar_re = re.compile(_string + rb"|[^,}\]]*")
+_token_re = re.compile(_string + rb"|[\[\]{}]")
+
+
+# field_value returns the encoded value of the first field whose encoded key,
+# with its colon, is key in the encoded object buf, or None if there is none.
+# The object doesn't have to be closed and the field can be in a nested
+# object. Only the value is scanned, the rest of buf isn't decoded.
+def field_value(buf: bytes, key: bytes) -> bytes | None:
+    i = buf.find(key)
+    # Unescaped quotes only delimit strings, so a key preceded by { or , can't
+    # be in a string.
+    while i > 0 and buf[i - 1] != LEFT_BRACE and buf[i - 1] != COMMA:
+        i = buf.find(key, i + 1)
+    if i <= 0:
+        return None
+    start = i + len(key)
+    if buf[start : start + 1] not in (b"{", b"["):
+        m = _scalar_re.match(buf, start)
+        return m.group() if m is not None else None
+    depth = 0
+    for m in _token_re.finditer(buf, start):
+        c = buf[m.start()]
+        if c == LEFT_BRACE or c == 91:  # [
+            depth += 1
+        elif c == 125 or c == 93:  # } ]
+            depth -= 1
+            if depth == 0:
+                return buf[start : m.end()]
+    return buf[start:]
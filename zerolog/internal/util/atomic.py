@@ -1,4 +1,8 @@
 import threading
+import weakref
+from typing import Callable, Generic, List, TypeVar
+
+T = TypeVar("T")
 
 
 class Int:
@@ -32,3 +36,91 @@ class Int:
             val = self._value
             self._value = new
             return val
+
+
+# Shards holds one shard per thread, created with new on the first access of
+# a thread. A thread only updates its own shard so no lock is needed; other
+# threads may read it, which is safe with and without the GIL but can observe
+# an update in progress.
+#
+# When a thread exits, its shard is folded into a retired shard with
+# fold(retired, shard) and removed, so the shards don't grow with the number
+# of threads ever started. The retired shard is one of the shards returned by
+# all.
+class Shards(Generic[T]):
+    def __init__(self, new: Callable[[], T], fold: Callable[[T, T], None]):
+        self._new = new
+        self._fold = fold
+        self._local = threading.local()
+        self._retired = new()
+        self._shards: List[T] = [self._retired]
+        self._lock = threading.Lock()
+
+    # get returns the shard of the current thread.
+    def get(self) -> T:
+        try:
+            return self._local.shard
+        except AttributeError:
+            return self._new_shard()
+
+    # all returns the shards of all the threads without locking. The returned
+    # list must not be modified. A shard being retired can be returned along
+    # with the retired shard it is folded into.
+    def all(self) -> List[T]:
+        return self._shards
+
+    # total returns a new shard with all the shards folded into it.
+    def total(self) -> T:
+        t = self._new()
+        with self._lock:
+            for shard in self._shards:
+                self._fold(t, shard)
+        return t
+
+    def _new_shard(self) -> T:
+        shard = self._new()
+        self._local.shard = shard
+        # The owner is only referenced by the thread local storage, which is
+        # cleared when the thread exits.
+        owner = self._local.owner = _Owner()
+        weakref.finalize(owner, _retire, weakref.ref(self), shard)
+        with self._lock:
+            self._shards = self._shards + [shard]
+        return shard
+
+
+class _Owner:
+    __slots__ = ("__weakref__",)
+
+
+def _retire(ref: "weakref.ref[Shards[T]]", shard: T):
+    s = ref()
+    if s is None:
+        return
+    with s._lock:
+        s._fold(s._retired, shard)
+        # The list is replaced, not modified, as it is read without locking.
+        s._shards = [x for x in s._shards if x is not shard]
+
+
+def _add(into: List[int], shard: List[int]):
+    for i, v in enumerate(shard):
+        into[i] += v
+
+
+# Counters is a fixed size array of counters sharded per thread. Each thread
+# increments its own shard without taking a lock, load sums the shards.
+class Counters:
+    def __init__(self, size: int):
+        self._size = size
+        self._shards: Shards[List[int]] = Shards(lambda: [0] * size, _add)
+
+    # add adds delta to the counter i of the current thread and returns its
+    # new value for this thread.
+    def add(self, i: int, delta: int = 1) -> int:
+        shard = self._shards.get()
+        shard[i] += delta
+        return shard[i]
+
+    def load(self) -> List[int]:
+        return self._shards.total()
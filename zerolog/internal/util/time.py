@@ -1,6 +1,20 @@
+from datetime import timedelta
+
+
 # convert_offset takes a RFC3339 time string and
 # changes the offset to Z if it's UTC.
 def convert_offset(s: str) -> str:
     if s[-6:] == "+00:00":
         s = f"{s[0:-6]}Z"
     return s
+
+
+# duration_ns converts a duration to nanoseconds. ints are nanoseconds, as
+# returned by time.perf_counter_ns, floats are seconds, as returned by
+# time.perf_counter, and timedelta are converted.
+def duration_ns(d: int | float | timedelta) -> int | float:
+    if isinstance(d, int):
+        return d
+    if isinstance(d, timedelta):
+        return ((d.days * 86400 + d.seconds) * 1_000_000 + d.microseconds) * 1000
+    return d * 1_000_000_000
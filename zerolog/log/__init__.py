@@ -4,6 +4,7 @@ from .log import (
     level,
     sample,
     hook,
+    enabled,
     trace,
     debug,
     info,
@@ -13,5 +14,6 @@ from .log import (
     exc,
     with_level,
     log,
+    timer,
     print,
 )
@@ -1,10 +1,11 @@
-from typing import Any, IO
+from typing import Any
 
 import zerolog
+from zerolog.writer import Writer
 
 
 # output duplicates the global logger and sets w as its output.
-def output(w: IO | Any) -> zerolog.Logger:
+def output(w: Writer | Any) -> zerolog.Logger:
     return zerolog.GlobalLogger.output(w)
 
 
@@ -28,6 +29,12 @@ def hook(h: zerolog.Hook) -> zerolog.Logger:
     return zerolog.GlobalLogger.hook(h)
 
 
+# enabled returns True if an event with lvl passes the level of the global
+# logger and the global level.
+def enabled(lvl: zerolog.Level) -> bool:
+    return zerolog.GlobalLogger.enabled(lvl)
+
+
 # exc starts a new message with error level with e as a field.
 #
 # You must call msg on the returned event in order to send the event.
@@ -93,6 +100,15 @@ def log() -> zerolog.Event | None:
     return zerolog.GlobalLogger.log()
 
 
+# timer returns a Timer logging the time elapsed in the block it wraps.
+def timer(
+    msg: str = "",
+    lvl: zerolog.Level = zerolog.DebugLevel,
+    key: str = zerolog.timer.DefaultTimerFieldName,
+) -> zerolog.Timer:
+    return zerolog.GlobalLogger.timer(msg, lvl, key)
+
+
 # print sends a log event using debug level and no extra field.
 def print(*args: Any):
     return zerolog.GlobalLogger.print(args)
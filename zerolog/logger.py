@@ -1,14 +1,33 @@
 import sys
 from dataclasses import dataclass, field
-from typing import Any, Callable, IO, List
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable, Tuple
 
 import zerolog
+from . import _globals
+from .bind import _bound
 from .context import Context
 from .encoder_json import enc
 from .event import Event, _new_event
-from .hook import Hook
+from .fields import Fields, append_fields
+from .hook import (
+    Dispatch,
+    Hook,
+    PostHook,
+    PostHookRun,
+    _compile_hooks,
+    _resolve_post,
+)
 from .level import Level
 from .sampler import Sampler
+from .stats import FILTERED, SAMPLED, Stats, record
+from .timer import DefaultTimerFieldName, Timer
+from .writer import Writer
+
+if TYPE_CHECKING:
+    from .batch import Batch
+    from .metrics import Metrics
+    from .template import Template, TemplateField
 
 
 # A Logger represents an active logging object that generates lines
@@ -16,58 +35,137 @@ from .sampler import Sampler
 # call to the IO's write method. There is no guarantee on access
 # serialization to the IO. If your IO is not thread safe,
 # you may consider a sync wrapper.
-@dataclass
+@dataclass(slots=True)
 class Logger:
-    _w: IO | None
+    _w: Writer | None
     _level: Level = Level.DebugLevel
     _sampler: Sampler | None = None
     _context: bytes = b""
-    _hooks: List[Hook] = field(default_factory=lambda: [])
+    _hooks: Tuple[Hook, ...] = ()
     _stack: bool = False
+    _stats: Stats | None = None
+    _metrics: "Metrics | None" = None
+    _post_hooks: Tuple[PostHookRun, ...] = ()
+    # _dispatch holds the hooks applying to each level, compiled from _hooks.
+    _dispatch: Dispatch = field(default=(), repr=False, compare=False)
+    # _cache holds the global state version, the minimum level derived from
+    # it and whether filtered events are counted, as a single tuple so it is
+    # replaced atomically.
+    _cache: Tuple[int, int, bool] = field(
+        default=(-1, 0, False), repr=False, compare=False
+    )
 
-    def output(self, w: IO) -> "Logger":
-        l: Logger = new(w)
-        l._level = self._level
-        l._sampler = self._sampler
-        l._stack = self._stack
-        if len(self._hooks) > 0:
-            l._hooks = self._hooks
-        if self._context is not None:
-            l._context = self._context
+    def __post_init__(self):
+        if len(self._dispatch) == 0:
+            self._dispatch = _compile_hooks(self._hooks)
+
+    # output duplicates the logger and sets w as its output.
+    def output(self, w: Writer) -> "Logger":
+        l = self._copy()
+        l._w = w
+        l._cache = (-1, 0, False)
         return l
 
     # level creates a child logger with the minimum accepted level set to level.
     def level(self, lvl: Level) -> "Logger":
         self._level = lvl
+        self._cache = (-1, 0, False)
         return self
 
     # get_level returns the current Level.
     def get_level(self) -> Level:
         return self._level
 
+    # enabled returns True if an event with lvl passes the level of the logger
+    # and the global level. Samplers and hooks are not run.
+    def enabled(self, lvl: Level) -> bool:
+        g = _globals._state
+        cache = self._cache
+        if cache[0] != g.version:
+            cache = self._update_cache(g)
+        return lvl >= cache[1]
+
     # Sample returns a logger with the s sampler.
     def sample(self, s: Sampler) -> "Logger":
         self._sampler = s
         return self
 
+    # stats returns a logger counting its events in s, in addition to the
+    # global stats.
+    def stats(self, s: Stats) -> "Logger":
+        self._stats = s
+        self._cache = (-1, 0, False)
+        return self
+
+    # get_stats returns the stats of the logger if set.
+    def get_stats(self) -> Stats | None:
+        return self._stats
+
+    # metrics returns a logger measuring the cost of its events in m.
+    def metrics(self, m: "Metrics") -> "Logger":
+        self._metrics = m
+        return self
+
+    # get_metrics returns the metrics of the logger if set.
+    def get_metrics(self) -> "Metrics | None":
+        return self._metrics
+
     # ctx creates a child logger.
     def ctx(self) -> Context:
-        context = self._context
-        self._context = b""
-        if len(context) > 0:
-            self._context += context
-        else:
+        if len(self._context) == 0:
             # This is needed for append_key to not check len of input
             # thus making it inlinable
             self._context = enc.append_begin_marker(self._context)
 
         return Context(self)
 
-    # hook returns a logger with the h Hook.
+    # with_ creates a child logger with fields added to its context, leaving
+    # the logger unchanged. The child shares the encoded context and hooks of
+    # the parent, only the new fields are encoded. fields can be a mapping or
+    # an iterable of (key, value) pairs, keyword arguments are added after
+    # them.
+    def with_(self, fields: Fields | None = None, **kwargs: Any) -> "Logger":
+        context = self._context
+        if len(context) == 0:
+            context = enc.append_begin_marker(context)
+        if fields is not None:
+            context = append_fields(context, fields)
+        if len(kwargs) > 0:
+            context = append_fields(context, kwargs)
+        l = self._copy()
+        l._context = context
+        return l
+
+    # hook returns a logger with the h Hook. Hooks are compiled into a table
+    # of the hooks applying to each level when they are added.
     def hook(self, h: Hook) -> "Logger":
-        self._hooks.append(h)
+        self._hooks = self._hooks + (h,)
+        self._dispatch = _compile_hooks(self._hooks)
+        return self
+
+    # post_hook returns a logger with the h PostHook, run on each encoded
+    # event after the hooks.
+    def post_hook(self, h: PostHook) -> "Logger":
+        self._post_hooks = self._post_hooks + (_resolve_post(h),)
         return self
 
+    # _copy returns a shallow copy of the logger. The context and hooks are
+    # immutable, methods changing them replace them, so they are shared with
+    # the copy.
+    def _copy(self) -> "Logger":
+        return Logger(
+            self._w,
+            self._level,
+            self._sampler,
+            self._context,
+            self._hooks,
+            self._stack,
+            self._stats,
+            self._metrics,
+            self._post_hooks,
+            self._dispatch,
+        )
+
     # trace starts a new message with trace level.
     #
     # You must call msg on the returned event in order to send the event.
@@ -145,6 +243,35 @@ class Logger:
     def log(self) -> Event | None:
         return self.new_event(Level.NoLevel, None)
 
+    # timer returns a Timer logging the time elapsed in the block it wraps
+    # as a duration field named key, with lvl and msg. It can be used as a
+    # context manager or as a decorator.
+    def timer(
+        self,
+        msg: str = "",
+        lvl: Level = Level.DebugLevel,
+        key: str = DefaultTimerFieldName,
+    ) -> Timer:
+        return Timer(self, lvl, msg, key)
+
+    # batch returns a Batch whose logger accumulates its events in memory to
+    # write them in a single write on flush. It is used as a context manager:
+    #
+    #   with log.batch() as blog:
+    #       blog.info().msg("hello")
+    def batch(self, max_bytes: int = 0) -> "Batch":
+        from .batch import Batch
+
+        return Batch(self, max_bytes)
+
+    # template returns a Template logging msg with lvl and fields whose
+    # values are given to its emit method. The level, context and keys are
+    # encoded once by template.
+    def template(self, lvl: Level, msg: str, *fields: "TemplateField") -> "Template":
+        from .template import Template
+
+        return Template(self, lvl, msg, *fields)
+
     # print sends a log event using debug level and no extra field.
     def print(self, *args: Any):
         e = self.debug()
@@ -159,22 +286,65 @@ class Logger:
             return None
         e: Event = _new_event(self._w, lvl)
         e._done = done
-        e._ch = self._hooks
+        e._ch = self._dispatch[lvl + 1]
+        e._post = self._post_hooks
+        e._stats = self._stats
+        m = self._metrics
+        if m is not None and m._sample():
+            e._metrics = m
+            e._start = perf_counter_ns()
         if lvl != Level.NoLevel and zerolog.LevelFieldName != "":
             e.str(zerolog.LevelFieldName, lvl.string())
         if len(self._context) > 1:
             e._buf = enc.append_object_data(e._buf, self._context)
+        bound = _bound.get()
+        if len(bound) > 1:
+            e._buf = enc.append_object_data(e._buf, bound)
         return e
 
     def _should(self, lvl: Level) -> bool:
-        if self._w is None:
+        g = _globals._state
+        # The cache is checked inline, this is the path of disabled events.
+        cache = self._cache
+        if cache[0] != g.version:
+            cache = self._update_cache(g)
+        if lvl < cache[1]:
+            if cache[2]:
+                self._filtered(g, lvl)
             return False
-        if lvl < self._level or lvl < zerolog.global_level():
-            return False
-        if self._sampler is not None and zerolog.sampling_disabled is False:
-            return self._sampler.sample(lvl)
+        if self._sampler is not None and not g.sampling_disabled:
+            if not self._sampler.sample(lvl):
+                record(self._stats, SAMPLED, lvl)
+                return False
         return True
 
+    # _update_cache caches the minimum level of the logger and g until the
+    # global state changes, and returns the new cache. Loggers without output
+    # have a minimum level above all levels and don't count filtered events.
+    # The hooks are compiled again too, as the hooks of a LevelHook may have
+    # changed.
+    def _update_cache(self, g: _globals._GlobalState) -> Tuple[int, int, bool]:
+        if len(self._hooks) > 0:
+            self._dispatch = _compile_hooks(self._hooks)
+        if self._w is None:
+            cache = self._cache = (g.version, _no_output, False)
+            return cache
+        count = g.count_filtered or self._stats is not None
+        cache = self._cache = (g.version, max(self._level, g.level), count)
+        return cache
+
+    # _filtered counts an event filtered by level in the stats of the logger,
+    # and in the global stats if zerolog.count_filtered is set.
+    def _filtered(self, g: _globals._GlobalState, lvl: Level):
+        if g.count_filtered:
+            record(self._stats, FILTERED, lvl)
+        elif self._stats is not None:
+            self._stats.add(FILTERED, lvl)
+
+
+# _no_output is the minimum level of loggers without output.
+_no_output = Level.Disabled + 1
+
 
-def new(w: IO | Any | None) -> Logger:
+def new(w: Writer | Any | None) -> Logger:
     return Logger(w)
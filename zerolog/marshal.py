@@ -0,0 +1,343 @@
+import dataclasses
+import enum
+import json
+import sys
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Mapping
+
+import zerolog
+from .encoder_json import enc
+from .internal.util.time import duration_ns
+
+if TYPE_CHECKING:
+    from decimal import Decimal
+
+# ValueEncoder appends the encoded value to dst and returns the result.
+ValueEncoder = Callable[[bytes, Any], bytes]
+
+_registry_lock = threading.Lock()
+
+# _marshal_funcs holds the functions registered with register_marshal_func.
+_marshal_funcs: Dict[type, Callable[[Any], Any]] = {}
+
+
+# register_marshal_func registers func to marshal values of typ and of its
+# subclasses. func must convert the value to a value zerolog can encode
+# natively, like a str or a dict, and takes precedence over the built-in
+# encoders.
+def register_marshal_func(typ: type, func: Callable[[Any], Any]):
+    with _registry_lock:
+        _marshal_funcs[typ] = func
+        _reset_encoders()
+
+
+# unregister_marshal_func removes the function registered for typ if any.
+def unregister_marshal_func(typ: type):
+    with _registry_lock:
+        _marshal_funcs.pop(typ, None)
+        _reset_encoders()
+
+
+# append_value encodes val as a JSON value and appends it to dst. The
+# encoder for each type is resolved once and then cached.
+def append_value(dst: bytes, val: Any) -> bytes:
+    f = _value_encoders.get(type(val))
+    if f is None:
+        f = _resolve(type(val))
+    return f(dst, val)
+
+
+# append_any is like append_value but appends a marshaling error message
+# instead of raising if val can't be encoded.
+def append_any(dst: bytes, val: Any) -> bytes:
+    try:
+        return append_value(dst, val)
+    except Exception as e:
+        return enc.append_string(dst, f"marshaling error: {e}")
+
+
+# append_object encodes the items of m as a JSON object. Non string keys
+# are converted with str().
+def append_object(dst: bytes, m: Mapping[Any, Any]) -> bytes:
+    dst = enc.append_begin_marker(dst)
+    for k, v in m.items():
+        if type(k) is not str:
+            k = _key(k)
+        if enc.redaction is not None:
+            masked = enc.append_masked(dst, k)
+            if masked is not None:
+                dst = masked
+                continue
+        dst = append_value(enc.append_key(dst, k), v)
+    return enc.append_end_marker(dst)
+
+
+# append_list encodes the elements of vals as a JSON array.
+def append_list(dst: bytes, vals: Iterable[Any]) -> bytes:
+    dst = enc.append_array_start(dst)
+    first = True
+    for val in vals:
+        if first:
+            first = False
+        else:
+            dst += b","
+        dst = append_value(dst, val)
+    return enc.append_array_end(dst)
+
+
+def _key(k: Any) -> str:
+    if isinstance(k, enum.Enum):
+        k = k.value
+    if isinstance(k, bool):
+        return "true" if k else "false"
+    if k is None:
+        return "null"
+    return str(k)
+
+
+def _append_nil(dst: bytes, _: None) -> bytes:
+    return enc.append_nil(dst)
+
+
+def _append_time(dst: bytes, t: datetime) -> bytes:
+    return enc.append_time(dst, t, zerolog.TimeFieldFormat)
+
+
+def _append_isoformat(dst: bytes, t: date | time) -> bytes:
+    return enc.append_string(dst, t.isoformat())
+
+
+def _append_timedelta(dst: bytes, d: timedelta) -> bytes:
+    return enc.append_duration(
+        dst, duration_ns(d), zerolog.DurationFieldUnit, zerolog.DurationFieldInteger
+    )
+
+
+# _append_str, _append_bytes and _append_exc encode their values as strings
+# with _value_encoders[str], which masks the values redacted by
+# zerolog.set_redaction.
+def _append_str(dst: bytes, val: Any) -> bytes:
+    return _value_encoders[str](dst, str(val))
+
+
+def _append_bytes(dst: bytes, val: bytes | bytearray) -> bytes:
+    return _value_encoders[str](dst, val.decode("utf-8", "replace"))
+
+
+def _append_decimal(dst: bytes, d: "Decimal") -> bytes:
+    if d.is_finite():
+        dst += str(d).encode()
+        return dst
+    return enc.append_string(dst, str(d))
+
+
+def _append_set(dst: bytes, vals: set | frozenset) -> bytes:
+    return append_list(dst, vals)
+
+
+def _append_enum(dst: bytes, e: enum.Enum) -> bytes:
+    return append_value(dst, e.value)
+
+
+def _append_exc(dst: bytes, e: Exception) -> bytes:
+    m = zerolog.ExceptionMarshalFunc(e)
+    if m is None:
+        return enc.append_nil(dst)
+    if isinstance(m, str):
+        return _value_encoders[str](dst, m)
+    if isinstance(m, Exception):
+        return _value_encoders[str](dst, str(m))
+    return append_value(dst, m)
+
+
+# _append_marshaled falls back to zerolog.AnyMarshalFunc.
+def _append_marshaled(dst: bytes, val: Any) -> bytes:
+    dst += f"{zerolog.AnyMarshalFunc(val)}".encode()
+    return dst
+
+
+def _new_marshal_func_encoder(func: Callable[[Any], Any]) -> ValueEncoder:
+    def append(dst: bytes, val: Any) -> bytes:
+        return append_value(dst, func(val))
+
+    return append
+
+
+def _new_attrs_encoder(names: List[str], skip_unset: bool) -> ValueEncoder:
+    attrs = []
+    for name in names:
+        # The fragment of a redacted field holds the mask, the attribute isn't
+        # read, see zerolog.set_redaction.
+        masked = enc.append_masked(b"{", name)
+        if masked is not None:
+            attrs.append((name, masked[1:], True))
+        else:
+            attrs.append((name, enc.append_key(b"{", name)[1:], False))
+
+    def append(dst: bytes, val: Any) -> bytes:
+        dst = enc.append_begin_marker(dst)
+        first = True
+        for name, key, redacted in attrs:
+            if skip_unset:
+                if not hasattr(val, name):
+                    continue
+            if first:
+                first = False
+            else:
+                dst += b","
+            if redacted:
+                dst += key
+                continue
+            dst = append_value(dst + key, getattr(val, name))
+        return enc.append_end_marker(dst)
+
+    return append
+
+
+def _slots(typ: type) -> List[str] | None:
+    names: List[str] = []
+    for cls in reversed(typ.__mro__):
+        if "__dict__" in cls.__dict__ and cls is not object:
+            # The instances also have a __dict__, they are not slots only.
+            return None
+        slots = cls.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in ("__dict__", "__weakref__") and name not in names:
+                names.append(name)
+    if len(names) == 0:
+        return None
+    return names
+
+
+# _resolve finds the encoder for typ and caches it, unless _max_types types
+# are cached already.
+def _resolve(typ: type) -> ValueEncoder:
+    f = _lookup(typ)
+    if len(_value_encoders) < _max_types:
+        _value_encoders[typ] = f
+    return f
+
+
+def _lookup(typ: type) -> ValueEncoder:
+    for cls in typ.__mro__:
+        func = _marshal_funcs.get(cls)
+        if func is not None:
+            return _new_marshal_func_encoder(func)
+    if issubclass(typ, BaseException):
+        return _append_exc
+    if issubclass(typ, enum.Enum):
+        return _append_enum
+    # subclasses of the built-in types, exact types are in _base_encoders.
+    for cls, f in _subclass_encoders:
+        if issubclass(typ, cls):
+            return f
+    for module, name, f in _module_encoders:
+        m = sys.modules.get(module)
+        if m is not None and issubclass(typ, getattr(m, name)):
+            return f
+    if dataclasses.is_dataclass(typ):
+        return _new_attrs_encoder([f.name for f in dataclasses.fields(typ)], False)
+    slots = _slots(typ)
+    if slots is not None:
+        return _new_attrs_encoder(slots, True)
+    return _append_marshaled
+
+
+_subclass_encoders: List[tuple] = [
+    (bool, enc.append_bool),
+    (int, lambda dst, val: enc.append_int(dst, int(val))),
+    (float, lambda dst, val: enc.append_float(dst, float(val))),
+    (str, lambda dst, val: append_value(dst, str.__str__(val))),
+    (datetime, _append_time),
+    (date, _append_isoformat),
+    (time, _append_isoformat),
+    (timedelta, _append_timedelta),
+    (Mapping, append_object),
+    (list, append_list),
+    (tuple, append_list),
+    (set, _append_set),
+    (frozenset, _append_set),
+    (bytes, _append_bytes),
+    (bytearray, _append_bytes),
+]
+
+# _module_encoders are the encoders of types from modules zerolog doesn't
+# import. Values of these types can only exist once their module is imported,
+# so they are only looked up in sys.modules.
+_module_encoders: List[tuple] = [
+    ("uuid", "UUID", _append_str),
+    ("decimal", "Decimal", _append_decimal),
+]
+
+_base_encoders: Dict[type, ValueEncoder] = {
+    str: enc.append_string,
+    bool: enc.append_bool,
+    int: enc.append_int,
+    float: enc.append_float,
+    type(None): _append_nil,
+    datetime: _append_time,
+    date: _append_isoformat,
+    time: _append_isoformat,
+    timedelta: _append_timedelta,
+    list: append_list,
+    tuple: append_list,
+    dict: append_object,
+    set: _append_set,
+    frozenset: _append_set,
+    bytes: _append_bytes,
+    bytearray: _append_bytes,
+}
+
+# _max_types bounds the number of types whose encoder is cached.
+_max_types = 1024
+
+# _dumps encodes plain values like the encoders above, with the C encoder of
+# the json module. It raises for the values it can't encode the same way.
+_dumps = json.JSONEncoder(
+    ensure_ascii=False, allow_nan=False, separators=(",", ":")
+).encode
+
+
+def _new_json_encoder(native: ValueEncoder) -> ValueEncoder:
+    def append(dst: bytes, val: Any) -> bytes:
+        try:
+            s = _dumps(val)
+        except (TypeError, ValueError):
+            # val holds values without a plain JSON encoding, like datetimes,
+            # bytes or NaN.
+            return native(dst, val)
+        dst += s.encode()
+        return dst
+
+    return append
+
+
+# _json_encoders encode dicts and lists with _dumps and fall back to the
+# encoders above. They are only used without redaction and marshal funcs,
+# which _dumps would skip.
+_json_encoders: Dict[type, ValueEncoder] = {
+    list: _new_json_encoder(append_list),
+    tuple: _new_json_encoder(append_list),
+    dict: _new_json_encoder(append_object),
+}
+
+# _value_encoders caches the encoder of each type seen by append_value.
+_value_encoders: Dict[type, ValueEncoder] = {}
+
+
+def _reset_encoders():
+    _value_encoders.clear()
+    _value_encoders.update(_base_encoders)
+    # zerolog.set_redaction resets the encoders to redact string values.
+    r = enc.redaction
+    _value_encoders[str] = enc.append_string if r is None else r.append_string
+    if r is None and len(_marshal_funcs) == 0:
+        _value_encoders.update(_json_encoders)
+    for typ, func in _marshal_funcs.items():
+        _value_encoders[typ] = _new_marshal_func_encoder(func)
+
+
+_reset_encoders()
@@ -0,0 +1,176 @@
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
+
+from .internal.util.atomic import Counters, Shards
+from .level import Level
+from .vector import _percentile_key
+
+if TYPE_CHECKING:
+    from .logger import Logger
+
+# DefaultMetricsPercentiles are the percentiles reported by
+# Histogram.snapshot.
+DefaultMetricsPercentiles = (50, 90, 99, 99.9)
+
+
+# _index returns the bucket of v. Values below 2 ** (bits + 1) have their
+# own bucket, larger values share buckets with the same bits + 1 top bits.
+def _index(v: int, bits: int) -> int:
+    shift = v.bit_length() - bits - 1
+    if shift <= 0:
+        return v
+    return (shift << bits) + (v >> shift)
+
+
+# _bounds returns the lowest and highest values of the bucket i.
+def _bounds(i: int, bits: int) -> Tuple[int, int]:
+    if i < 2 << bits:
+        return i, i
+    shift = (i >> bits) - 1
+    top = i - (shift << bits)
+    return top << shift, ((top + 1) << shift) - 1
+
+
+# _fold adds the counts and the sum of the shard of a histogram to into and
+# keeps the max of both.
+def _fold(into: List[int], shard: List[int]):
+    for i in range(len(shard) - 1):
+        into[i] += shard[i]
+    if shard[-1] > into[-1]:
+        into[-1] = shard[-1]
+
+
+# Histogram records non negative integers in log-linear buckets, like HDR
+# histograms: each power of two is split in 2 ** bits buckets, so values are
+# recorded with a relative error under 2 ** -bits. Buckets are sharded per
+# thread, recording a value doesn't take a lock.
+class Histogram:
+    def __init__(self, bits: int = 3):
+        self._bits = bits
+        # Buckets for values up to 2 ** 64, then the sum and max.
+        self._size = (65 - bits) << bits
+        size = self._size + 2
+        self._shards: Shards[List[int]] = Shards(lambda: [0] * size, _fold)
+
+    # record adds n times v to the histogram.
+    def record(self, v: int, n: int = 1):
+        if v < 0:
+            v = 0
+        shard = self._shards.get()
+        shard[min(_index(v, self._bits), self._size - 1)] += n
+        shard[-2] += v * n
+        if v > shard[-1]:
+            shard[-1] = v
+
+    # buckets returns the (lowest value, count) of the non empty buckets.
+    def buckets(self) -> List[Tuple[int, int]]:
+        counts, _, _ = self._load()
+        return [(_bounds(i, self._bits)[0], c) for i, c in enumerate(counts) if c > 0]
+
+    # snapshot returns the count, min, max and mean of the recorded values and
+    # the given percentiles, as the highest value of their bucket.
+    def snapshot(
+        self, percentiles: Iterable[float] = DefaultMetricsPercentiles
+    ) -> Dict[str, Any]:
+        counts, total, high = self._load()
+        count = sum(counts)
+        if count == 0:
+            return {"count": 0}
+        buckets = [(i, c) for i, c in enumerate(counts) if c > 0]
+        snap: Dict[str, Any] = {
+            "count": count,
+            "min": _bounds(buckets[0][0], self._bits)[0],
+            "max": high,
+            "mean": total / count,
+        }
+        for p in percentiles:
+            rank = p / 100 * count
+            seen = 0
+            for i, c in buckets:
+                seen += c
+                if seen >= rank:
+                    break
+            snap[_percentile_key(p)] = min(_bounds(i, self._bits)[1], high)
+        return snap
+
+    def _load(self) -> Tuple[List[int], int, int]:
+        t = self._shards.total()
+        return t[: self._size], t[-2], t[-1]
+
+
+# Metrics measures the cost of logging for the loggers it is set on with
+# Logger.metrics. One event out of sample_every is measured:
+#
+#   - encode_ns: the time between the creation of the event and the call to
+#     msg, spent encoding the fields and computing their values,
+#   - hook_ns: the time spent running the hooks,
+#   - write_ns: the time spent in the write method of the output,
+#   - event_bytes: the size of the events written.
+#
+# Writers buffering events in a queue can record its depth in queue_depth.
+class Metrics:
+    def __init__(self, sample_every: int = 16):
+        self.sample_every = sample_every
+
+        self.encode_ns = Histogram()
+        self.hook_ns = Histogram()
+        self.write_ns = Histogram()
+        self.event_bytes = Histogram()
+        self.queue_depth = Histogram()
+
+        self._counter = Counters(1)
+        self._stop = threading.Event()
+        self._reporter: threading.Thread | None = None
+
+    # snapshot returns the snapshot of each histogram by name.
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "encode_ns": self.encode_ns.snapshot(),
+            "hook_ns": self.hook_ns.snapshot(),
+            "write_ns": self.write_ns.snapshot(),
+            "event_bytes": self.event_bytes.snapshot(),
+            "queue_depth": self.queue_depth.snapshot(),
+        }
+
+    # report logs the snapshot with l as an event with lvl and msg.
+    def report(
+        self,
+        l: "Logger",
+        lvl: Level = Level.InfoLevel,
+        msg: str = "zerolog metrics",
+    ):
+        e = l.new_event(lvl, None)
+        if e is not None:
+            e.fields(self.snapshot()).msg(msg)
+
+    # start_report reports the snapshot with l every interval seconds from a
+    # daemon thread, until stop_report is called.
+    def start_report(
+        self,
+        l: "Logger",
+        interval: float = 60,
+        lvl: Level = Level.InfoLevel,
+        msg: str = "zerolog metrics",
+    ):
+        self.stop_report()
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.report(l, lvl, msg)
+
+        self._reporter = threading.Thread(
+            target=run, name="zerolog-metrics", daemon=True
+        )
+        self._reporter.start()
+
+    # stop_report stops the reports started with start_report.
+    def stop_report(self):
+        if self._reporter is not None:
+            self._stop.set()
+            self._reporter.join()
+            self._reporter = None
+
+    # _sample returns True if the next event should be measured.
+    def _sample(self) -> bool:
+        return self._counter.add(0) % self.sample_every == 0
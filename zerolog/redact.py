@@ -0,0 +1,117 @@
+import re
+import threading
+from fnmatch import translate
+from typing import Dict, Iterable, List, Pattern
+
+from .encoder_json import enc
+from .internal.json.json import Encoder
+from . import marshal
+
+# DefaultRedactionMask replaces the values of the redacted fields.
+DefaultRedactionMask = "[REDACTED]"
+
+# _max_keys bounds the number of keys whose encoding is cached.
+_max_keys = 4096
+
+_lock = threading.Lock()
+_redaction: "Redaction | None" = None
+
+
+# Redaction is a policy masking the values of sensitive fields, set with
+# set_redaction. A field is redacted if its key is one of keys or matches one
+# of the glob patterns, or if it is a string matching one of the regexes of
+# values:
+#
+#   zerolog.set_redaction(zerolog.Redaction(
+#       keys=["password", "authorization"],
+#       patterns=["*_token"],
+#       values=[r"\b\d{4}(?:[ -]?\d{4}){3}\b"],
+#   ))
+#
+# Keys are matched case insensitively unless ignore_case is False, once per
+# key: the encoded key and mask of a redacted key are then cached. The value
+# of a redacted field isn't encoded at all, whatever its type.
+class Redaction:
+    def __init__(
+        self,
+        keys: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        values: Iterable[str | Pattern[str]] = (),
+        mask: str = DefaultRedactionMask,
+        ignore_case: bool = True,
+    ):
+        self.mask = mask
+        self.ignore_case = ignore_case
+
+        def fold(s: str) -> str:
+            return s.lower() if ignore_case else s
+
+        self._keys = frozenset(fold(k) for k in keys)
+        regexes = [translate(fold(p)) for p in patterns]
+        self._patterns = re.compile("|".join(regexes)) if regexes else None
+        self._values: List[Pattern[str]] = [
+            v if isinstance(v, re.Pattern) else re.compile(v) for v in values
+        ]
+        self._mask = Encoder.append_string(b"", mask)
+        # _cache maps keys to their encoded key and mask, or to b"" if their
+        # values aren't redacted.
+        self._cache: Dict[str, bytes] = {}
+
+    # redacts returns True if the values of key are redacted.
+    def redacts(self, key: str) -> bool:
+        if self.ignore_case:
+            key = key.lower()
+        if key in self._keys:
+            return True
+        return self._patterns is not None and self._patterns.match(key) is not None
+
+    # masked_key returns the encoded key followed by the encoded mask if the
+    # values of key are redacted, None otherwise.
+    def masked_key(self, key: str) -> bytes | None:
+        m = self._cache.get(key)
+        if m is None:
+            m = b""
+            if self.redacts(key):
+                m = Encoder.append_string(b"", key) + b":" + self._mask
+            if len(self._cache) < _max_keys:
+                self._cache[key] = m
+        return m or None
+
+    # append_string appends s, or the mask if s matches one of the regexes of
+    # values.
+    def append_string(self, dst: bytes, s: str) -> bytes:
+        for v in self._values:
+            if v.search(s) is not None:
+                return dst + self._mask
+        return Encoder.append_string(dst, s)
+
+    # append_strings appends vals as an array, with the values matching one of
+    # the regexes of values masked.
+    def append_strings(self, dst: bytes, vals: List[str]) -> bytes:
+        if len(self._values) == 0:
+            return enc.append_strings(dst, vals)
+        if len(vals) == 0:
+            return dst + b"[]"
+        dst = self.append_string(dst + b"[", vals[0])
+        for v in vals[1:]:
+            dst = self.append_string(dst + b",", v)
+        return dst + b"]"
+
+
+# set_redaction sets the redaction policy applied to the fields of all the
+# loggers, or removes it if r is None. The encoder doesn't apply the policy:
+# the code appending a field checks it first and writes the mask instead of
+# encoding the value. Templates created before set_redaction encode their
+# keys without the new policy.
+def set_redaction(r: Redaction | None):
+    global _redaction
+    with _lock:
+        enc.redaction = r
+        _redaction = r
+        with marshal._registry_lock:
+            marshal._reset_encoders()
+
+
+# get_redaction returns the redaction policy set with set_redaction, if any.
+def get_redaction() -> Redaction | None:
+    return _redaction
@@ -0,0 +1,151 @@
+import random
+import threading
+import time
+from typing import Dict, Hashable, List, Tuple
+
+from .encoder_json import enc
+from .event import Event, _Deferred, _write_deferred
+from .internal.json.json import RIGHT_BRACE
+from .level import Level
+from .stats import DISCARDED, Stats, record
+from .writer import Writer
+
+# _max_writers bounds the number of outputs whose writer is cached.
+_max_writers = 64
+
+_Entry = Tuple[int, Writer, bytes, Stats | None, Level]
+
+
+class _Reservoir:
+    __slots__ = ("seen", "events")
+
+    def __init__(self):
+        self.seen = 0
+        self.events: List[_Entry] = []
+
+
+# _ReservoirWriter offers the events written to w to the reservoir of key.
+class _ReservoirWriter(_Deferred):
+    __slots__ = ("_s", "_key", "_w")
+
+    def __init__(self, s: "ReservoirSampler", key: Hashable, w: Writer):
+        self._s = s
+        self._key = key
+        self._w = w
+
+    def write(self, p: bytes):
+        self.defer(p, None, Level.NoLevel)
+
+    def defer(self, p: bytes, stats: Stats | None, lvl: Level):
+        self._s._offer(self._key, self._w, p, stats, lvl)
+
+
+# ReservoirSampler keeps a uniform random sample of at most k events per
+# interval of interval seconds (Algorithm R). If by_level is True, a sample
+# of k events is kept for each level. At the end of the interval, the kept
+# events are written in the order they were logged, with the number of events
+# each of them stands for as the weight_field field.
+#
+# The whole event is needed to keep it, so ReservoirSampler is a Hook and not
+# a Sampler: it defers the write of the events to the end of the interval.
+#
+#   reservoir = ReservoirSampler(k=100, interval=10)
+#   sampled = log.hook(reservoir)
+#
+# Intervals are checked when events are logged; call flush to write the
+# current sample, for instance before exiting.
+class ReservoirSampler:
+    def __init__(
+        self,
+        k: int = 100,
+        interval: float = 1,
+        by_level: bool = False,
+        weight_field: str = "sample_weight",
+    ):
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self.k = k
+        self.interval = interval
+        self.by_level = by_level
+        self.weight_field = weight_field
+
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._index = 0
+        self._reservoirs: Dict[Hashable, _Reservoir] = {}
+        self._writers: Dict[Tuple[int, Hashable], _ReservoirWriter] = {}
+
+    def run(self, e: Event, lvl: Level, msg: str):
+        if e._w is None:
+            return
+        key = lvl if self.by_level else None
+        w = self._writers.get((id(e._w), key))
+        if w is None:
+            # Writers hold their output, so only the last ones are cached.
+            if len(self._writers) >= _max_writers:
+                self._writers.clear()
+            w = self._writers[(id(e._w), key)] = _ReservoirWriter(self, key, e._w)
+        e._w = w
+
+    # flush writes the events kept for the current interval and starts a new
+    # one.
+    def flush(self):
+        with self._lock:
+            reservoirs = self._swap(time.monotonic())
+        self._emit(reservoirs)
+
+    def _offer(
+        self, key: Hashable, w: Writer, p: bytes, stats: Stats | None, lvl: Level
+    ):
+        now = time.monotonic()
+        done = None
+        dropped = None
+        with self._lock:
+            if now - self._start >= self.interval:
+                done = self._swap(now)
+            r = self._reservoirs.get(key)
+            if r is None:
+                r = self._reservoirs[key] = _Reservoir()
+            r.seen += 1
+            self._index += 1
+            entry = (self._index, w, p, stats, lvl)
+            if len(r.events) < self.k:
+                r.events.append(entry)
+            else:
+                dropped = entry
+                j = random.randrange(r.seen)
+                if j < self.k:
+                    dropped = r.events[j]
+                    r.events[j] = entry
+        if dropped is not None:
+            record(dropped[3], DISCARDED, dropped[4])
+        if done is not None:
+            self._emit(done)
+
+    def _swap(self, now: float) -> Dict[Hashable, _Reservoir]:
+        reservoirs = self._reservoirs
+        self._reservoirs = {}
+        self._start = now
+        return reservoirs
+
+    def _emit(self, reservoirs: Dict[Hashable, _Reservoir]):
+        events = []
+        for r in reservoirs.values():
+            weight = r.seen / len(r.events)
+            for entry in r.events:
+                events.append((entry, weight))
+        events.sort(key=lambda ev: ev[0][0])
+        for (_, w, p, stats, lvl), weight in events:
+            _write_deferred(w, self._weigh(p, weight), stats, lvl)
+
+    # _weigh adds the weight field to the encoded event p. Events end with the
+    # end marker and a line break, unless a post hook changed them: events not
+    # ending with an end marker are written as is.
+    def _weigh(self, p: bytes, weight: float) -> bytes:
+        end = len(p)
+        while end > 0 and p[end - 1] in b"\r\n":
+            end -= 1
+        if end == 0 or p[end - 1] != RIGHT_BRACE:
+            return p
+        p = enc.append_float(enc.append_key(p[: end - 1], self.weight_field), weight)
+        return enc.append_line_break(enc.append_end_marker(p))
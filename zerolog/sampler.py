@@ -1,12 +1,24 @@
-import datetime
+import json
+import binascii
+import itertools
 import random
+import sys
+import threading
+import time
 from abc import abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Protocol
+from functools import partial
+from types import FrameType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Protocol
 
-from .internal.util.atomic import Int
+from .encoder_json import enc
+from .internal.json.json import field_value
 from .level import Level
 
+if TYPE_CHECKING:
+    from .event import Event
+
 
 # Sampler defines an interface to a log sampler.
 class Sampler(Protocol):
@@ -39,18 +51,29 @@ Sometimes = RandomSampler(100)
 Rarely = RandomSampler(1000)
 
 
+# _gil is False when running without the GIL on a free-threaded build.
+_gil: bool = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
 # BasicSampler is a sampler that will send every nth events, regardless of
-# their level.
+# their level. Events of all the threads are counted together. With the GIL,
+# next on an itertools.count is atomic and no lock is taken; without it, the
+# counter is read under a lock.
 class BasicSampler:
     def __init__(self, n: int = 0):
         self.n = n
-        self._counter = Int(0)
+        self._counter = itertools.count(1)
+        self._lock = None if _gil else threading.Lock()
 
     def sample(self, lvl: Level) -> bool:
         n = self.n
         if n == 1:
             return True
-        c = self._counter.add(1)
+        if self._lock is None:
+            c = next(self._counter)
+        else:
+            with self._lock:
+                c = next(self._counter)
         return c % n == 1
 
 
@@ -69,29 +92,320 @@ class BurstSampler:
         # events are always rejected after the burst.
         self.next_sampler = next_sampler
 
-        self._counter = Int(0)
-        self._reset_at = Int(0)
+        # _window is the (id, reset_at) of the current period and _count the
+        # number of its events, both updated under _lock. _full is the id of
+        # the last period whose burst is spent: its events are rejected
+        # without locking, so the lock is only taken for the events of the
+        # burst and once per period.
+        self._window = (0, 0.0)
+        self._count = 0
+        self._full = -1
+        self._lock = threading.Lock()
 
     def sample(self, lvl: Level) -> bool:
         if self.burst > 0 and self.period > 0:
-            if self._inc() <= self.burst:
+            if self._take():
+                return True
+        if self.next_sampler is None:
+            return False
+        return self.next_sampler.sample(lvl)
+
+    # _take counts the event and returns True if it is part of the burst of
+    # the current period.
+    def _take(self) -> bool:
+        now = time.monotonic()
+        window = self._window
+        if now <= window[1] and self._full == window[0]:
+            return False
+        with self._lock:
+            window = self._window
+            if now > window[1]:
+                window = self._window = (window[0] + 1, now + self.period)
+                self._count = 0
+            self._count += 1
+            if self._count <= self.burst:
                 return True
+            self._full = window[0]
+            return False
+
+
+# _TokenBucket holds up to burst tokens and is refilled with rate tokens per
+# second.
+class _TokenBucket:
+    __slots__ = ("tokens", "last")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.last = now
+
+    def take(self, rate: float, burst: int, now: float) -> bool:
+        tokens = self.tokens + (now - self.last) * rate
+        if tokens > burst:
+            tokens = burst
+        self.last = now
+        if tokens >= 1:
+            self.tokens = tokens - 1
+            return True
+        self.tokens = tokens
+        return False
+
+
+# TokenBucketSampler lets events pass as long as tokens are available in a
+# bucket holding up to burst tokens, refilled with rate tokens per second.
+# rate can be fractional: 0.1 lets one event pass every 10 seconds. Once the
+# bucket is empty, the decision is passed to next_sampler. If next_sampler is
+# not set, events are rejected until the bucket is refilled.
+class TokenBucketSampler:
+    def __init__(
+        self, rate: float = 0, burst: int = 1, next_sampler: Sampler | None = None
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.next_sampler = next_sampler
+
+        self._lock = threading.Lock()
+        self._bucket = _TokenBucket(burst, time.monotonic())
+
+    def sample(self, lvl: Level) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            ok = self._bucket.take(self.rate, self.burst, now)
+        if ok:
+            return True
+        if self.next_sampler is None:
+            return False
+        return self.next_sampler.sample(lvl)
+
+
+# FrameFunc returns the frame of the code logging an event, if found.
+FrameFunc = Callable[[], FrameType | None]
+
+# KeyFunc extracts the key used by KeyedTokenBucketSampler from the level of
+# the event and a function returning the frame of the code logging it. The
+# frame is only looked up if the function is called.
+KeyFunc = Callable[[Level, FrameFunc], Hashable]
+
+
+# key_by_call_site keys events by the file and line logging them.
+def key_by_call_site(lvl: Level, frame: FrameFunc) -> Hashable:
+    f = frame()
+    if f is None:
+        return None
+    return f.f_code.co_filename, f.f_lineno
+
+
+# key_by_level keys events by their level.
+def key_by_level(lvl: Level, frame: FrameFunc) -> Hashable:
+    return lvl
+
+
+# _caller_frame returns the first frame outside of zerolog from f.
+def _caller_frame(f: FrameType | None) -> FrameType | None:
+    while f is not None:
+        name = f.f_globals.get("__name__", "")
+        if name != "zerolog" and not name.startswith("zerolog."):
+            return f
+        f = f.f_back
+    return None
+
+
+# KeyedTokenBucketSampler applies a token bucket, as TokenBucketSampler does,
+# to each key returned by key_func, so a noisy source can't use the budget of
+# the others. Buckets are kept for the max_keys most recently used keys.
+#
+# key_func can read contextvars to key by request route or tenant.
+class KeyedTokenBucketSampler:
+    def __init__(
+        self,
+        rate: float = 0,
+        burst: int = 1,
+        key_func: KeyFunc = key_by_call_site,
+        max_keys: int = 1024,
+        next_sampler: Sampler | None = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.key_func = key_func
+        self.max_keys = max_keys
+        self.next_sampler = next_sampler
+
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[Hashable, _TokenBucket] = OrderedDict()
+
+    def sample(self, lvl: Level) -> bool:
+        key = self.key_func(lvl, partial(_caller_frame, sys._getframe(1)))
+        now = time.monotonic()
+        buckets = self._buckets
+        with self._lock:
+            b = buckets.get(key)
+            if b is None:
+                b = buckets[key] = _TokenBucket(self.burst, now)
+                if len(buckets) > self.max_keys:
+                    buckets.popitem(last=False)
+            else:
+                buckets.move_to_end(key)
+            ok = b.take(self.rate, self.burst, now)
+        if ok:
+            return True
         if self.next_sampler is None:
             return False
         return self.next_sampler.sample(lvl)
 
-    def _inc(self) -> int:
-        micro = 100000
-        now = datetime.datetime.now().timestamp() * micro
-        reset_at = self._reset_at.load()
-        if now > reset_at:
-            c = 1
-            self._counter.store(c)
-            new_reset_at = int(now + (self.period * micro))
-            c = self._reset_at.compare_and_swap(reset_at, new_reset_at)
+
+class _RateWindow:
+    __slots__ = ("start", "count", "prev_count", "prev_elapsed", "p")
+
+    def __init__(self, now: float):
+        self.start = now
+        self.count = 0
+        self.prev_count = 0
+        self.prev_elapsed = 0.0
+        self.p = 1.0
+
+
+# AdaptiveSampler adjusts the probability to keep events of each level so
+# that about rate events per second are kept for the level. The event rate
+# is measured over a sliding window of two periods, and over the current
+# period alone to react to spikes.
+#
+# AdaptiveSampler is also a Hook adding the probability an event had to be
+# kept as the rate_field field, so counts can be re-weighted downstream:
+#
+#   s = AdaptiveSampler(rate=100)
+#   sampled = log.sample(s).hook(s)
+class AdaptiveSampler:
+    def __init__(
+        self, rate: float = 0, period: float = 1, rate_field: str = "sample_rate"
+    ):
+        # rate is the number of events per second to keep for each level.
+        self.rate = rate
+        # period is the duration of the measuring window in seconds.
+        self.period = period
+        # rate_field is the field name used for the probability the event
+        # had to be kept.
+        self.rate_field = rate_field
+
+        self._lock = threading.Lock()
+        self._windows: Dict[Level, _RateWindow] = {}
+
+    def sample(self, lvl: Level) -> bool:
+        now = time.monotonic()
+        w = self._windows.get(lvl)
+        if w is None:
+            with self._lock:
+                w = self._windows.setdefault(lvl, _RateWindow(now))
+        elapsed = now - w.start
+        if elapsed >= self.period:
+            with self._lock:
+                elapsed = now - w.start
+                if elapsed >= 2 * self.period:
+                    # No event was seen during the last period.
+                    w.prev_count, w.prev_elapsed = 0, self.period
+                    w.count = 0
+                    w.start = now
+                    elapsed = 0
+                elif elapsed >= self.period:
+                    w.prev_count, w.prev_elapsed = w.count, elapsed
+                    w.count = 0
+                    w.start = now
+                    elapsed = 0
+        # Counts are updated without the lock and may miss concurrent
+        # events, the estimate doesn't need to be exact.
+        w.count += 1
+        # The window is at least one period long so the first events of a
+        # level are kept until the rate is reached.
+        est = (w.prev_count + w.count) / max(w.prev_elapsed + elapsed, self.period)
+        # The rate of the current period alone catches up with a spike
+        # without waiting for the previous period to weigh less. It is
+        # measured over at least a tenth of the period so the first events
+        # of a period don't look like a spike.
+        cur = w.count / max(elapsed, self.period / 10)
+        if cur > est:
+            est = cur
+        p = 1.0
+        if est > self.rate:
+            p = self.rate / est
+        w.p = p
+        return p >= 1 or random.random() < p
+
+    # run adds the current probability to keep events of lvl to e.
+    def run(self, e: "Event", lvl: Level, msg: str):
+        w = self._windows.get(lvl)
+        e.float(self.rate_field, w.p if w is not None else 1.0)
+
+
+# HashSampler keeps the events whose key, such as a request or trace ID,
+# hashes under rate. The decision only depends on the key, so all the events
+# of a request are either kept or dropped, in every process logging them.
+# Keys are hashed with CRC-32 (binascii.crc32 of their UTF-8 encoding).
+#
+# The key is returned by key_func, typically reading a contextvar. HashSampler
+# can also be used as a Hook reading the key from the field named field of the
+# event instead:
+#
+#   sampled = log.hook(HashSampler(rate=0.1, field="trace_id"))
+#
+# Events without a key are passed to next_sampler, or kept if it is None.
+class HashSampler:
+    def __init__(
+        self,
+        rate: float = 0,
+        key_func: Callable[[], Any] | None = None,
+        field: str | None = None,
+        next_sampler: Sampler | None = None,
+    ):
+        # rate is the fraction of keys to keep, between 0 and 1.
+        self.rate = rate
+        self.key_func = key_func
+        self.field = field
+        self.next_sampler = next_sampler
+
+        self._last: tuple = (None, True)
+        self._key = enc.append_string(b"", field) + b":" if field is not None else b""
+
+    def sample(self, lvl: Level) -> bool:
+        key = None
+        if self.key_func is not None:
+            key = self.key_func()
+        if key is None:
+            if self.next_sampler is None:
+                return True
+            return self.next_sampler.sample(lvl)
+        return self.keep(key)
+
+    # keep returns true if events with key are part of the sample.
+    def keep(self, key: Any) -> bool:
+        # Events of a request are usually logged in a row, so the last
+        # decision is cached.
+        last = self._last
+        if last[0] == key:
+            return last[1]
+        if isinstance(key, str):
+            b = key.encode()
+        elif isinstance(key, (bytes, bytearray)):
+            b = key
         else:
-            c = self._counter.add(1)
-        return c
+            b = str(key).encode()
+        ok = binascii.crc32(b) < self.rate * 0x100000000
+        self._last = (key, ok)
+        return ok
+
+    def run(self, e: "Event", lvl: Level, msg: str):
+        if self.field is None:
+            return
+        # Only the value of the field is read, as a string or else as its
+        # encoding, which hashes like the value itself for numbers.
+        key: Any = field_value(e._buf, self._key)
+        if key == b"null":
+            key = None
+        elif key is not None and key[:1] == b'"':
+            key = json.loads(key) if b"\\" in key else key[1:-1].decode()
+        if key is None:
+            if self.next_sampler is None or self.next_sampler.sample(lvl):
+                return
+        elif self.keep(key):
+            return
+        e.discard()
 
 
 # LevelSampler applies a different sampler for each level.
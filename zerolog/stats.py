@@ -0,0 +1,97 @@
+from typing import Dict, List
+
+from .internal.util.atomic import Counters
+from .level import Level
+
+# Kinds of counters kept by Stats.
+#
+# EMITTED counts the events written.
+EMITTED = 0
+# FILTERED counts the events dropped because of their level.
+FILTERED = 1
+# SAMPLED counts the events dropped by the sampler.
+SAMPLED = 2
+# DISCARDED counts the events discarded by a hook.
+DISCARDED = 3
+# WRITE_ERRORS counts the events that failed to be written.
+WRITE_ERRORS = 4
+# BYTES counts the bytes written.
+BYTES = 5
+
+_kinds = ("emitted", "filtered", "sampled", "discarded", "write_errors", "bytes")
+
+# Levels are stored from TraceLevel (-1) to Disabled (6).
+_levels = ("trace", "debug", "info", "warn", "error", "fatal", "nolevel", "disabled")
+_n_levels = len(_levels)
+
+_prometheus_metrics = (
+    ("events_emitted_total", "Number of events written."),
+    ("events_filtered_total", "Number of events dropped because of their level."),
+    ("events_sampled_total", "Number of events dropped by the sampler."),
+    ("events_discarded_total", "Number of events discarded by a hook."),
+    ("write_errors_total", "Number of events that failed to be written."),
+    ("bytes_written_total", "Number of bytes written."),
+)
+
+
+# Stats counts the events of loggers by outcome and level. Counters are
+# sharded per thread, recording an event doesn't take a lock.
+#
+# The events of all loggers are counted by the global stats returned by
+# zerolog.global_stats(). Use Logger.stats to also count the events of a
+# logger separately.
+class Stats:
+    def __init__(self):
+        self._counters = Counters(len(_kinds) * _n_levels)
+
+    # add adds n to the counter of kind for lvl.
+    def add(self, kind: int, lvl: Level, n: int = 1):
+        self._counters.add(kind * _n_levels + lvl + 1, n)
+
+    # snapshot returns the current value of the counters by kind and level.
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        counts = self._counters.load()
+        return {
+            kind: dict(zip(_levels, counts[k * _n_levels : (k + 1) * _n_levels]))
+            for k, kind in enumerate(_kinds)
+        }
+
+    # prometheus returns the counters in the Prometheus text exposition format.
+    # labels are added to each sample.
+    def prometheus(
+        self, prefix: str = "zerolog", labels: Dict[str, str] | None = None
+    ) -> str:
+        counts = self._counters.load()
+        extra = ""
+        if labels:
+            extra = "".join(f',{k}="{_escape(v)}"' for k, v in labels.items())
+        lines: List[str] = []
+        for k, (name, help) in enumerate(_prometheus_metrics):
+            name = f"{prefix}_{name}"
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} counter")
+            for i, lvl in enumerate(_levels):
+                lines.append(
+                    f'{name}{{level="{lvl}"{extra}}} {counts[k * _n_levels + i]}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_global_stats = Stats()
+
+
+# global_stats returns the stats counting the events of all loggers.
+def global_stats() -> Stats:
+    return _global_stats
+
+
+# record adds n to the counter of kind for lvl in the global stats and in s
+# if not None.
+def record(s: Stats | None, kind: int, lvl: Level, n: int = 1):
+    _global_stats.add(kind, lvl, n)
+    if s is not None:
+        s.add(kind, lvl, n)
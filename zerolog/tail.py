@@ -0,0 +1,114 @@
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, Tuple
+
+from .event import Event, _Deferred, _write_deferred
+from .level import Level
+from .stats import DISCARDED, Stats, record
+from .writer import Writer
+
+
+_Entry = Tuple[Writer, bytes, Stats | None, Level]
+
+
+class _Scope:
+    __slots__ = ("events", "flushed", "writers")
+
+    def __init__(self, max_events: int):
+        self.events: Deque[_Entry] = deque(maxlen=max_events)
+        self.flushed = False
+        self.writers: Dict[int, _ScopeWriter] = {}
+
+
+# _ScopeWriter stores the events written to w in the scope, to write them
+# to w on flush.
+class _ScopeWriter(_Deferred):
+    __slots__ = ("_events", "_w")
+
+    def __init__(self, events: Deque[_Entry], w: Writer):
+        self._events = events
+        self._w = w
+
+    def write(self, p: bytes):
+        self.defer(p, None, Level.NoLevel)
+
+    def defer(self, p: bytes, stats: Stats | None, lvl: Level):
+        events = self._events
+        if len(events) == events.maxlen:
+            _, _, dstats, dlvl = events[0]
+            record(dstats, DISCARDED, dlvl)
+        events.append((self._w, p, stats, lvl))
+
+
+# TailSampler buffers the events logged in a scope with a level up to
+# buffer_level instead of writing them. If an event with a level of at least
+# flush_level is logged in the scope, the buffered events are written in order
+# before it and the following events of the scope are not buffered anymore.
+# Otherwise they are dropped when the scope exits. At most max_events events
+# are buffered per scope, the oldest ones are dropped first.
+#
+# TailSampler is a Hook, the logger must also allow the buffered levels:
+#
+#   tail = TailSampler()
+#   logger = log.level(zerolog.DebugLevel).hook(tail)
+#
+#   with tail.scope():
+#       handle(request)
+#
+# Scopes are tracked with a contextvar, so asyncio tasks and threads started
+# with contextvars.copy_context() in a scope share its buffer.
+class TailSampler:
+    def __init__(
+        self,
+        max_events: int = 1000,
+        buffer_level: Level = Level.DebugLevel,
+        flush_level: Level = Level.ErrorLevel,
+    ):
+        self.max_events = max_events
+        self.buffer_level = buffer_level
+        self.flush_level = flush_level
+
+        self._scope: ContextVar[_Scope | None] = ContextVar(
+            "zerolog_tail_scope", default=None
+        )
+
+    # scope starts a new buffering scope, dropping its buffered events on exit.
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        s = _Scope(self.max_events)
+        token = self._scope.set(s)
+        try:
+            yield
+        finally:
+            self._scope.reset(token)
+            for _, _, stats, lvl in s.events:
+                record(stats, DISCARDED, lvl)
+            s.events.clear()
+
+    # flush writes the events buffered in the current scope and stops buffering.
+    def flush(self):
+        s = self._scope.get()
+        if s is not None:
+            _flush(s)
+
+    def run(self, e: Event, lvl: Level, msg: str):
+        s = self._scope.get()
+        if s is None or s.flushed or e._w is None:
+            return
+        if lvl <= self.buffer_level:
+            w = s.writers.get(id(e._w))
+            if w is None:
+                w = s.writers[id(e._w)] = _ScopeWriter(s.events, e._w)
+            e._w = w
+        elif self.flush_level <= lvl <= Level.FatalLevel:
+            _flush(s)
+
+
+def _flush(s: _Scope):
+    s.flushed = True
+    events = list(s.events)
+    s.events.clear()
+    s.writers.clear()
+    for w, p, stats, lvl in events:
+        _write_deferred(w, p, stats, lvl)
@@ -0,0 +1,143 @@
+import sys
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+import zerolog
+from .bind import _bound
+from .encoder_json import enc
+from .event import Event
+from .level import Level
+from .marshal import _resolve, _value_encoders, append_any
+
+if TYPE_CHECKING:
+    from .logger import Logger
+
+# TemplateField is a field of a template: a key, whose value is encoded
+# according to its type, or a (key, type) pair, whose value is encoded with
+# the encoder of type.
+TemplateField = str | Tuple[str, type]
+
+# _typed_encoders are the encoders of the types whose values aren't redacted.
+# str values are encoded with _value_encoders[str], which masks the values
+# matched by the policy set with zerolog.set_redaction.
+_typed_encoders: Dict[type, Callable[[bytes, Any], bytes]] = {
+    int: enc.append_int,
+    float: enc.append_float,
+    bool: enc.append_bool,
+}
+
+
+def _encoder(typ: type) -> Callable[[bytes, Any], bytes]:
+    f = _typed_encoders.get(typ)
+    if f is None:
+        f = _value_encoders.get(typ) or _resolve(typ)
+    return f
+
+
+# _fragment returns the encoded key with a leading comma and whether the
+# field is redacted, in which case the fragment holds the mask too.
+def _fragment(key: str) -> Tuple[bytes, bool]:
+    masked = enc.append_masked(b"{}", key)
+    if masked is not None:
+        return masked[2:], True
+    return enc.append_key(b"{}", key)[2:], False
+
+
+def _skip(dst: bytes, val: Any) -> bytes:
+    return dst
+
+
+# _join appends the fragment frag, starting with a comma, to buf.
+def _join(buf: bytes, frag: bytes) -> bytes:
+    if len(buf) == 1:
+        return buf + frag[1:]
+    return buf + frag
+
+
+# Template is a log statement whose level, message and keys are encoded once,
+# created with Logger.template. emit only encodes the values:
+#
+#   req = log.template(zerolog.InfoLevel, "req", ("route", str), ("status", int))
+#   req.emit("/users", 200)
+#
+# The level field, the context of the logger and the keys are encoded when the
+# template is created, later changes to them are not seen by the template.
+# Level, sampler, hooks and the fields bound with zerolog.bind are applied on
+# each emit like for other events.
+class Template:
+    __slots__ = ("_l", "_lvl", "_msg", "_prefix", "_fields", "_suffix")
+
+    def __init__(self, l: "Logger", lvl: Level, msg: str, *fields: TemplateField):
+        self._l = l
+        self._lvl = lvl
+        self._msg = msg
+
+        prefix = enc.append_begin_marker(b"")
+        if lvl != Level.NoLevel and zerolog.LevelFieldName != "":
+            frag, redacted = _fragment(zerolog.LevelFieldName)
+            prefix = _join(prefix, frag)
+            if not redacted:
+                prefix = enc.append_string(prefix, lvl.string())
+        if len(l._context) > 1:
+            prefix = enc.append_object_data(prefix, l._context)
+        self._prefix = prefix
+
+        self._fields: List[Tuple[bytes, Callable[[bytes, Any], bytes]]] = []
+        encode: Callable[[bytes, Any], bytes]
+        for f in fields:
+            if isinstance(f, str):
+                key, encode = f, append_any
+            else:
+                key, typ = f
+                encode = _encoder(typ)
+            frag, redacted = _fragment(key)
+            self._fields.append((frag, _skip if redacted else encode))
+
+        self._suffix = b""
+        if msg != "":
+            frag, redacted = _fragment(zerolog.MessageFieldName)
+            self._suffix = frag if redacted else enc.append_string(frag, msg)
+
+    # emit logs an event with values as the values of the fields of the
+    # template, in order.
+    def emit(self, *values: Any):
+        if len(values) != len(self._fields):
+            raise TypeError(
+                f"emit() takes {len(self._fields)} values ({len(values)} given)"
+            )
+        l = self._l
+        lvl = self._lvl
+        if not l._should(lvl):
+            if lvl == Level.FatalLevel:
+                sys.exit("exit status 1")
+            return
+        m = l._metrics
+        start = 0
+        if m is not None:
+            if m._sample():
+                start = perf_counter_ns()
+            else:
+                m = None
+
+        buf = self._prefix
+        bound = _bound.get()
+        if len(bound) > 1:
+            buf = enc.append_object_data(buf, bound)
+        for (key, f), val in zip(self._fields, values):
+            buf = f(_join(buf, key), val)
+
+        e = Event(buf, l._w, lvl)
+        e._stats = l._stats
+        e._metrics = m
+        e._start = start
+        if lvl == Level.FatalLevel:
+            e._done = lambda msg: sys.exit("exit status 1")
+        e._post = l._post_hooks
+        hooks = l._dispatch[lvl + 1]
+        if len(hooks) > 0:
+            e._ch = hooks
+            e._msg(self._msg)
+        else:
+            if len(self._suffix) > 0:
+                e._buf = _join(buf, self._suffix)
+            e._msg("")
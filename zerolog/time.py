@@ -12,3 +12,11 @@ StampMicro = "%b %-m %H:%M:%S.%f"  # Jan 2 15:04:05.000000
 DateTime = "%Y-%m-%d %H:%M:%S"  # 2006-01-02 15:04:05
 DateOnly = "%Y-%m-%d"  # 2006-01-02
 TimeOnly = "%H:%M:%S"  # 15:04:05
+
+# Common durations, in nanoseconds.
+Nanosecond = 1
+Microsecond = 1000 * Nanosecond
+Millisecond = 1000 * Microsecond
+Second = 1000 * Millisecond
+Minute = 60 * Second
+Hour = 60 * Minute
@@ -0,0 +1,107 @@
+import functools
+import inspect
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable, Tuple
+
+import zerolog
+from .level import Level
+
+if TYPE_CHECKING:
+    from .logger import Logger
+
+# DefaultTimerFieldName is the field name used by timers for the elapsed time.
+DefaultTimerFieldName = "elapsed"
+
+# _starts holds the (timer, start time) of the timers entered in the current
+# context, so a Timer can be entered again from nested blocks, threads or
+# tasks while it is in use.
+_starts: ContextVar[Tuple[Tuple["Timer", int], ...]] = ContextVar(
+    "zerolog_timer_starts", default=()
+)
+
+
+# Timer measures the time elapsed in a block of code and logs it as a
+# duration field when the block exits. It is used as a context manager:
+#
+#   with log.timer("handled request"):
+#       ...
+#
+# or as a decorator:
+#
+#   @log.timer("handled request")
+#   def handle(): ...
+#
+# If the block raises, the exception is added to the event. When lvl is
+# disabled on entry, the block isn't timed and nothing is logged. A timer
+# must exit in the context, thread or task, that entered it: exiting it from
+# another thread logs nothing since the start time is kept in a ContextVar.
+class Timer:
+    __slots__ = ("_l", "_lvl", "_msg", "_key")
+
+    def __init__(self, l: "Logger", lvl: Level, msg: str, key: str):
+        self._l = l
+        self._lvl = lvl
+        self._msg = msg
+        self._key = key
+
+    def __enter__(self) -> "Timer":
+        if not self._l.enabled(self._lvl):
+            return self
+        starts = _starts.get()
+        _starts.set(starts + ((self, perf_counter_ns()),))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        starts = _starts.get()
+        # The timer wasn't entered in this context if lvl was disabled.
+        for i in range(len(starts) - 1, -1, -1):
+            if starts[i][0] is self:
+                _starts.set(starts[:i] + starts[i + 1 :])
+                self._emit(starts[i][1], exc)
+                return
+
+    def __call__(self, f: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(f):
+
+            @functools.wraps(f)
+            async def async_wrapper(*args, **kwargs):
+                if not self._l.enabled(self._lvl):
+                    return await f(*args, **kwargs)
+                start = perf_counter_ns()
+                try:
+                    r = await f(*args, **kwargs)
+                except BaseException as e:
+                    self._emit(start, e)
+                    raise
+                self._emit(start, None)
+                return r
+
+            return async_wrapper
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            if not self._l.enabled(self._lvl):
+                return f(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                r = f(*args, **kwargs)
+            except BaseException as e:
+                self._emit(start, e)
+                raise
+            self._emit(start, None)
+            return r
+
+        return wrapper
+
+    def _emit(self, start: int, exc: BaseException | None):
+        e = self._l.new_event(self._lvl, None)
+        if e is None:
+            return
+        e.dur(self._key, perf_counter_ns() - start)
+        if isinstance(exc, Exception):
+            e.exc(exc)
+        elif exc is not None:
+            e.str(zerolog.ExceptionFieldName, type(exc).__name__)
+        # Report the caller of the block, not _emit and __exit__ or wrapper.
+        e.caller_skip_frame(2).msg(self._msg)
@@ -0,0 +1,142 @@
+import math
+import sys
+from typing import Any, Iterable, List
+
+from .encoder_json import enc
+from .marshal import append_any, append_value
+
+# Vector is any value accepted by Event.vector and Event.vector_summary:
+# an array.array, an object implementing the buffer protocol (memoryview,
+# bytes...), a NumPy array or a plain sequence of numbers.
+Vector = Any
+
+# DefaultPercentiles are the percentiles reported by Event.vector_summary
+# when none are given.
+DefaultPercentiles = (50, 90, 99)
+
+
+# append_vector appends the field key with vals encoded as a JSON array.
+# If limit is greater than 0 and vals holds more than limit elements, only
+# the first limit elements are encoded and the total number of elements is
+# appended with the key suffixed by "_count".
+def append_vector(dst: bytes, key: str, vals: Vector, limit: int = 0) -> bytes:
+    if enc.redaction is not None:
+        masked = enc.append_masked(dst, key)
+        if masked is not None:
+            return masked
+    vals = _as_vector(vals)
+    n = len(vals)
+    if 0 < limit < n:
+        vals = vals[:limit]
+    dst = _append_list(enc.append_key(dst, key), _to_list(vals))
+    if 0 < limit < n:
+        dst = enc.append_int(enc.append_key(dst, f"{key}_count"), n)
+    return dst
+
+
+# append_vector_summary appends the field key with an object holding the
+# count, min, max, mean and the given percentiles of vals instead of the
+# values themselves. The statistics are computed with NumPy when it is
+# already imported.
+def append_vector_summary(
+    dst: bytes,
+    key: str,
+    vals: Vector,
+    percentiles: Iterable[float] = DefaultPercentiles,
+) -> bytes:
+    if enc.redaction is not None:
+        masked = enc.append_masked(dst, key)
+        if masked is not None:
+            return masked
+    percentiles = list(percentiles)
+    dst = enc.append_key(dst, key)
+    np = sys.modules.get("numpy")
+    try:
+        if np is not None:
+            stats = _summary_numpy(np, vals, percentiles)
+        else:
+            stats = _summary(_to_list(_as_vector(vals)), percentiles)
+    except Exception as e:
+        # The values aren't numbers.
+        return enc.append_string(dst, f"marshaling error: {e}")
+
+    dst = enc.append_begin_marker(dst)
+    for k, v in stats:
+        dst = append_value(enc.append_key(dst, k), v)
+    return enc.append_end_marker(dst)
+
+
+# _as_vector returns vals as a one dimensional sliceable object.
+def _as_vector(vals: Vector) -> Any:
+    if isinstance(vals, list):
+        return vals
+    if not hasattr(vals, "tolist"):
+        try:
+            vals = memoryview(vals)
+        except TypeError:
+            return list(vals)
+    if getattr(vals, "ndim", 1) != 1:
+        if isinstance(vals, memoryview):
+            return vals.cast("B").cast(vals.format)
+        return vals.ravel()
+    return vals
+
+
+def _to_list(vals: Any) -> List[Any]:
+    if isinstance(vals, list):
+        return vals
+    return vals.tolist()
+
+
+# _append_list encodes vals with the bulk encoder of their type. Values of
+# mixed or other types are encoded one by one like with Event.any.
+def _append_list(dst: bytes, vals: List[Any]) -> bytes:
+    types = set(map(type, vals))
+    if types == {bool}:
+        return enc.append_bools(dst, vals)
+    if types == {int}:
+        return enc.append_ints(dst, vals)
+    if types <= {int, float}:
+        return enc.append_floats(dst, vals)
+    return append_any(dst, vals)
+
+
+def _percentile_key(p: float) -> str:
+    return f"p{p:g}"
+
+
+def _summary(vals: List[Any], percentiles: List[float]) -> List[tuple]:
+    n = len(vals)
+    stats: List[tuple] = [("count", n)]
+    if n == 0:
+        return stats
+    s = sorted(vals)
+    if bool in set(map(type, s)):
+        s = list(map(int, s))
+    stats += [("min", s[0]), ("max", s[-1]), ("mean", math.fsum(s) / n)]
+    for p in percentiles:
+        # Linear interpolation between the closest ranks, the same method
+        # used by numpy.percentile by default.
+        rank = p / 100 * (n - 1)
+        lo = math.floor(rank)
+        hi = min(lo + 1, n - 1)
+        stats.append((_percentile_key(p), s[lo] + (s[hi] - s[lo]) * (rank - lo)))
+    return stats
+
+
+def _summary_numpy(np: Any, vals: Vector, percentiles: List[float]) -> List[tuple]:
+    a = np.asarray(vals).ravel()
+    if a.dtype.kind == "b":
+        a = a.astype(np.uint8)
+    stats: List[tuple] = [("count", int(a.size))]
+    if a.size == 0:
+        return stats
+    stats += [
+        ("min", a.min().item()),
+        ("max", a.max().item()),
+        ("mean", float(a.mean())),
+    ]
+    if len(percentiles) > 0:
+        for p, v in zip(percentiles, np.percentile(a, percentiles).tolist()):
+            stats.append((_percentile_key(p), v))
+    return stats
@@ -0,0 +1,11 @@
+from abc import abstractmethod
+from typing import Any, Protocol
+
+
+# Writer defines the interface of the outputs of loggers: write is called with
+# each encoded event. Binary files, io.BytesIO and ConsoleWriter are writers.
+# If the writer has a seek method, it is rewound after each event.
+class Writer(Protocol):
+    @abstractmethod
+    def write(self, p: bytes, /) -> Any:
+        pass